@@ -1,4 +1,4 @@
-from ._GraphObj import GraphObj
+from ._GraphObj import GraphObj, is_same_key, is_immutable
 from .styling.EdgeStyle import EdgeStyle
 from .Node import Node
 from typing import Optional, Union, Dict, Tuple
@@ -31,9 +31,13 @@ class Edge(GraphObj):
 		)
 		self._start = start
 		self._end = end
+		# the id tuple and its hash are computed once, the same tuple is the key of the edge in every dictionary
+		self._id = None
+		self._hash = None
 		self.raw_id = id
 		start.append_outward_edge(edge=self)
 		end.append_inward_edge(edge=self)
+		graph._edges_dict[self.id] = self
 
 	@property
 	def _label_converter(self):
@@ -107,6 +111,18 @@ class Edge(GraphObj):
 		self._end = state['end']
 		self.raw_id = state['id']
 
+	@property
+	def raw_id(self) -> Optional[Union[str, int]]:
+		"""Gets the extra ID of the edge."""
+		return self._raw_id
+
+	@raw_id.setter
+	def raw_id(self, raw_id: Optional[Union[str, int]]):
+		"""Sets the extra ID of the edge."""
+		self._raw_id = raw_id
+		self._id = None
+		self._hash = None
+
 	@property
 	def id(self) -> Tuple[Union[str, int]]:
 		"""
@@ -118,12 +134,29 @@ class Edge(GraphObj):
 		Raises:
 			ValueError: If the edge does not have a start or end.
 		"""
-		if self._start is None:
-			raise ValueError('This Edge does not have a start!')
-		elif self._end is None:
-			raise ValueError('This Edge does not have an end!')
-
-		return self.start.id, self.end.id, self.raw_id
+		if self._id is None:
+			if self._start is None:
+				raise ValueError('This Edge does not have a start!')
+			elif self._end is None:
+				raise ValueError('This Edge does not have an end!')
+			self._id = (self._start.id, self._end.id, self._raw_id)
+		return self._id
+
+	def __hash__(self) -> int:
+		"""Returns the hash of the ID of the edge."""
+		if self._hash is None:
+			self._hash = hash(self.id)
+		return self._hash
+
+	def __eq__(self, other: 'Edge') -> bool:
+		"""Equality comparison for edges."""
+		if self is other:
+			return True
+		if not isinstance(other, Edge):
+			raise TypeError(f'"{other}" is of type: {type(other)}')
+		if self._graph is not other._graph:
+			raise ValueError('two GraphObj from different graphs cannot be compared')
+		return self.id == other.id
 
 	def __str__(self) -> str:
 		"""Returns a string representation of the edge."""
@@ -140,9 +173,22 @@ class Edge(GraphObj):
 		Returns:
 			str: The Graphviz representation.
 		"""
+		# the string is cached until the nodes, label, value, tooltip or style change, unless the label or the value
+		# shown in its place can change in place
+		style = self._style
+		if is_immutable(self._label if self._label is not None else self._value):
+			key = (
+				self._start, self._end, self._label, self._value, self._tooltip, style,
+				None if style is None else style._version, self._label_converter
+			)
+			cache = self._graphviz_cache
+			if cache is not None and is_same_key(key, cache[0]):
+				return cache[1]
+		else:
+			key = None
+
 		parts = []
 		label_or_value = self.display_label_or_value()
-		style = self.style
 		if label_or_value is not None:
 			parts.append(f'label="{label_or_value}"')
 		if self._tooltip is not None:
@@ -155,7 +201,9 @@ class Edge(GraphObj):
 		else:
 			second_part = ''
 
-		return f'"{self.start.name}" -> "{self.end.name}"' + second_part
+		result = f'"{self.start.name}" -> "{self.end.name}"' + second_part
+		self._graphviz_cache = None if key is None else (key, result)
+		return result
 
 	@property
 	def start(self) -> Node:
@@ -191,10 +239,15 @@ class Edge(GraphObj):
 		"""Removes the edge from its start and end nodes."""
 		if self._start is None or self._end is None:
 			raise ValueError('Either start or end Node is missing!')
-		self.start.remove_outward_edge(edge_id=self.id)
-		self.end.remove_inward_edge(edge_id=self.id)
+		edge_id = self.id
+		self.start.remove_outward_edge(edge_id=edge_id)
+		self.end.remove_inward_edge(edge_id=edge_id)
+		if self._graph is not None:
+			self._graph._edges_dict.pop(edge_id, None)
 		self._start = None
 		self._end = None
+		self._id = None
+		self._hash = None
 		self._graph = None
 
 	def is_in_loop(self) -> bool:
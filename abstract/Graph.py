@@ -1,8 +1,50 @@
-from ._GraphWithoutDisplay import GraphWithoutDisplay, DEFAULT_PAD
+from ._GraphWithoutDisplay import (
+	GraphWithoutDisplay, DEFAULT_PAD, SUMMARY_MAX_NODES, _get_layout_timeout, _warn_summary_fallback
+)
+from .RenderCache import RenderCache
+from .run_graphviz import (
+	get_layout_engines, get_deadline, get_remaining_time, run_graphviz_with_fallback, arun_graphviz_with_fallback
+)
+import asyncio
+import graphviz
+import os
+import subprocess
 from typing import Optional, Union
 
 
 class Graph(GraphWithoutDisplay):
+	# by default no graph caches its renders, see set_default_render_cache
+	_render_cache = None
+	# a render cache holds a lock and the renders of other graphs, it is not saved with the graph
+	_RUNTIME_ATTRIBUTES = GraphWithoutDisplay._RUNTIME_ATTRIBUTES + ['_render_cache']
+
+	@property
+	def render_cache(self) -> Optional[RenderCache]:
+		"""
+		The cache of the SVGs of this graph, shared with its copies; the default render cache if none is set.
+
+		:rtype: Optional[RenderCache]
+		"""
+		return self._render_cache
+
+	@render_cache.setter
+	def render_cache(self, cache: Optional[RenderCache]):
+		if cache is not None and not isinstance(cache, RenderCache):
+			raise TypeError(f'cache should be a RenderCache, not {type(cache)}')
+		self._render_cache = cache
+
+	@classmethod
+	def set_default_render_cache(cls, cache: Optional[RenderCache]):
+		"""
+		Sets the render cache of every graph that has none of its own, e.g. Graph.set_default_render_cache(RenderCache()).
+
+		Args:
+			cache (Optional[RenderCache]): The cache, or None to stop caching.
+		"""
+		if cache is not None and not isinstance(cache, RenderCache):
+			raise TypeError(f'cache should be a RenderCache, not {type(cache)}')
+		cls._render_cache = cache
+
 	@staticmethod
 	def _get_svg(source):
 		try:
@@ -10,20 +52,142 @@ class Graph(GraphWithoutDisplay):
 		except AttributeError:
 			return source.pipe(format='svg', encoding=source._encoding)
 
-	def get_svg(self, direction: Optional[str] = None, pad: Union[int, float] = DEFAULT_PAD, **kwargs) -> str:
+	def get_svg(
+			self, direction: Optional[str] = None, pad: Union[int, float] = DEFAULT_PAD, engine: str = 'dot',
+			timeout: Optional[float] = None, max_nodes: Optional[int] = None, path: Optional[str] = None,
+			view: bool = True, height: Optional[Union[int, float]] = None, width: Optional[Union[int, float]] = None,
+			dpi: int = 300
+	) -> str:
 		"""
 		Generates the SVG representation of the graph.
+		If the layout engine times out, cheaper engines are tried, e.g. sfdp after dot, and then a summary of the
+		graph. An SVG in the render cache is filed under the first engine, so a graph that fell back to a cheaper
+		engine is not laid out by the slow engine again.
+
+		Args:
+			direction (Optional[str]): The direction of the graph layout.
+			pad (Union[int, float]): Padding around the graph.
+			engine (str): The layout engine, e.g. dot or sfdp, or auto to choose it from the size of the graph.
+			timeout (Optional[float]): Seconds for the layout as a whole, see render().
+			max_nodes (Optional[int]): If the graph has more nodes, its summary is rendered instead, see summarize().
+			path (Optional[str]): A file the graph is also rendered to, like render(): an .svg file gets the SVG
+				that is returned, laid out with the dpi, height and width given, other extensions set the format.
+			view (bool): Whether to view the file at path.
+			height (Optional[Union[int, float]]): The height of the graph in the file.
+			width (Optional[Union[int, float]]): The width of the graph in the file.
+			dpi (int): The DPI of the graph in the file.
+
+		Returns:
+			str: The SVG representation of the graph.
+		"""
+		arguments = dict(
+			direction=direction, pad=pad, engine=engine, timeout=timeout, path=path, view=view, height=height,
+			width=width, dpi=dpi
+		)
+		if max_nodes is not None and len(self.nodes_dict) > max_nodes:
+			return self.summarize(max_nodes=max_nodes).get_svg(**arguments)
+
+		if path is not None and os.path.splitext(path)[1].lower() != '.svg':
+			# other formats are rendered to the file by render() and the SVG is laid out for display as without a path,
+			# each with half of the timeout
+			deadline = get_deadline(timeout)
+			self.render(
+				path=path, view=view, direction=direction, height=height, width=width, dpi=dpi, pad=pad, engine=engine,
+				timeout=get_remaining_time(deadline, num_shares=2)
+			)
+			arguments.update(path=None, timeout=get_remaining_time(deadline))
+			return self.get_svg(**arguments)
+
+		direction = direction or self._direction
+		engines = get_layout_engines(engine=engine, num_nodes=len(self.nodes_dict), num_edges=len(self.edges_dict))
+		self.stylize()
+		if path is None:
+			source_arguments = dict(direction=direction, pad=pad, dpi=None)
+		else:
+			source_arguments = dict(direction=direction, pad=pad, dpi=dpi, height=height, width=width)
+		# the key is hashed from the parts of the source so that a graph found in the cache is never joined into one
+		# string or laid out again
+		cache = self._render_cache
+		svg = None
+		if cache is not None:
+			key = cache.make_key(self.iter_graphviz_parts(**source_arguments), engine=engines[0], format='svg')
+			svg = cache.get(key)
+
+		if svg is None:
+			source = self.get_graphviz_str(**source_arguments)
+			deadline = get_deadline(timeout)
+			try:
+				svg = run_graphviz_with_fallback(
+					source=source, engines=engines, format='svg',
+					timeout=_get_layout_timeout(timeout=timeout, num_engines=len(engines), num_nodes=len(self.nodes_dict))
+				)
+			except subprocess.TimeoutExpired:
+				if len(self.nodes_dict) <= SUMMARY_MAX_NODES:
+					raise
+				_warn_summary_fallback(timeout=timeout)
+				arguments.update(timeout=get_remaining_time(deadline))
+				return self.summarize(max_nodes=SUMMARY_MAX_NODES).get_svg(**arguments)
+			if cache is not None:
+				cache.put(key, svg)
+
+		if path is not None:
+			with open(path, 'wb') as file:
+				file.write(svg)
+			if view:
+				graphviz.view(path)
+		return svg.decode()
+
+	async def aget_svg(
+			self, direction: Optional[str] = None, pad: Union[int, float] = DEFAULT_PAD, engine: str = 'dot',
+			timeout: Optional[float] = None, semaphore: Optional[asyncio.Semaphore] = None,
+			max_nodes: Optional[int] = None
+	) -> str:
+		"""
+		Generates the SVG representation of the graph like get_svg() without blocking the event loop while the layout
+		engine runs. If the task is cancelled, the layout engine is killed.
 
 		Args:
 			direction (Optional[str]): The direction of the graph layout.
 			pad (Union[int, float]): Padding around the graph.
-			**kwargs: Additional keyword arguments for rendering.
+			engine (str): The layout engine, e.g. dot or sfdp, or auto to choose it from the size of the graph.
+			timeout (Optional[float]): Seconds for the layout as a whole, see render().
+			semaphore (Optional[asyncio.Semaphore]): Limits the renders run at a time, see arun_graphviz.
+			max_nodes (Optional[int]): If the graph has more nodes, its summary is rendered instead, see summarize().
 
 		Returns:
 			str: The SVG representation of the graph.
 		"""
-		source = self.render(direction=direction or self._direction, pad=pad, **kwargs)
-		return Graph._get_svg(source)
+		arguments = dict(direction=direction, pad=pad, engine=engine, timeout=timeout, semaphore=semaphore)
+		if max_nodes is not None and len(self.nodes_dict) > max_nodes:
+			return await self.summarize(max_nodes=max_nodes).aget_svg(**arguments)
+
+		direction = direction or self._direction
+		engines = get_layout_engines(engine=engine, num_nodes=len(self.nodes_dict), num_edges=len(self.edges_dict))
+		self.stylize()
+		cache = self._render_cache
+		if cache is not None:
+			parts = self.iter_graphviz_parts(direction=direction, pad=pad, dpi=None)
+			key = cache.make_key(parts, engine=engines[0], format='svg')
+			svg = cache.get(key)
+			if svg is not None:
+				return svg.decode()
+
+		source = await self._ajoin_graphviz_parts(direction=direction, pad=pad, dpi=None)
+		deadline = get_deadline(timeout)
+		try:
+			svg = await arun_graphviz_with_fallback(
+				source=source, engines=engines, format='svg', semaphore=semaphore,
+				timeout=_get_layout_timeout(timeout=timeout, num_engines=len(engines), num_nodes=len(self.nodes_dict))
+			)
+		except subprocess.TimeoutExpired:
+			if len(self.nodes_dict) <= SUMMARY_MAX_NODES:
+				raise
+			_warn_summary_fallback(timeout=timeout)
+			arguments.update(timeout=get_remaining_time(deadline))
+			return await self.summarize(max_nodes=SUMMARY_MAX_NODES).aget_svg(**arguments)
+		if cache is not None:
+			cache.put(key, svg)
+		return svg.decode()
 
 	def _repr_html_(self) -> str:
 		"""Returns the HTML representation of the graph."""
@@ -36,7 +200,7 @@ class Graph(GraphWithoutDisplay):
 		Args:
 			direction (Optional[str]): The direction of the graph layout.
 			pad (Union[int, float]): Padding around the graph.
-			**kwargs: Additional keyword arguments for rendering.
+			**kwargs: Additional keyword arguments of get_svg(), e.g. path.
 
 		Returns:
 			HTML: The HTML representation of the graph.
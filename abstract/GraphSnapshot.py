@@ -0,0 +1,196 @@
+from .traverse import get_relatives
+from .StronglyConnectedComponents import StronglyConnectedComponents
+from array import array
+from typing import Dict, Hashable, List, Union
+
+
+def _identity(index: int) -> int:
+	return index
+
+
+class GraphSnapshot:
+	def __init__(self, graph: 'BasicGraph'):
+		"""
+		Immutable, compact copy of the structure of a graph for read-heavy analytics.
+		Nodes are numbered in the order of the graph's nodes and the edges of both directions are stored as
+		compressed sparse rows: the children of the node at index i are
+		children[children_offsets[i]:children_offsets[i + 1]] and the same goes for parents.
+		Queries accept node names or Node objects and return node names.
+
+		Args:
+			graph (BasicGraph): The graph to compile; later changes to it are not reflected in the snapshot.
+		"""
+		nodes_dict = graph.nodes_dict
+		self._names = list(nodes_dict.keys())
+		self._indices = {name: index for index, name in enumerate(self._names)}
+		indices = self._indices
+
+		self._children_offsets = array('q', [0])
+		self._children = array('q')
+		self._parents_offsets = array('q', [0])
+		self._parents = array('q')
+		for node in nodes_dict.values():
+			self._children.extend([indices[child._raw_id] for child in graph._iterate_children(node)])
+			self._children_offsets.append(len(self._children))
+			self._parents.extend([indices[parent._raw_id] for parent in graph._iterate_parents(node)])
+			self._parents_offsets.append(len(self._parents))
+
+		self._strongly_connected_components = None
+
+	def __len__(self) -> int:
+		return len(self._children_offsets) - 1
+
+	def __contains__(self, item) -> bool:
+		return self._get_name(item) in self._indices
+
+	@property
+	def nodes(self) -> List[Hashable]:
+		"""Gets the names of the nodes."""
+		return list(self._names)
+
+	@property
+	def num_edges(self) -> int:
+		"""Gets the number of edges."""
+		return len(self._children)
+
+	@staticmethod
+	def _get_name(node) -> Hashable:
+		if isinstance(node, (str, int)):
+			return node
+		else:
+			return node.id
+
+	def get_index(self, node: Union[str, 'Node']) -> int:
+		"""
+		Gets the position of a node in the arrays.
+
+		Args:
+			node (Union[str, Node]): The node or its name.
+
+		Returns:
+			int: The index of the node.
+		"""
+		return self._indices[self._get_name(node)]
+
+	def get_name(self, index: int) -> Hashable:
+		"""Gets the name of the node at an index."""
+		return self._names[index]
+
+	def _get_children_indices(self, index: int) -> array:
+		return self._children[self._children_offsets[index]:self._children_offsets[index + 1]]
+
+	def _get_parents_indices(self, index: int) -> array:
+		return self._parents[self._parents_offsets[index]:self._parents_offsets[index + 1]]
+
+	def _get_names(self, indices) -> List[Hashable]:
+		names = self._names
+		return [names[index] for index in indices]
+
+	def get_children(self, node: Union[str, 'Node']) -> List[Hashable]:
+		"""Gets the names of the children of a node."""
+		return self._get_names(self._get_children_indices(self.get_index(node)))
+
+	def num_children(self, node: Union[str, 'Node']) -> int:
+		"""Gets the number of children of a node."""
+		index = self.get_index(node)
+		return self._children_offsets[index + 1] - self._children_offsets[index]
+
+	def get_parents(self, node: Union[str, 'Node']) -> List[Hashable]:
+		"""Gets the names of the parents of a node."""
+		return self._get_names(self._get_parents_indices(self.get_index(node)))
+
+	def num_parents(self, node: Union[str, 'Node']) -> int:
+		"""Gets the number of parents of a node."""
+		index = self.get_index(node)
+		return self._parents_offsets[index + 1] - self._parents_offsets[index]
+
+	def _get_relatives(self, node, get_neighbours, distance: bool, include_start: bool) -> Union[List, Dict]:
+		relatives = get_relatives(
+			start=self.get_index(node), get_neighbours=get_neighbours, distance=distance, key=_identity,
+			include_start=include_start
+		)
+		if distance:
+			return {relative_distance: self._get_names(layer) for relative_distance, layer in relatives.items()}
+		else:
+			return self._get_names(relatives)
+
+	def get_ancestors(self, node: Union[str, 'Node'], distance: bool = True) -> Union[List, Dict]:
+		"""
+		:param Node or str node:
+		:param bool distance: if True, ancestors and their respective distance to the node will be returned as dict
+		:rtype: dict[int,list[str]] or list[str]
+		"""
+		return self._get_relatives(
+			node=node, get_neighbours=self._get_parents_indices, distance=distance, include_start=True
+		)
+
+	def get_descendants(self, node: Union[str, 'Node'], distance: bool = True) -> Union[List, Dict]:
+		"""
+		:param Node or str node:
+		:param bool distance: if True, descendants and their respective distance to the node will be returned as dict
+		:rtype: dict[int,list[str]] or list[str]
+		"""
+		return self._get_relatives(
+			node=node, get_neighbours=self._get_children_indices, distance=distance, include_start=False
+		)
+
+	def get_siblings(self, node: Union[str, 'Node']) -> List[Hashable]:
+		"""Gets the names of the other children of the parents of a node."""
+		index = self.get_index(node)
+		siblings = {}
+		for parent in self._get_parents_indices(index):
+			for sibling in self._get_children_indices(parent):
+				if sibling != index:
+					siblings[sibling] = None
+		return self._get_names(siblings)
+
+	def get_co_parents(self, node: Union[str, 'Node']) -> List[Hashable]:
+		"""Gets the names of the other parents of the children of a node."""
+		index = self.get_index(node)
+		co_parents = {}
+		for child in self._get_children_indices(index):
+			for co_parent in self._get_parents_indices(child):
+				if co_parent != index:
+					co_parents[co_parent] = None
+		return self._get_names(co_parents)
+
+	@property
+	def strongly_connected_components(self) -> StronglyConnectedComponents:
+		"""Gets the strongly connected components, keyed by node index."""
+		if self._strongly_connected_components is None:
+			self._strongly_connected_components = StronglyConnectedComponents(
+				vertices=range(len(self)), get_successors=self._get_children_indices
+			)
+		return self._strongly_connected_components
+
+	def is_node_in_loop(self, node: Union[str, 'Node']) -> bool:
+		"""Checks if a node is its own descendant."""
+		return self.strongly_connected_components.is_in_loop(self.get_index(node))
+
+	def _get_root_indices(self) -> List[int]:
+		components = self.strongly_connected_components
+		source_component_indices = set()
+		roots = []
+		for index in range(len(self)):
+			component_index = components.get_component_index(index)
+			if component_index not in source_component_indices and components.is_source(component_index):
+				source_component_indices.add(component_index)
+				roots.append(index)
+		return roots
+
+	@property
+	def roots(self) -> List[Hashable]:
+		"""Gets the names of the first node of every strongly connected component without incoming edges."""
+		return self._get_names(self._get_root_indices())
+
+	@property
+	def absolute_roots(self) -> List[Hashable]:
+		"""Gets the names of the nodes without parents."""
+		offsets = self._parents_offsets
+		return self._get_names([index for index in range(len(self)) if offsets[index] == offsets[index + 1]])
+
+	@property
+	def leaves(self) -> List[Hashable]:
+		"""Gets the names of the nodes without children."""
+		offsets = self._children_offsets
+		return self._get_names([index for index in range(len(self)) if offsets[index] == offsets[index + 1]])
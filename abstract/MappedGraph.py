@@ -0,0 +1,321 @@
+from .GraphSnapshot import GraphSnapshot, _identity
+from .graph_file import encode_object, decode_object
+from .traverse import get_relatives
+from .tree_lines import iter_tree_lines
+from array import array
+from bisect import bisect_left
+import hashlib
+import mmap
+import struct
+import sys
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Type, Union
+
+MAPPED_MAGIC = b'ABSGMMAP'
+MAPPED_FORMAT_VERSION = 1
+_BIG_ENDIAN = 1
+
+# every section is stored at a multiple of 8 bytes, its position and size in bytes are in the header
+SECTIONS = (
+	'children_offsets', 'children', 'parents_offsets', 'parents',
+	'name_offsets', 'name_hashes', 'name_order', 'label_offsets', 'roots',
+	'name_kinds', 'label_kinds', 'name_data', 'label_data'
+)
+_SECTION_TYPECODES = {'name_kinds': 'B', 'label_kinds': 'B', 'name_data': 'B', 'label_data': 'B'}
+
+# header: magic, format version, flags, number of nodes, edges and roots, then position and size of each section
+_HEADER = struct.Struct('<8sHHIqqq' + 'qq' * len(SECTIONS))
+
+
+def _hash_name(kind: int, payload: bytes) -> int:
+	digest = hashlib.blake2b(bytes([kind]) + payload, digest_size=8).digest()
+	return int.from_bytes(digest, 'little', signed=True)
+
+
+def _encode_objects(objects: Iterable) -> Tuple[array, array, bytearray, array]:
+	kinds = array('B')
+	offsets = array('q', [0])
+	data = bytearray()
+	hashes = array('q')
+	for obj in objects:
+		kind, payload = encode_object(obj)
+		kinds.append(kind)
+		data += payload
+		offsets.append(len(data))
+		hashes.append(_hash_name(kind, payload))
+	return kinds, offsets, data, hashes
+
+
+def write_mapped_graph(graph: 'BasicGraph', path: str):
+	"""
+	Writes the structure of a graph, the names and labels of its nodes and its roots to a file that MappedGraph
+	can open without reading it into memory.
+
+	Args:
+		graph (BasicGraph): The graph or subgraph view.
+		path (str): The path of the file.
+	"""
+	snapshot = GraphSnapshot(graph=graph)
+	name_kinds, name_offsets, name_data, hashes = _encode_objects(snapshot._names)
+	label_kinds, label_offsets, label_data, _ = _encode_objects(node._label for node in graph.nodes_dict.values())
+	name_order = array('q', sorted(range(len(hashes)), key=hashes.__getitem__))
+	sections = {
+		'children_offsets': snapshot._children_offsets, 'children': snapshot._children,
+		'parents_offsets': snapshot._parents_offsets, 'parents': snapshot._parents,
+		'name_offsets': name_offsets, 'name_hashes': array('q', [hashes[index] for index in name_order]),
+		'name_order': name_order, 'label_offsets': label_offsets, 'roots': array('q', snapshot._get_root_indices()),
+		'name_kinds': name_kinds, 'label_kinds': label_kinds, 'name_data': name_data, 'label_data': label_data
+	}
+
+	with open(path, 'wb') as file:
+		file.write(bytes(_HEADER.size))
+		positions = []
+		for section in SECTIONS:
+			padding = -file.tell() % 8
+			file.write(bytes(padding))
+			position = file.tell()
+			file.write(sections[section])
+			positions.extend([position, file.tell() - position])
+		flags = _BIG_ENDIAN if sys.byteorder == 'big' else 0
+		file.seek(0)
+		file.write(_HEADER.pack(
+			MAPPED_MAGIC, MAPPED_FORMAT_VERSION, flags, 0, len(snapshot), snapshot.num_edges,
+			len(sections['roots']), *positions
+		))
+
+
+class MappedGraph(GraphSnapshot):
+	def __init__(self, path: str):
+		"""
+		Read-only graph backed by a memory-mapped file written by write_mapped_graph or MappedGraph.from_graph.
+		Both directions of the edges are stored as compressed sparse rows, and node names are found by a binary
+		search over their hashes, so queries only touch the pages they need.
+		Like GraphSnapshot, queries accept node names and return node names.
+
+		Args:
+			path (str): The path of the file.
+
+		Raises:
+			ValueError: If the file is not a mapped graph, its format version is newer than this code, or it was
+				written on a machine with a different byte order.
+		"""
+		self._path = path
+		self._file = open(path, 'rb')
+		try:
+			self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+		except BaseException:
+			self._file.close()
+			raise
+		self._strongly_connected_components = None
+		self._views = []
+		try:
+			self._read_header()
+		except BaseException:
+			self.close()
+			raise
+
+	def _read_header(self):
+		if len(self._mmap) < _HEADER.size:
+			raise ValueError('not a mapped graph file')
+		magic, version, flags, _, num_nodes, num_edges, num_roots, *positions = _HEADER.unpack_from(self._mmap, 0)
+		if magic != MAPPED_MAGIC:
+			raise ValueError('not a mapped graph file')
+		if version > MAPPED_FORMAT_VERSION:
+			raise ValueError(
+				f'mapped graph file has format version {version}, only up to {MAPPED_FORMAT_VERSION} can be read'
+			)
+		if bool(flags & _BIG_ENDIAN) != (sys.byteorder == 'big'):
+			raise ValueError('mapped graph file was written on a machine with a different byte order')
+
+		buffer = memoryview(self._mmap)
+		self._views.append(buffer)
+		for section_number, section in enumerate(SECTIONS):
+			position, size = positions[2 * section_number], positions[2 * section_number + 1]
+			if position + size > len(self._mmap):
+				raise ValueError('mapped graph file is truncated')
+			view = buffer[position:position + size].cast(_SECTION_TYPECODES.get(section, 'q'))
+			self._views.append(view)
+			setattr(self, f'_{section}', view)
+
+	def close(self):
+		"""Releases the memory map and closes the file; the graph cannot be used afterwards."""
+		for view in reversed(self._views):
+			view.release()
+		self._views = []
+		self._strongly_connected_components = None
+		self._mmap.close()
+		self._file.close()
+
+	def __enter__(self) -> 'MappedGraph':
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self.close()
+
+	def __repr__(self) -> str:
+		return f'MappedGraph:{len(self)} nodes, {self.num_edges} edges, {self._path}'
+
+	@classmethod
+	def from_graph(cls, graph: 'BasicGraph', path: str) -> 'MappedGraph':
+		"""
+		Writes a graph to a file and opens it.
+
+		Args:
+			graph (BasicGraph): The graph or subgraph view.
+			path (str): The path of the file.
+
+		Returns:
+			MappedGraph: The opened file.
+		"""
+		write_mapped_graph(graph=graph, path=path)
+		return cls(path=path)
+
+	def __contains__(self, item) -> bool:
+		try:
+			self.get_index(item)
+		except KeyError:
+			return False
+		return True
+
+	@property
+	def nodes(self) -> List[Hashable]:
+		"""Gets the names of all the nodes, this reads every name in the file."""
+		return self._get_names(range(len(self)))
+
+	def get_index(self, node: Union[str, 'Node']) -> int:
+		"""
+		Gets the position of a node in the arrays.
+
+		Args:
+			node (Union[str, Node]): The node or its name.
+
+		Returns:
+			int: The index of the node.
+
+		Raises:
+			KeyError: If there is no node with that name.
+		"""
+		name = self._get_name(node)
+		kind, payload = encode_object(name)
+		name_hash = _hash_name(kind, payload)
+		hashes = self._name_hashes
+		position = bisect_left(hashes, name_hash)
+		while position < len(hashes) and hashes[position] == name_hash:
+			index = self._name_order[position]
+			if self.get_name(index) == name:
+				return index
+			position += 1
+		raise KeyError(name)
+
+	def get_name(self, index: int) -> Hashable:
+		"""Gets the name of the node at an index."""
+		offsets = self._name_offsets
+		return decode_object(self._name_kinds[index], self._name_data[offsets[index]:offsets[index + 1]])
+
+	def _get_names(self, indices) -> List[Hashable]:
+		get_name = self.get_name
+		return [get_name(index) for index in indices]
+
+	def _get_label_at(self, index: int) -> Optional[object]:
+		offsets = self._label_offsets
+		return decode_object(self._label_kinds[index], self._label_data[offsets[index]:offsets[index + 1]])
+
+	def _get_display_label(self, index: int) -> str:
+		# the same text as Node.label
+		label = self._get_label_at(index)
+		if label:
+			result = str(label)
+		else:
+			result = str(self.get_name(index))
+		return result.replace('"', '\\"')
+
+	def get_label(self, node: Union[str, 'Node']) -> Optional[object]:
+		"""Gets the label a node had when the file was written, None if it had no label."""
+		return self._get_label_at(self.get_index(node))
+
+	def _get_root_indices(self) -> List[int]:
+		# the roots are computed when the file is written
+		return list(self._roots)
+
+	def get_tree_str(
+			self, node: Optional[Union[str, 'Node']] = None, max_depth: Optional[int] = None,
+			max_children: Optional[int] = None
+	) -> str:
+		"""
+		Gets the same tree representation as BasicGraph.get_tree_str, or the tree of one node.
+
+		Args:
+			node (Optional[Union[str, Node]]): If given, only the tree below this node.
+			max_depth (Optional[int]): Nodes at this depth are not expanded, the roots are at depth 0.
+			max_children (Optional[int]): The maximum number of children shown per node, the rest are counted.
+
+		Returns:
+			str: The tree as a string.
+		"""
+		if node is None:
+			roots = self._get_root_indices()
+		else:
+			roots = [self.get_index(node)]
+		lines = list(iter_tree_lines(
+			roots=roots, get_children=self._get_children_indices, get_label=self._get_display_label,
+			key=_identity, max_depth=max_depth, max_children=max_children
+		))
+		if len(lines) == 0:
+			return ''
+		return '\n'.join(lines) + '\n'
+
+	def subgraph(
+			self, nodes: Optional[List[Union[str, 'Node']]] = None, direction: str = 'to_and_from',
+			max_distance: Optional[int] = None, graph_class: Optional[Type['BasicGraph']] = None
+	) -> 'BasicGraph':
+		"""
+		Loads some nodes, their ancestors and/or descendants and the edges between them into a graph that can be
+		rendered.
+
+		Args:
+			nodes (Optional[List[Union[str, Node]]]): The nodes to start from, all nodes if None.
+			direction (str): 'to' adds ancestors, 'from' adds descendants and 'to_and_from' adds both.
+			max_distance (Optional[int]): The maximum distance of the ancestors and descendants that are added.
+			graph_class (Optional[Type[BasicGraph]]): The class of the new graph, Graph by default.
+
+		Returns:
+			BasicGraph: A new graph with the labels stored in the file.
+		"""
+		if direction not in ('to', 'from', 'to_and_from'):
+			raise ValueError(f'direction should be one of "to", "from" or "to_and_from", not "{direction}"')
+		if graph_class is None:
+			from .Graph import Graph
+			graph_class = Graph
+
+		if nodes is None:
+			indices = dict.fromkeys(range(len(self)))
+		else:
+			# a dictionary is used as an ordered set of indices
+			indices = {}
+			for node in nodes:
+				index = self.get_index(node)
+				indices[index] = None
+				neighbour_getters = []
+				if direction in ('to', 'to_and_from'):
+					neighbour_getters.append(self._get_parents_indices)
+				if direction in ('from', 'to_and_from'):
+					neighbour_getters.append(self._get_children_indices)
+				for get_neighbours in neighbour_getters:
+					for relative in get_relatives(
+							start=index, get_neighbours=get_neighbours, distance=False, key=_identity,
+							max_distance=max_distance
+					):
+						indices[relative] = None
+
+		names = {index: self.get_name(index) for index in indices}
+		graph = graph_class()
+		with graph.bulk_load():
+			graph.add_nodes_from([(names[index], {'label': self._get_label_at(index)}) for index in indices])
+			graph.connect_many([
+				(names[index], names[child])
+				for index in indices for child in self._get_children_indices(index) if child in names
+			], if_edge_exists='ignore')
+		return graph
+
+	def to_graph(self, graph_class: Optional[Type['BasicGraph']] = None) -> 'BasicGraph':
+		"""Loads the whole file into a graph, see subgraph()."""
+		return self.subgraph(graph_class=graph_class)
@@ -1,12 +1,7 @@
-from ._GraphObj import GraphObj
+from ._GraphObj import GraphObj, is_same_key, is_immutable
 from .styling.NodeStyle import NodeStyle
-from typing import Optional, Union, List, Dict
-
-
-CORNER = u'\u2514'
-TWO_WAY = u'\u251C'
-HORIZONTAL = u'\u2500'
-VERTICAL = u'\u2502'
+from .tree_lines import CORNER, TWO_WAY, HORIZONTAL, VERTICAL, iter_tree_lines
+from typing import Optional, Union, List, Dict, Iterator
 
 
 class Node(GraphObj):
@@ -40,6 +35,7 @@ class Node(GraphObj):
 		self._inward_edges_have_end_node = True
 		self._index = index
 		graph._nodes_dict[name] = self
+		graph._node_edges_changed(node=self)
 
 	# make node hashable
 	def __hash__(self):
@@ -199,6 +195,7 @@ class Node(GraphObj):
 			edge (GraphObj): The edge to append.
 		"""
 		self.outward_edges_dict[edge.id] = edge
+		self._structure_changed()
 
 	def append_inward_edge(self, edge: 'GraphObj'):
 		"""
@@ -208,14 +205,22 @@ class Node(GraphObj):
 			edge (GraphObj): The edge to append.
 		"""
 		self.inward_edges_dict[edge.id] = edge
+		self._structure_changed()
 
 	def remove_outward_edge(self, edge_id: str):
 		"""Removes an outward edge by ID."""
 		del self.outward_edges_dict[edge_id]
+		self._structure_changed()
 
 	def remove_inward_edge(self, edge_id: str):
 		"""Removes an inward edge by ID."""
 		del self.inward_edges_dict[edge_id]
+		self._structure_changed()
+
+	def _structure_changed(self):
+		"""Lets the graph know that the edges of this node have changed."""
+		if self._graph is not None:
+			self._graph._node_edges_changed(node=self)
 
 	@property
 	def label(self) -> str:
@@ -262,53 +267,74 @@ class Node(GraphObj):
 
 	def __eq__(self, other: 'Node') -> bool:
 		"""Equality comparison for nodes."""
+		if self is other:
+			return True
 		if not isinstance(other, Node):
 			raise TypeError(f'node of type {type(other)} is not supported!')
 		return (self.index, self.name) == (other.index, other.name)
 
 	def __ne__(self, other: 'Node') -> bool:
 		"""Inequality comparison for nodes."""
+		if self is other:
+			return False
 		if not isinstance(other, Node):
 			raise TypeError(f'node of type {type(other)} is not supported!')
 		return (self.index, self.name) != (other.index, other.name)
 
-	def get_tree_str(self, indentation: str = '', already_added: Optional[List['Node']] = None) -> str:
+	def iter_tree_lines(
+			self, max_depth: Optional[int] = None, max_children: Optional[int] = None,
+			graph: Optional['Graph'] = None
+	) -> Iterator[str]:
+		"""
+		Generates the lines of the node's tree structure lazily, without line breaks.
+
+		Args:
+			max_depth (Optional[int]): Nodes at this depth are not expanded, the node itself is at depth 0.
+			max_children (Optional[int]): The maximum number of children shown per node, the rest are counted.
+			graph (Optional[Graph]): The graph or subgraph view whose edges are followed, by default the node's graph.
+
+		Yields:
+			str: The lines of the tree.
+		"""
+		graph = graph or self.graph
+
+		def get_children(node):
+			return graph.get_children(node=node)
+
+		return iter_tree_lines(
+			roots=[self], get_children=get_children, get_label=Node.label.fget, max_depth=max_depth,
+			max_children=max_children
+		)
+
+	def get_tree_str(
+			self, indentation: str = '', already_added: Optional[List['Node']] = None, graph: Optional['Graph'] = None
+	) -> str:
 		"""
 		Gets a string representation of the node's tree structure.
 
 		Args:
 			indentation (str): The indentation for the tree structure.
 			already_added (Optional[List[Node]]): Nodes that have already been added to avoid cycles.
+			graph (Optional[Graph]): The graph or subgraph view whose edges are followed, by default the node's graph.
 
 		Returns:
 			str: The tree structure as a string.
 		"""
+		graph = graph or self.graph
 		if already_added is None:
 			already_added = []
+		visited = set(map(id, already_added))
 
-		tree_string = self.label
-
-		if self in already_added:
-			tree_string += '*\n'
-
-		else:
-			tree_string += '\n'
-			num_children = len(self.children)
-
-			for child_num, child in enumerate(self.children):
-
-				already_added.append(self)
-				if child_num+1 == num_children:
-					tree_string += indentation + CORNER + ' ' + child.get_tree_str(
-						indentation=indentation + '  ', already_added=already_added
-					)
+		def get_children(node):
+			# only called for nodes that are not visited yet, the expanded nodes are reported back to the caller
+			children = graph.get_children(node=node)
+			if len(children) > 0:
+				already_added.append(node)
+			return children
 
-				else:
-					tree_string += indentation + TWO_WAY + ' ' + child.get_tree_str(
-						indentation=indentation + VERTICAL + ' ', already_added=already_added
-					)
-
-		return tree_string
+		lines = iter_tree_lines(roots=[self], get_children=get_children, get_label=Node.label.fget, visited=visited)
+		tree_string = next(lines) + '\n'
+		return tree_string + ''.join([indentation + line + '\n' for line in lines])
 
 	def get_graphviz_str(self) -> str:
 		"""
@@ -317,17 +343,30 @@ class Node(GraphObj):
 		Returns:
 			str: The Graphviz representation.
 		"""
+		# the string is cached until the label, tooltip or style change, unless the label can change in place
+		style = self._style
+		if is_immutable(self._label):
+			key = (
+				self.id, self._label, self._tooltip, style, None if style is None else style._version,
+				self._label_converter
+			)
+			cache = self._graphviz_cache
+			if cache is not None and is_same_key(key, cache[0]):
+				return cache[1]
+		else:
+			key = None
 
 		parts = [f'label="{self.display_label()}"']
 
 		if self._tooltip is not None:
 			parts.append(f'tooltip="{self._tooltip}"')
 
-		style = self.style
 		if style is not None:
 			parts.append(style.get_graphviz_str())
 
-		return f'"{self.id}" [' + ' '.join(parts) + ']'
+		result = f'"{self.id}" [' + ' '.join(parts) + ']'
+		self._graphviz_cache = None if key is None else (key, result)
+		return result
 
 	def connect_to(self, node: 'Node', **kwargs) -> 'GraphObj':
 		"""
@@ -424,37 +463,25 @@ class Node(GraphObj):
 	@property
 	def num_descendants(self) -> int:
 		"""Gets the number of descendants of the node."""
-		return len(self.descendants)
+		return self.graph.num_descendants(node=self)
 
 	@property
 	def outward_edges(self) -> List['Edge']:
 		"""Gets the outward edges of the node."""
-		result = []
-		for edge in self._outward_edges_dict.values():
-			if edge not in result:
-				result.append(edge)
-		return result
+		return list(self._outward_edges_dict.values())
 
 	@property
 	def inward_edges(self) -> List['Edge']:
 		"""Gets the inward edges of the node."""
-		result = []
-		for edge in self._inward_edges_dict.values():
-			if edge not in result:
-				result.append(edge)
-		return result
+		return list(self._inward_edges_dict.values())
 
 	@property
 	def edges(self) -> List['Edge']:
 		"""Gets all edges of the node."""
-		result = []
-		for edge in self.outward_edges_dict.values():
-			if edge not in result:
-				result.append(edge)
-		for edge in self.inward_edges_dict.values():
-			if edge not in result:
-				result.append(edge)
-		return result
+		# a self-loop is both an outward and an inward edge
+		edges = dict(self._outward_edges_dict)
+		edges.update(self._inward_edges_dict)
+		return list(edges.values())
 
 	def remove_edges(self):
 		"""Removes all edges from the node."""
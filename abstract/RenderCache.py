@@ -0,0 +1,173 @@
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Iterable, Optional, Union
+
+_KEY_LENGTH = 64
+
+
+def _is_key(name: str) -> bool:
+	return len(name) == _KEY_LENGTH and all(character in '0123456789abcdef' for character in name)
+
+
+class RenderCache:
+	def __init__(
+			self, max_items: int = 128, directory: Optional[str] = None, max_disk_bytes: int = 256 * 1024 * 1024
+	):
+		"""
+		Cache of rendered graphs, e.g. SVG or PNG, keyed by a hash of their Graphviz source, engine and format,
+		so a graph that has not changed is not rendered again.
+		The most recently used renders are kept in memory; with a directory they are also written to disk, where
+		the least recently used files are removed once the directory holds more than max_disk_bytes.
+		The cache can be shared between threads.
+
+		Args:
+			max_items (int): The number of renders kept in memory.
+			directory (Optional[str]): A directory for the disk tier, created if it does not exist; no disk tier if None.
+			max_disk_bytes (int): The maximum total size of the files in the directory.
+		"""
+		if max_items < 0:
+			raise ValueError('max_items should not be negative')
+		self._max_items = max_items
+		self._memory = OrderedDict()
+		self._directory = directory
+		self._max_disk_bytes = max_disk_bytes
+		# sizes of the files of the disk tier, least recently used first
+		self._disk = OrderedDict()
+		self._disk_bytes = 0
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		if directory is not None:
+			os.makedirs(directory, exist_ok=True)
+			self._scan_directory()
+
+	def __repr__(self) -> str:
+		return f'RenderCache:{len(self._memory)} in memory, {len(self._disk)} on disk'
+
+	def _scan_directory(self):
+		# files written by earlier processes, in the order of their modification times
+		entries = []
+		for entry in os.scandir(self._directory):
+			if entry.is_file() and _is_key(entry.name):
+				stat = entry.stat()
+				entries.append((stat.st_mtime, entry.name, stat.st_size))
+		for _, key, size in sorted(entries):
+			self._disk[key] = size
+			self._disk_bytes += size
+		self._evict_from_disk()
+
+	@staticmethod
+	def make_key(source: Union[str, Iterable[str]], engine: str = 'dot', format: str = 'svg') -> str:
+		"""
+		Hashes a Graphviz source with the engine and format it is rendered with.
+
+		Args:
+			source (Union[str, Iterable[str]]): The source, or its parts, e.g. from iter_graphviz_parts().
+			engine (str): The Graphviz layout engine.
+			format (str): The output format.
+
+		Returns:
+			str: The key, a SHA-256 hex digest.
+		"""
+		hasher = hashlib.sha256(f'{engine}\0{format}\0'.encode())
+		if isinstance(source, str):
+			hasher.update(source.encode())
+		else:
+			for part in source:
+				hasher.update(part.encode())
+		return hasher.hexdigest()
+
+	def _get_path(self, key: str) -> str:
+		return os.path.join(self._directory, key)
+
+	def get(self, key: str) -> Optional[bytes]:
+		"""
+		Gets a render from memory or, failing that, from disk, and marks it as recently used.
+
+		Args:
+			key (str): The key from make_key().
+
+		Returns:
+			Optional[bytes]: The render, None if it is not in the cache.
+		"""
+		with self._lock:
+			if key in self._memory:
+				self._memory.move_to_end(key)
+				self.hits += 1
+				return self._memory[key]
+
+			if key in self._disk:
+				path = self._get_path(key)
+				try:
+					with open(path, 'rb') as file:
+						data = file.read()
+					os.utime(path)
+				except FileNotFoundError:
+					# removed by another process sharing the directory
+					self._disk_bytes -= self._disk.pop(key)
+				else:
+					self._disk.move_to_end(key)
+					self._put_in_memory(key=key, data=data)
+					self.hits += 1
+					return data
+
+			self.misses += 1
+			return None
+
+	def put(self, key: str, data: bytes):
+		"""
+		Adds a render to memory and to disk, evicting the least recently used renders if there is no room.
+
+		Args:
+			key (str): The key from make_key().
+			data (bytes): The render.
+		"""
+		if not isinstance(data, bytes):
+			raise TypeError(f'data should be bytes, not {type(data)}')
+		with self._lock:
+			self._put_in_memory(key=key, data=data)
+			if self._directory is not None and len(data) <= self._max_disk_bytes:
+				# written to a temporary file first so other processes never read half a file
+				handle, temporary_path = tempfile.mkstemp(dir=self._directory, prefix='.tmp_')
+				try:
+					with os.fdopen(handle, 'wb') as file:
+						file.write(data)
+					os.replace(temporary_path, self._get_path(key))
+				except BaseException:
+					if os.path.exists(temporary_path):
+						os.remove(temporary_path)
+					raise
+				self._disk_bytes -= self._disk.pop(key, 0)
+				self._disk[key] = len(data)
+				self._disk_bytes += len(data)
+				self._evict_from_disk()
+
+	def _put_in_memory(self, key: str, data: bytes):
+		self._memory[key] = data
+		self._memory.move_to_end(key)
+		while len(self._memory) > self._max_items:
+			self._memory.popitem(last=False)
+
+	def _evict_from_disk(self):
+		while self._disk_bytes > self._max_disk_bytes and self._disk:
+			key, size = self._disk.popitem(last=False)
+			self._disk_bytes -= size
+			try:
+				os.remove(self._get_path(key))
+			except FileNotFoundError:
+				pass
+
+	def clear(self):
+		"""Removes every render from memory and from disk."""
+		with self._lock:
+			self._memory.clear()
+			for key in self._disk:
+				try:
+					os.remove(self._get_path(key))
+				except FileNotFoundError:
+					pass
+			self._disk.clear()
+			self._disk_bytes = 0
@@ -0,0 +1,68 @@
+from .get_strongly_connected_components import get_strongly_connected_components
+from typing import Callable, Hashable, Iterable, List
+
+
+class StronglyConnectedComponents:
+	def __init__(self, vertices: Iterable[Hashable], get_successors: Callable[[Hashable], Iterable[Hashable]]):
+		"""
+		Index of the strongly connected components of a directed graph.
+
+		Args:
+			vertices (Iterable[Hashable]): All vertices of the graph.
+			get_successors (Callable): Returns the vertices that a vertex has edges to.
+		"""
+		self._get_successors = get_successors
+		self._components = get_strongly_connected_components(vertices=vertices, get_successors=get_successors)
+		self._sources = None
+		self._component_indices = {}
+		self._cyclic = []
+		for component_index, component in enumerate(self._components):
+			for vertex in component:
+				self._component_indices[vertex] = component_index
+			if len(component) > 1:
+				self._cyclic.append(True)
+			else:
+				vertex = component[0]
+				self._cyclic.append(any(successor == vertex for successor in get_successors(vertex)))
+
+	@property
+	def components(self) -> List[List[Hashable]]:
+		"""Gets the components in reverse topological order."""
+		return self._components
+
+	def __len__(self) -> int:
+		return len(self._components)
+
+	def get_component_index(self, vertex: Hashable) -> int:
+		"""Gets the index of the component of a vertex."""
+		return self._component_indices[vertex]
+
+	def get_component(self, vertex: Hashable) -> List[Hashable]:
+		"""Gets all vertices in the same component as a vertex, including itself."""
+		return self._components[self._component_indices[vertex]]
+
+	def is_cyclic(self, component_index: int) -> bool:
+		"""Checks if a component has at least one loop, i.e. more than one vertex or a self-loop."""
+		return self._cyclic[component_index]
+
+	def is_in_loop(self, vertex: Hashable) -> bool:
+		"""Checks if a vertex is its own descendant."""
+		return self._cyclic[self._component_indices[vertex]]
+
+	def are_in_same_loop(self, vertex1: Hashable, vertex2: Hashable) -> bool:
+		"""Checks if each of two vertices is a descendant of the other."""
+		component_index = self._component_indices[vertex1]
+		return component_index == self._component_indices[vertex2] and self._cyclic[component_index]
+
+	def is_source(self, component_index: int) -> bool:
+		"""Checks if no other component has an edge into a component, i.e. it is a root of the condensation."""
+		if self._sources is None:
+			sources = [True] * len(self._components)
+			for component_index_, component in enumerate(self._components):
+				for vertex in component:
+					for successor in self._get_successors(vertex):
+						successor_component_index = self._component_indices[successor]
+						if successor_component_index != component_index_:
+							sources[successor_component_index] = False
+			self._sources = sources
+		return self._sources[component_index]
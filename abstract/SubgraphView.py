@@ -0,0 +1,227 @@
+from ._BasicGraph import BasicGraph
+from .StronglyConnectedComponents import StronglyConnectedComponents
+from .Node import Node
+from .Edge import Edge
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+
+class SubgraphView(BasicGraph):
+	# the style overwrites of the underlying graph also name nodes and edges outside the view
+	_skips_missing_overwrites = True
+
+	def __init__(self, graph: BasicGraph, nodes: Iterable[Union[str, Node]]):
+		"""
+		Read-only view of some of the nodes of a graph and the edges between them, nothing is copied.
+		Edges are read live from the underlying graph, while the set of nodes is fixed when the view is created.
+		Settings such as direction and colour scheme come from the underlying graph, and so does rendering
+		when the underlying graph can be rendered.
+		Nodes and edges are shared with the underlying graph, so stylizing or rendering the view sets their styles
+		in the underlying graph too, until it is stylized or rendered again; materialize() styles separate copies.
+
+		Args:
+			graph (BasicGraph): The underlying graph or another view of it.
+			nodes (Iterable[Union[str, Node]]): The nodes in the view; their order is kept.
+		"""
+		if isinstance(graph, SubgraphView):
+			nodes = [graph.get_node(node=node) for node in nodes]
+			graph = graph._graph
+		self._graph = graph
+		nodes_dict = {}
+		for node in nodes:
+			node = graph.get_node(node=node)
+			nodes_dict[node.id] = node
+		self._nodes_dict = nodes_dict
+		self._strongly_connected_components = None
+		self._strongly_connected_components_version = None
+		self._cached_edges_dict = None
+		self._cached_edges_dict_version = None
+
+	def __getattr__(self, item):
+		# private settings such as _direction or _colour_scheme are read from the underlying graph
+		graph = self.__dict__.get('_graph')
+		if graph is None or not item.startswith('_') or item.startswith('__'):
+			raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
+		return getattr(graph, item)
+
+	def __getstate__(self) -> Dict:
+		"""Returns the state of the view for pickling."""
+		return {'graph': self._graph, 'nodes': list(self._nodes_dict.keys())}
+
+	def __setstate__(self, state: Dict):
+		"""Restores the state of the view from a pickled state."""
+		self.__init__(graph=state['graph'], nodes=state['nodes'])
+
+	def __repr__(self) -> str:
+		return f'SubgraphView:{len(self._nodes_dict)} nodes of {self._graph.__class__.__name__}'
+
+	@property
+	def graph(self) -> BasicGraph:
+		"""Gets the underlying graph."""
+		return self._graph
+
+	def _get_settings(self) -> Dict:
+		return self._graph._get_settings()
+
+	def _get_saved_settings(self) -> Dict:
+		return self._graph._get_saved_settings()
+
+	def materialize(self, values: str = 'share', styles: str = 'copy') -> BasicGraph:
+		"""Copies the nodes and edges of the view into a new, independent graph of the underlying graph's class.
+
+		Args:
+			values (str): How the values of nodes and edges are copied: 'share', 'shallow' or 'deep'.
+			styles (str): 'copy' gives every node and edge its own shallow copy of its style, 'share' reuses the
+				style objects, so a change to a shared style shows in both graphs.
+
+		Returns:
+			BasicGraph: The new graph.
+		"""
+		return self._graph._build_copy(
+			nodes=self._nodes_dict.values(), edges=self._edges_dict.values(), values=values, styles=styles
+		)
+
+	def copy(self, values: str = 'deep', styles: str = 'copy') -> BasicGraph:
+		"""Same as materialize() but values are deep-copied by default, like BasicGraph.copy()."""
+		return self.materialize(values=values, styles=styles)
+
+	def subgraph(
+			self, nodes: Optional[List[Union[str, Node]]] = None, direction: str = 'to_and_from',
+			filter_type: str = 'include'
+	) -> 'SubgraphView':
+		"""Creates a view of some of the nodes of this view over the same underlying graph."""
+		return SubgraphView(graph=self, nodes=self._get_filtered_names(
+			nodes=nodes, direction=direction, filter_type=filter_type
+		))
+
+	# structure, restricted to the nodes of the view
+	def _iterate_parents(self, node: Node):
+		nodes_dict = self._nodes_dict
+		return (edge._start for edge in node._inward_edges_dict.values() if edge._start._raw_id in nodes_dict)
+
+	def _iterate_children(self, node: Node):
+		nodes_dict = self._nodes_dict
+		return (edge._end for edge in node._outward_edges_dict.values() if edge._end._raw_id in nodes_dict)
+
+	def _get_children_names(self, name: Hashable):
+		return (child._raw_id for child in self._iterate_children(self._nodes_dict[name]))
+
+	@property
+	def _edges_dict(self) -> Dict[Tuple, Edge]:
+		# like the strongly connected components, the edges are collected again when the underlying graph changes
+		version = self._graph._structure_version
+		if self._cached_edges_dict is None or self._cached_edges_dict_version != version:
+			nodes_dict = self._nodes_dict
+			self._cached_edges_dict = {
+				edge_id: edge
+				for node in nodes_dict.values() for edge_id, edge in node._outward_edges_dict.items()
+				if edge._end._raw_id in nodes_dict
+			}
+			self._cached_edges_dict_version = version
+		return self._cached_edges_dict
+
+	def get_outward_edges(self, node: Union[str, Node]) -> List[Edge]:
+		"""Gets the outward edges of a node that end in the view."""
+		node = self.get_node(node=node)
+		nodes_dict = self._nodes_dict
+		return [edge for edge in node._outward_edges_dict.values() if edge._end._raw_id in nodes_dict]
+
+	def get_inward_edges(self, node: Union[str, Node]) -> List[Edge]:
+		"""Gets the inward edges of a node that start in the view."""
+		node = self.get_node(node=node)
+		nodes_dict = self._nodes_dict
+		return [edge for edge in node._inward_edges_dict.values() if edge._start._raw_id in nodes_dict]
+
+	@property
+	def absolute_roots(self) -> List[Node]:
+		"""Gets the nodes without parents in the view."""
+		return [node for node in self._nodes_dict.values() if next(self._iterate_parents(node), None) is None]
+
+	@property
+	def leaves(self) -> List[Node]:
+		"""Gets the nodes without children in the view."""
+		return [node for node in self._nodes_dict.values() if next(self._iterate_children(node), None) is None]
+
+	@property
+	def strongly_connected_components(self) -> StronglyConnectedComponents:
+		"""Gets the strongly connected components of the view, recomputed when the underlying graph changes."""
+		version = self._graph._structure_version
+		if self._strongly_connected_components is None or self._strongly_connected_components_version != version:
+			self._strongly_connected_components = StronglyConnectedComponents(
+				vertices=self._nodes_dict.keys(), get_successors=self._get_children_names
+			)
+			self._strongly_connected_components_version = version
+		return self._strongly_connected_components
+
+	# a view is read-only
+	def add_node(self, *args, **kwargs):
+		raise RuntimeError('SubgraphView is read-only, use materialize() to get a graph that can be changed!')
+
+	def remove_node(self, *args, **kwargs):
+		raise RuntimeError('SubgraphView is read-only, use materialize() to get a graph that can be changed!')
+
+	def connect(self, *args, **kwargs):
+		raise RuntimeError('SubgraphView is read-only, use materialize() to get a graph that can be changed!')
+
+	def disconnect(self, *args, **kwargs):
+		raise RuntimeError('SubgraphView is read-only, use materialize() to get a graph that can be changed!')
+
+	# rendering is done by the methods of the underlying graph's class
+	def stylize(self):
+		"""Applies styles to the nodes and edges in the view, which are those of the underlying graph."""
+		return type(self._graph).stylize(self)
+
+	def get_graphviz_header(self, *args, **kwargs) -> str:
+		"""Generates the Graphviz header of the underlying graph."""
+		return self._graph.get_graphviz_header(*args, **kwargs)
+
+	def iter_graphviz_parts(self, *args, **kwargs):
+		"""Generates the Graphviz representation of the view part by part."""
+		return type(self._graph).iter_graphviz_parts(self, *args, **kwargs)
+
+	def write_graphviz(self, *args, **kwargs):
+		"""Writes the Graphviz representation of the view to a file."""
+		return type(self._graph).write_graphviz(self, *args, **kwargs)
+
+	def get_graphviz_str(self, *args, **kwargs) -> str:
+		"""Generates the Graphviz string representation of the view."""
+		return type(self._graph).get_graphviz_str(self, *args, **kwargs)
+
+	def get_graphviz_source(self, *args, **kwargs):
+		"""Generates the Graphviz source for the view."""
+		return type(self._graph).get_graphviz_source(self, *args, **kwargs)
+
+	def summarize(self, *args, **kwargs) -> BasicGraph:
+		"""Creates a smaller graph for display from the view, see the summarize method of the underlying graph."""
+		return type(self._graph).summarize(self, *args, **kwargs)
+
+	def render(self, *args, **kwargs):
+		"""Renders the view, see the render method of the underlying graph."""
+		return type(self._graph).render(self, *args, **kwargs)
+
+	def get_svg(self, *args, **kwargs) -> str:
+		"""Generates the SVG representation of the view."""
+		return type(self._graph).get_svg(self, *args, **kwargs)
+
+	async def _ajoin_graphviz_parts(self, **kwargs) -> str:
+		# defined here because private attributes are otherwise those of the underlying graph
+		return await type(self._graph)._ajoin_graphviz_parts(self, **kwargs)
+
+	async def aget_graphviz_source(self, *args, **kwargs):
+		"""Generates the Graphviz source for the view, see the aget_graphviz_source method of the underlying graph."""
+		return await type(self._graph).aget_graphviz_source(self, *args, **kwargs)
+
+	async def arender(self, *args, **kwargs):
+		"""Renders the view, see the arender method of the underlying graph."""
+		return await type(self._graph).arender(self, *args, **kwargs)
+
+	async def aget_svg(self, *args, **kwargs) -> str:
+		"""Generates the SVG representation of the view, see the aget_svg method of the underlying graph."""
+		return await type(self._graph).aget_svg(self, *args, **kwargs)
+
+	def get_html(self, *args, **kwargs):
+		"""Generates the HTML representation of the view."""
+		return type(self._graph).get_html(self, *args, **kwargs)
+
+	def _repr_html_(self) -> str:
+		"""Returns the HTML representation of the view."""
+		return self.get_svg()
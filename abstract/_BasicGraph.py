@@ -5,10 +5,22 @@ from .styling.NodeStyle import NodeStyle
 from .get_ancestors import get_ancestors
 from .get_descendants import get_descendants
 from .parse_indentations_function import parse_indentations
-
+from .traverse import get_relatives, traverse_depth_first
+from .StronglyConnectedComponents import StronglyConnectedComponents
+from .GraphSnapshot import GraphSnapshot
+from .graph_file import save_graph, load_graph
+from .read_edge_file import iter_edge_chunks, open_text_file
+from .paused_garbage_collection import paused_garbage_collection
+from .ndjson import open_text
+from .tree_lines import walk_tree, iter_tree_lines
+
+import os
 import warnings
-from copy import deepcopy
-from typing import Optional, List, Union, Dict, Tuple
+from copy import copy, deepcopy
+from contextlib import contextmanager
+from itertools import islice
+from types import MappingProxyType
+from typing import Optional, List, Union, Dict, Tuple, Iterable, Iterator, BinaryIO, TextIO, Mapping
 
 
 class BasicGraph:
@@ -29,9 +41,21 @@ class BasicGraph:
 		self._node_counter = 0
 		self._node_label_converter = node_label_converter
 		self._edge_label_converter = edge_label_converter
+		self._bulk_load_depth = 0
+		self._deferred_warnings = []
+		self._bulk_changed_nodes = {}
+		self._structure_version = 0
+		self._reset_indices()
 		# if a dictionary or an object with a __graph__() method is passed use that to create the graph
 
 	_STATE_ATTRIBUTES = ['_nodes_dict', '_is_strict', '_ordering', '_node_counter']
+	# attributes that describe the nodes and edges rather than the settings of the graph
+	_STRUCTURE_ATTRIBUTES = [
+		'_nodes_dict', '_edges_dict', '_absolute_root_names', '_leaf_names', '_strongly_connected_components',
+		'_structure_version', '_bulk_load_depth', '_deferred_warnings', '_bulk_changed_nodes'
+	]
+	# settings that only matter while the graph is in use, shared by copies but not saved to files
+	_RUNTIME_ATTRIBUTES = []
 
 	#  for pickling and copying
 	def __getstate__(self) -> Dict:
@@ -51,51 +75,272 @@ class BasicGraph:
 		if not self._nodes_have_graph:
 			for node in self.nodes:
 				node._graph = self
+				node.update_edges()
+			self._nodes_have_graph = True
+		self._bulk_load_depth = 0
+		self._deferred_warnings = []
+		self._bulk_changed_nodes = {}
+		self._structure_version = 0
+		self._reset_indices()
+
+	def _reset_indices(self):
+		"""Rebuilds the indices that are derived from the structure of the graph."""
+		self._edges_dict = {
+			edge.id: edge for node in self._nodes_dict.values() for edge in node._outward_edges_dict.values()
+		}
+		self._reset_node_indices()
+
+	def _reset_node_indices(self):
+		"""Rebuilds the loop, root and leaf indices from the edges of every node."""
+		self._structure_version += 1
+		self._strongly_connected_components = None
+		# dictionaries are used as ordered sets of node names
+		self._absolute_root_names = {name: None for name, node in self._nodes_dict.items() if not node._inward_edges_dict}
+		self._leaf_names = {name: None for name, node in self._nodes_dict.items() if not node._outward_edges_dict}
+
+	def _node_edges_changed(self, node: Node):
+		"""Updates the indices after a node is created or one of its edges is added or removed."""
+		if self._bulk_load_depth > 0:
+			# the node is updated at the end of the bulk load, in the order in which nodes first changed
+			self._bulk_changed_nodes[node.id] = node
+			return
+		self._structure_version += 1
+		self._strongly_connected_components = None
+		self._update_root_and_leaf_names(node=node)
+
+	def _update_node_indices(self, nodes: Iterable[Node]):
+		"""Updates the loop, root and leaf indices after the edges of some nodes changed, e.g. in a bulk load."""
+		self._structure_version += 1
+		self._strongly_connected_components = None
+		nodes_dict = self._nodes_dict
+		for node in nodes:
+			# nodes removed later in the bulk load are already out of the indices
+			if nodes_dict.get(node.id) is node:
+				self._update_root_and_leaf_names(node=node)
+
+	def _update_root_and_leaf_names(self, node: Node):
+		if node._inward_edges_dict:
+			self._absolute_root_names.pop(node.id, None)
+		else:
+			self._absolute_root_names[node.id] = None
+		if node._outward_edges_dict:
+			self._leaf_names.pop(node.id, None)
+		else:
+			self._leaf_names[node.id] = None
+
+	@property
+	def strongly_connected_components(self) -> StronglyConnectedComponents:
+		"""Gets the strongly connected components of the graph, keyed by node name.
+
+		Returns:
+			StronglyConnectedComponents: The components, computed once and cached until the graph changes.
+		"""
+		if self._strongly_connected_components is None:
+			self._strongly_connected_components = StronglyConnectedComponents(
+				vertices=self._nodes_dict.keys(), get_successors=self._get_children_names
+			)
+		return self._strongly_connected_components
+
+	def _get_children_names(self, name):
+		return (edge._end.id for edge in self._nodes_dict[name]._outward_edges_dict.values())
 
 	# methods that return a new graph
-	def copy(self) -> 'BasicGraph':
-		"""Creates a copy of the graph.
+	def copy(self, values: str = 'deep', styles: str = 'copy') -> 'BasicGraph':
+		"""Creates a copy of the graph by rebuilding its nodes and edges in one pass.
+
+		Args:
+			values (str): How the values of nodes and edges are copied: 'share', 'shallow' or 'deep'.
+			styles (str): 'copy' gives every node and edge its own shallow copy of its style, 'share' reuses the
+				style objects, which are mutable, so a change to a shared style shows in both graphs.
 
 		Returns:
 			BasicGraph: A copy of the graph.
 		"""
-		return deepcopy(self)
+		return self._build_copy(
+			nodes=self._nodes_dict.values(), edges=self._edges_dict.values(), values=values, styles=styles
+		)
 
-	def filter(self, nodes: Optional[List[Union[str, Node]]] = None, direction: str = 'to_and_from', filter_type: str = 'include') -> 'BasicGraph':
+	def save(self, path: Union[str, BinaryIO]):
+		"""Writes the graph to a flat binary file that load() can read, see graph_file.save_graph.
+
+		Args:
+			path (Union[str, BinaryIO]): A path or a binary file object.
 		"""
-		Filters nodes out or in and returns a new graph.
+		save_graph(graph=self, file=path)
+
+	@classmethod
+	def load(cls, path: Union[str, BinaryIO]) -> 'BasicGraph':
+		"""Reads a graph written by save(); the graph gets the class and settings it was saved with.
 
 		Args:
-			nodes (Optional[List[Union[str, Node]]]): Nodes to filter.
-			direction (str): Direction of filtering.
-			filter_type (str): 'include' means only these nodes, 'exclude' means all nodes but these nodes.
+			path (Union[str, BinaryIO]): A path or a binary file object.
 
 		Returns:
-			BasicGraph: The filtered graph.
+			BasicGraph: The loaded graph.
+
+		Raises:
+			ValueError: If the file is not a graph file or its format version is newer than this code.
+			TypeError: If the saved graph is not an instance of this class.
+		"""
+		return load_graph(file=path, cls=cls)
+
+	def snapshot(self) -> GraphSnapshot:
+		"""Compiles the structure of the graph into an immutable snapshot backed by integer arrays.
+
+		Returns:
+			GraphSnapshot: A snapshot that answers parent, child, ancestor and descendant queries by node name.
 		"""
+		return GraphSnapshot(graph=self)
+
+	def freeze(self) -> GraphSnapshot:
+		"""Same as snapshot(); the graph itself stays mutable.
+
+		Returns:
+			GraphSnapshot: A snapshot of the graph.
+		"""
+		return self.snapshot()
+
+	def _get_settings(self) -> Dict:
+		"""Gets the attributes of the graph that are not part of its structure."""
+		return {key: value for key, value in self.__dict__.items() if key not in self._STRUCTURE_ATTRIBUTES}
+
+	def _get_saved_settings(self) -> Dict:
+		"""Gets the settings of the graph that are written to files, i.e. without runtime state such as caches."""
+		return {key: value for key, value in self._get_settings().items() if key not in self._RUNTIME_ATTRIBUTES}
+
+	@classmethod
+	def _from_settings(cls, settings: Dict) -> 'BasicGraph':
+		"""Creates an empty graph with the given settings without calling __init__."""
+		graph = cls.__new__(cls)
+		graph.__dict__.update(settings)
+		graph._nodes_dict = {}
+		graph._bulk_load_depth = 0
+		graph._deferred_warnings = []
+		graph._bulk_changed_nodes = {}
+		graph._structure_version = 0
+		graph._reset_indices()
+		return graph
+
+	def _build_copy(
+			self, nodes: Iterable[Node], edges: Iterable[Edge], values: str = 'share', styles: str = 'copy'
+	) -> 'BasicGraph':
+		"""
+		Creates a graph of the same class and settings with copies of some of the nodes and edges.
+
+		Args:
+			nodes (Iterable[Node]): The nodes to copy.
+			edges (Iterable[Edge]): The edges to copy, both of their nodes should be among nodes.
+			values (str): How values are copied: 'share', 'shallow' or 'deep'.
+			styles (str): How styles are copied: 'copy' (shallow copy) or 'share'.
+
+		Returns:
+			BasicGraph: The new graph.
+		"""
+		if values == 'share':
+			copy_value = None
+		elif values == 'shallow':
+			copy_value = copy
+		elif values == 'deep':
+			# one memo for all values so that objects shared between values stay shared in the copy
+			memo = {}
+			def copy_value(value):
+				return deepcopy(value, memo)
+		else:
+			raise ValueError(f'values should be one of "share", "shallow" or "deep", not "{values}"')
+
+		if styles == 'copy':
+			copy_style = copy
+		elif styles == 'share':
+			copy_style = None
+		else:
+			raise ValueError(f'styles should be one of "share" or "copy", not "{styles}"')
+
+		settings = {key: value.copy() if isinstance(value, dict) else value for key, value in self._get_settings().items()}
+		graph = self._from_settings(settings=settings)
+
+		new_nodes_dict = graph._nodes_dict
+		with graph.bulk_load():
+			for node in nodes:
+				value = node._value
+				style = node._style
+				new_node = Node(
+					graph=graph, name=node._raw_id, label=node._label, tooltip=node._tooltip, index=node._index,
+					value=value if copy_value is None or value is None else copy_value(value),
+					style=style if copy_style is None or style is None else copy_style(style),
+					**node._parameters
+				)
+				new_node._frozen = node._frozen
+
+			for edge in edges:
+				value = edge._value
+				style = edge._style
+				new_edge = Edge(
+					graph=graph, start=new_nodes_dict[edge._start._raw_id], end=new_nodes_dict[edge._end._raw_id],
+					id=edge._raw_id, label=edge._label, tooltip=edge._tooltip,
+					value=value if copy_value is None or value is None else copy_value(value),
+					style=style if copy_style is None or style is None else copy_style(style),
+					**edge._parameters
+				)
+				new_edge._frozen = edge._frozen
+		return graph
+
+	def _get_filtered_names(self, nodes: Optional[List[Union[str, Node]]], direction: str, filter_type: str) -> List:
+		"""Finds the names of the nodes that filter() and subgraph() keep."""
+		if direction not in ('to', 'from', 'to_and_from'):
+			raise ValueError(f'direction should be one of "to", "from" or "to_and_from", not "{direction}"')
+
 		nodes = nodes or []
+		# a dictionary is used as an ordered set of names
 		relatives = {}
 		for x in nodes:
 			node = self.get_node(node=x)
-			name = node.name
-			relatives[name] = 1
-			if direction == 'to' or 'to_and_from':
-				for ancestor in node.ancestors:
-					relatives[ancestor.name] = 1
+			relatives[node.name] = None
+			if direction in ('to', 'to_and_from'):
+				for ancestor in traverse_depth_first(start=node, get_neighbours=self._iterate_parents):
+					relatives[ancestor.name] = None
 
-			if direction == 'from' or 'to_and_from':
-				for descendant in node.descendants:
-					relatives[descendant.name] = 1
+			if direction in ('from', 'to_and_from'):
+				for descendant in traverse_depth_first(start=node, get_neighbours=self._iterate_children):
+					relatives[descendant.name] = None
 
 		if filter_type == 'include':
-			to_delete = [name for name in self.nodes_dict.keys() if name not in relatives]
+			return list(relatives)
 		else:
-			to_delete = relatives.keys()
+			return [name for name in self._nodes_dict.keys() if name not in relatives]
+
+	def subgraph(
+			self, nodes: Optional[List[Union[str, Node]]] = None, direction: str = 'to_and_from',
+			filter_type: str = 'include'
+	) -> 'SubgraphView':
+		"""
+		Creates a read-only view of some of the nodes and the edges between them without copying anything.
+
+		Args:
+			nodes (Optional[List[Union[str, Node]]]): Nodes to filter.
+			direction (str): 'to' adds the ancestors of the nodes, 'from' their descendants, 'to_and_from' both.
+			filter_type (str): 'include' means only these nodes, 'exclude' means all nodes but these nodes.
+
+		Returns:
+			SubgraphView: The view; use materialize() on it to get an independent graph.
+		"""
+		from .SubgraphView import SubgraphView
+		return SubgraphView(graph=self, nodes=self._get_filtered_names(
+			nodes=nodes, direction=direction, filter_type=filter_type
+		))
+
+	def filter(self, nodes: Optional[List[Union[str, Node]]] = None, direction: str = 'to_and_from', filter_type: str = 'include') -> 'BasicGraph':
+		"""
+		Filters nodes out or in and returns a new graph.
 
-		new_graph = self.copy()
-		for name in to_delete:
-			new_graph.remove_node(node=name)
-		return new_graph
+		Args:
+			nodes (Optional[List[Union[str, Node]]]): Nodes to filter.
+			direction (str): 'to' adds the ancestors of the nodes, 'from' their descendants, 'to_and_from' both.
+			filter_type (str): 'include' means only these nodes, 'exclude' means all nodes but these nodes.
+
+		Returns:
+			BasicGraph: The filtered graph.
+		"""
+		return self.subgraph(nodes=nodes, direction=direction, filter_type=filter_type).materialize()
 
 	@classmethod
 	def from_lists(cls, start: List[str], end: List[str], edge: List[Optional[str]], strict: bool = False) -> 'BasicGraph':
@@ -112,10 +357,115 @@ class BasicGraph:
 			BasicGraph: The created graph.
 		"""
 		graph = cls(strict=strict)
-		for index, start_name, end_name, edge_name in zip(range(len(start)), start, end, edge):
-			start_node = graph.add_node(name=start_name, if_node_exists='ignore')
-			end_node = graph.add_node(name=end_name, if_node_exists='ignore')
-			graph.connect(start=start_node, end=end_node, id=index, label=edge_name)
+		with graph.bulk_load():
+			graph.add_nodes_from(
+				(name for start_and_end in zip(start, end, edge) for name in start_and_end[:2]), if_node_exists='ignore'
+			)
+			for index, start_name, end_name, edge_name in zip(range(len(start)), start, end, edge):
+				graph.connect(start=start_name, end=end_name, id=index, label=edge_name)
+		return graph
+
+	@classmethod
+	def from_edge_file(
+			cls, path: str, start_col: Union[str, int], end_col: Union[str, int],
+			label_col: Optional[Union[str, int]] = None, chunk_size: int = 100000, id_col: Optional[Union[str, int]] = None,
+			delimiter: Optional[str] = None, header: bool = True, encoding: str = 'utf-8', strict: bool = False
+	) -> 'BasicGraph':
+		"""
+		Creates a graph from a delimited text file with one edge per row, such as a csv or tsv file, gzipped or not.
+		The file is read a chunk of rows at a time and every chunk goes through add_nodes_from() and connect_many()
+		in one bulk load, so only one chunk is held in memory besides the graph.
+
+		Args:
+			path (str): The path of the file.
+			start_col (Union[str, int]): Name (if there is a header) or position of the column of start nodes.
+			end_col (Union[str, int]): Name or position of the column of end nodes.
+			label_col (Optional[Union[str, int]]): Name or position of the column of edge labels.
+			chunk_size (int): The number of rows read at a time.
+			id_col (Optional[Union[str, int]]): Name or position of the column of edge IDs; by default the position of
+				the row is used, as in from_lists(), so repeated pairs become separate edges.
+			delimiter (Optional[str]): By default tab for .tsv and .tab files and comma for everything else.
+			header (bool): If True, the first row has the column names.
+			encoding (str): The encoding of the text.
+			strict (bool): If True, the graph will be strict.
+
+		Returns:
+			BasicGraph: The created graph.
+		"""
+		graph = cls(strict=strict)
+		# the loop only creates nodes and edges, so the full collections they would trigger are put off
+		with graph.bulk_load(pause_garbage_collection=True):
+			for edges in iter_edge_chunks(
+					path=path, start_col=start_col, end_col=end_col, label_col=label_col, id_col=id_col,
+					chunk_size=chunk_size, delimiter=delimiter, header=header, encoding=encoding
+			):
+				graph.add_nodes_from(
+					(name for start, end, _, _ in edges for name in (start, end)), if_node_exists='ignore'
+				)
+				graph.connect_many(
+					(start, end, {'id': edge_id, 'label': label}) for start, end, edge_id, label in edges
+				)
+		return graph
+
+	@classmethod
+	def from_arrays(cls, start, end, edge_ids=None, values=None, strict: bool = False) -> 'BasicGraph':
+		"""
+		Creates a graph from arrays of start and end node names, e.g. columns of a table. Requires numpy.
+
+		Args:
+			start (array-like): Names of the start nodes, strings or integers.
+			end (array-like): Names of the end nodes, of the same length as start.
+			edge_ids (Optional[array-like]): Extra edge IDs; by default the position of the edge is used.
+			values (Optional[array-like]): A value for every edge.
+			strict (bool): If True, the graph will be strict.
+
+		Returns:
+			BasicGraph: The created graph.
+		"""
+		import numpy as np
+
+		start = np.asarray(start)
+		end = np.asarray(end)
+		if start.ndim != 1 or start.shape != end.shape:
+			raise ValueError(f'start and end should be one dimensional arrays of the same length, got {start.shape} and {end.shape}')
+		num_edges = len(start)
+
+		# unique names in the order they first appear as start, end, start, end, ...
+		names, first_positions, positions = np.unique(
+			np.column_stack((start, end)).ravel(), return_index=True, return_inverse=True
+		)
+		order = np.argsort(first_positions, kind='stable')
+		ranks = np.empty_like(order)
+		ranks[order] = np.arange(len(order))
+		positions = ranks[positions.ravel()]
+		start_positions = positions[0::2].tolist()
+		end_positions = positions[1::2].tolist()
+
+		if edge_ids is None:
+			edge_ids = range(num_edges)
+		elif len(edge_ids) != num_edges:
+			raise ValueError(f'there are {len(edge_ids)} edge_ids for {num_edges} edges')
+		elif hasattr(edge_ids, 'tolist'):
+			edge_ids = edge_ids.tolist()
+
+		if values is None:
+			values = [None] * num_edges
+		elif len(values) != num_edges:
+			raise ValueError(f'there are {len(values)} values for {num_edges} edges')
+		elif hasattr(values, 'tolist'):
+			values = values.tolist()
+
+		graph = cls(strict=strict)
+		with graph.bulk_load():
+			nodes = graph.add_nodes_from(names[order].tolist(), if_node_exists='error')
+			for start_position, end_position, edge_id, value in zip(start_positions, end_positions, edge_ids, values):
+				start_node = nodes[start_position]
+				end_node = nodes[end_position]
+				if (start_node.id, end_node.id, edge_id) in start_node._outward_edges_dict:
+					# let connect apply the duplicate edge policy
+					graph.connect(start=start_node, end=end_node, id=edge_id, value=value)
+				else:
+					Edge(graph=graph, start=start_node, end=end_node, id=edge_id, value=value)
 		return graph
 
 	@classmethod
@@ -137,17 +487,17 @@ class BasicGraph:
 		descendants = get_descendants(obj=obj, distance=False, max_depth=max_depth)
 		ancestors = get_ancestors(obj=obj, distance=False, max_height=max_height)
 
-		obj_and_descendants = [obj] + descendants
+		obj_and_descendants = {id(obj)}.union(map(id, descendants))
 		for child in descendants:
 			for parent in child.__parents__():
-				if parent in obj_and_descendants:
+				if id(parent) in obj_and_descendants:
 					graph.add_node(name=child.__hash__(), label=str(child))
 					graph.connect(start=parent.__hash__(), end=child.__hash__())
 
-		obj_and_ancestors = [obj] + ancestors
+		obj_and_ancestors = {id(obj)}.union(map(id, ancestors))
 		for parent in ancestors:
 			for child in parent.__children__():
-				if child in obj_and_ancestors:
+				if id(child) in obj_and_ancestors:
 					graph.add_node(name=parent.__hash__(), label=str(parent))
 					graph.connect(start=parent.__hash__(), end=child.__hash__())
 
@@ -157,6 +507,7 @@ class BasicGraph:
 	def from_indented_text(cls, root: str, lines: List[str], indent: Optional[str] = None) -> 'BasicGraph':
 		"""
 		Converts indented text into a graph.
+		The content of every line is its label and value, see from_indented_lines().
 
 		Args:
 			root (str): The root node.
@@ -166,19 +517,160 @@ class BasicGraph:
 		Returns:
 			BasicGraph: The created graph.
 		"""
+		return cls.from_indented_lines(lines=lines, root=root, indent=indent, skip_empty_lines=False)
+
+	@classmethod
+	def from_indented_lines(
+			cls, lines: Iterable[str], root: str = 'root', indent: Optional[str] = None, skip_empty_lines: bool = True,
+			chunk_size: int = 10000
+	) -> 'BasicGraph':
+		"""
+		Converts an indented outline into a tree, reading the lines lazily so an open file can be passed.
+		The node of the line at index i is named str(i) and has the content of the line as its label and value.
+		Lines without a parent are children of a node named 'root'.
+
+		Args:
+			lines (Iterable[str]): The lines of text, e.g. an open file.
+			root (str): The label of the root node.
+			indent (Optional[str]): The indentation of one level; by default the leading whitespace of the first
+				indented line.
+			skip_empty_lines (bool): If True, empty lines do not become nodes.
+			chunk_size (int): The number of lines added at a time.
+
+		Returns:
+			BasicGraph: The created graph.
+		"""
+		if chunk_size < 1:
+			raise ValueError('chunk_size should be at least 1')
 		graph = cls(strict=True)
-		graph.add_node(name='root', label=root)
-		lines = parse_indentations(lines, indent=indent)
+		parsed_lines = parse_indentations(lines, indent=indent)
+		with graph.bulk_load():
+			graph.add_node(name='root', label=root)
+			while True:
+				chunk = list(islice(parsed_lines, chunk_size))
+				if not chunk:
+					break
+				if skip_empty_lines:
+					chunk = [line for line in chunk if line[2]]
+				graph.add_nodes_from(
+					(str(index), {'label': content, 'value': content}) for index, _, content, _ in chunk
+				)
+				graph.connect_many(
+					('root' if parent_index is None else str(parent_index), str(index))
+					for index, _, _, parent_index in chunk
+				)
+		return graph
+
+	@classmethod
+	def from_indented_file(
+			cls, path: str, root: Optional[str] = None, indent: Optional[str] = None, encoding: str = 'utf-8',
+			skip_empty_lines: bool = True
+	) -> 'BasicGraph':
+		"""
+		Converts an indented text file, gzipped or not, into a tree without reading the whole file into memory,
+		see from_indented_lines().
+
+		Args:
+			path (str): The path of the file.
+			root (Optional[str]): The label of the root node, the name of the file by default.
+			indent (Optional[str]): The indentation of one level; by default the leading whitespace of the first
+				indented line.
+			encoding (str): The encoding of the text.
+			skip_empty_lines (bool): If True, empty lines do not become nodes.
+
+		Returns:
+			BasicGraph: The created graph.
+		"""
+		if root is None:
+			root = os.path.basename(path)
+		with open_text_file(path=path, encoding=encoding) as file:
+			return cls.from_indented_lines(
+				lines=(line.rstrip('\r\n') for line in file), root=root, indent=indent,
+				skip_empty_lines=skip_empty_lines
+			)
+
+	# bulk loading
+	@property
+	def is_bulk_loading(self) -> bool:
+		"""Checks if the graph is inside a bulk_load() block."""
+		return self._bulk_load_depth > 0
 
-		for index, level, content, parent_index in lines:
-			graph.add_node(name=str(index), label=f'line {index}')
+	@contextmanager
+	def bulk_load(self, pause_garbage_collection: bool = False):
+		"""
+		Context manager for adding many nodes and edges.
+		Inside the block, duplicate warnings are collected, and the root, leaf and loop indices are not updated.
+		Edge consistency is not checked per connect() call either.
+		On exit, the indices are updated for the nodes whose edges changed and the edges of those nodes are validated,
+		so that many small blocks cost no more than one large one; validation is skipped if the block raised.
+		Collected warnings are then issued as a single warning. Blocks can be nested.
 
-			if parent_index is not None:
-				graph.connect(start=str(parent_index), end=str(index))
+		Args:
+			pause_garbage_collection (bool): Whether to turn off the cyclic garbage collector of the whole process
+				inside the outermost block, see paused_garbage_collection; only for blocks that do nothing but load.
+
+		Example:
+			with graph.bulk_load():
+				graph.add_nodes_from(names)
+				graph.connect_many(pairs)
+		"""
+		self._bulk_load_depth += 1
+		completed = False
+		try:
+			if self._bulk_load_depth == 1 and pause_garbage_collection:
+				with paused_garbage_collection():
+					yield self
 			else:
-				graph.connect(start='root', end=str(index))
+				yield self
+			completed = True
+		finally:
+			self._bulk_load_depth -= 1
+			if self._bulk_load_depth == 0:
+				changed_nodes = self._bulk_changed_nodes
+				self._bulk_changed_nodes = {}
+				if changed_nodes:
+					self._update_node_indices(nodes=changed_nodes.values())
+				# validation would hide the exception that is propagating
+				if completed:
+					self._validate_edges(nodes=changed_nodes.values())
+				deferred_warnings = self._deferred_warnings
+				self._deferred_warnings = []
+				if len(deferred_warnings) == 1:
+					warnings.warn(deferred_warnings[0])
+				elif len(deferred_warnings) > 1:
+					warnings.warn(f'{deferred_warnings[0]} ({len(deferred_warnings) - 1} more warnings during bulk load)')
+
+	def _warn(self, message: str):
+		"""Issues a warning or collects it until the end of the bulk load."""
+		if self._bulk_load_depth > 0:
+			self._deferred_warnings.append(message)
+		else:
+			warnings.warn(message)
 
-		return graph
+	def _validate_edges(self, nodes: Optional[Iterable[Node]] = None):
+		"""
+		Checks that every edge is in the dictionaries of both of its nodes.
+
+		Args:
+			nodes (Optional[Iterable[Node]]): Only the edges of these nodes are checked; every edge if None.
+
+		Raises:
+			ValueError: If an edge is only known to one of its nodes.
+		"""
+		if nodes is None:
+			edges = self._edges_dict.values()
+		else:
+			nodes_dict = self._nodes_dict
+			edges = (
+				edge for node in nodes if nodes_dict.get(node.id) is node
+				for edges_dict in (node._outward_edges_dict, node._inward_edges_dict) for edge in edges_dict.values()
+			)
+		for edge in edges:
+			edge_id = edge.id
+			if edge_id not in edge._start._outward_edges_dict:
+				raise ValueError(f'This is very weird! Edge {edge_id} is not in the outward edges of its start node!')
+			if edge_id not in edge._end._inward_edges_dict:
+				raise ValueError(f'This is very weird! Edge {edge_id} is not in the inward edges of its end node!')
 
 	# nodes
 	def __contains__(self, item: Union[str, Node]) -> bool:
@@ -265,7 +757,7 @@ class BasicGraph:
 		Adds a node to the graph.
 
 		Args:
-			name (str): The name of the new node.
+			name (Union[str, int]): The name of the new node.
 			label (Optional[str]): A label for the node.
 			value (Optional[object]): The value of the node.
 			style (Optional[NodeStyle]): The style of the node.
@@ -275,12 +767,12 @@ class BasicGraph:
 		Returns:
 			Node: The created node.
 		"""
-		if isinstance(name, str):
+		if isinstance(name, (str, int)):
 			if name in self.nodes_dict:
 				if if_node_exists == 'ignore':
 					pass
 				elif if_node_exists == 'warn':
-					warnings.warn(f'Warning! A node with name "{name}" already exists in graph!')
+					self._warn(f'Warning! A node with name "{name}" already exists in graph!')
 				else:
 					raise KeyError(f'duplicate node id:"{name}"!')
 
@@ -316,10 +808,36 @@ class BasicGraph:
 					else:
 						raise ValueError(f'node with id "{node.id}" is already in a graph!')
 				self.nodes_dict[node.id] = node
+				self._node_edges_changed(node=node)
 				return node
 		else:
 			raise TypeError(f'node of type {type(node)} is not supported!')
 
+	def add_nodes_from(self, names: Iterable, if_node_exists: str = 'warn') -> List[Node]:
+		"""
+		Adds many nodes in one bulk load.
+
+		Args:
+			names (Iterable): Node names or (name, dict of add_node arguments) tuples.
+			if_node_exists (str): What to do if a node with that name exists. One of 'warn', 'error', 'ignore'.
+
+		Returns:
+			List[Node]: The created or existing nodes, in the same order.
+		"""
+		nodes_dict = self._nodes_dict
+		result = []
+		with self.bulk_load():
+			for name in names:
+				if isinstance(name, tuple):
+					name, node_dict = name
+					node_dict = {'if_node_exists': if_node_exists, **node_dict}
+					result.append(self.add_node(name=name, **node_dict))
+				elif if_node_exists == 'ignore' and name in nodes_dict:
+					result.append(nodes_dict[name])
+				else:
+					result.append(self.add_node(name=name, if_node_exists=if_node_exists))
+		return result
+
 	def remove_node(self, node: Union[str, Node]):
 		"""
 		Removes a node from the graph.
@@ -331,30 +849,31 @@ class BasicGraph:
 		node.remove_edges()
 		node._graph = None
 		del self.nodes_dict[node.id]
+		self._structure_version += 1
+		self._strongly_connected_components = None
+		self._absolute_root_names.pop(node.id, None)
+		self._leaf_names.pop(node.id, None)
 
 	# edges
 	@property
-	def edges_dict(self) -> Dict[Tuple[str, str], Edge]:
+	def edges_dict(self) -> Mapping[Tuple[str, str], Edge]:
 		"""Gets the dictionary of edges in the graph.
+		This is a read-only view of the graph's own index of edges, it is kept up to date as edges are created and
+		removed, so edges are disconnected while iterating over a list, e.g. list(graph.edges_dict.values()).
 
 		Returns:
-			Dict[Tuple[str, str], Edge]: The edges in the graph.
+			Mapping[Tuple[str, str], Edge]: The edges in the graph.
 		"""
-		return {edge.id: edge for node in self.nodes for edge in node.outward_edges}
+		return MappingProxyType(self._edges_dict)
 
 	@property
 	def edges(self) -> List[Edge]:
 		"""Gets the list of edges in the graph.
 
 		Returns:
-			List[Edge]: The edges in the graph.
+			List[Edge]: The edges in the graph, in the order they were created.
 		"""
-		result = []
-		for node in self.nodes:
-			for edge in node.edges:
-				if edge not in result:
-					result.append(edge)
-		return result
+		return list(self._edges_dict.values())
 
 	def get_outward_edges(self, node: Union[str, Node]) -> List[Edge]:
 		"""
@@ -432,27 +951,31 @@ class BasicGraph:
 
 	@property
 	def absolute_roots(self) -> List[Node]:
-		"""Gets the absolute root nodes of the graph.
+		"""Gets the absolute root nodes of the graph, i.e. the nodes without parents.
 
 		Returns:
-			List[Node]: The absolute root nodes.
+			List[Node]: The absolute root nodes, in the order they became roots.
 		"""
-		return [node for node in self.nodes if not node.has_parents()]
+		return [self._nodes_dict[name] for name in self._absolute_root_names]
 
 	@property
 	def roots(self) -> List[Node]:
 		"""Gets the root nodes of the graph.
+		A root is the first node of a strongly connected component that no other component has an edge into,
+		so every node is either a root or a descendant of one.
 
 		Returns:
 			List[Node]: The root nodes.
 		"""
-		possible_roots = self.nodes.copy()
-		for node in self.nodes:
-			if node in possible_roots:
-				for descendant in self.get_descendants(node=node, distance=False):
-					if descendant in possible_roots:
-						possible_roots.remove(descendant)
-		return possible_roots
+		components = self.strongly_connected_components
+		source_component_indices = set()
+		roots = []
+		for name, node in self._nodes_dict.items():
+			component_index = components.get_component_index(name)
+			if component_index not in source_component_indices and components.is_source(component_index):
+				source_component_indices.add(component_index)
+				roots.append(node)
+		return roots
 
 	def get_children(self, node: Union[str, Node]) -> List[Node]:
 		"""
@@ -492,41 +1015,22 @@ class BasicGraph:
 
 	@property
 	def leaves(self) -> List[Node]:
-		"""Gets the leaf nodes of the graph.
+		"""Gets the leaf nodes of the graph, i.e. the nodes without children.
 
 		Returns:
-			List[Node]: The leaf nodes.
+			List[Node]: The leaf nodes, in the order they became leaves.
 		"""
-		return [node for node in self.nodes if not node.has_children()]
+		return [self._nodes_dict[name] for name in self._leaf_names]
 
-	def _get_ancestors(self, node, nodes_travelled=None):
-		"""
-		:type node: Node or str
-		:type nodes_travelled: list[Node] or None
-		:rtype: list[Node]
-		"""
-		node = self.get_node(node)
-		nodes_travelled = nodes_travelled or []
-		nodes_travelled.append(node)
-		parents = self.get_parents(node=node)
-		if len(parents) == 0:
-			return [], {}
-		else:
-			ancestors = []
-			ancestors_dict = {1: []}
-			for parent in parents:
-				if parent not in ancestors:
-					ancestors.append(parent)
-					ancestors_dict[1].append(parent)
-
-				if parent not in nodes_travelled:
-					parent_ancestors, parent_ancestors_dict = self._get_ancestors(node=parent, nodes_travelled=nodes_travelled)
-					for ancestor in parent_ancestors:
-						if ancestor not in ancestors:
-							ancestors.append(ancestor)
-							for distance in parent_ancestors_dict.keys():
-								ancestors_dict[distance+1] = parent_ancestors_dict[distance]
-			return ancestors, ancestors_dict
+	@staticmethod
+	def _iterate_parents(node: Node):
+		"""Iterates over the parents of a node without copying its edges."""
+		return (edge._start for edge in node._inward_edges_dict.values())
+
+	@staticmethod
+	def _iterate_children(node: Node):
+		"""Iterates over the children of a node without copying its edges."""
+		return (edge._end for edge in node._outward_edges_dict.values())
 
 	def get_ancestors(self, node, distance=True):
 		"""
@@ -534,57 +1038,33 @@ class BasicGraph:
 		:param bool distance: if True, ancestors and their respective distance to the node will be returned as dict
 		:rtype: dict[int,list[Node]] or list[Node]
 		"""
-		ancestors, ancestors_dict = self._get_ancestors(node=node, nodes_travelled=None)
-		if distance:
-			return ancestors_dict
-		else:
-			return ancestors
+		node = self.get_node(node)
+		return get_relatives(start=node, get_neighbours=self._iterate_parents, distance=distance, include_start=True)
 
 	def is_node_in_loop(self, node):
-		node = self.get_node(node)
-		return node in self.get_ancestors(node=node, distance=False)
+		"""
+		:type node: Node or str
+		:rtype: bool
+		"""
+		return self.strongly_connected_components.is_in_loop(self.get_node_name(node))
 
 	def are_nodes_in_same_loop(self, node1, node2):
-		node1 = self.get_node(node1)
-		node2 = self.get_node(node2)
-		node1_is_ancestor_to_node2 = node1 in self.get_ancestors(node=node2, distance=False)
-		node2_is_ancestor_to_node1 = node2 in self.get_ancestors(node=node1, distance=False)
-		return node1_is_ancestor_to_node2 and node2_is_ancestor_to_node1
-
-	@property
-	def loop_nodes(self):
 		"""
-		:rtype: list[Node]
+		:type node1: Node or str
+		:type node2: Node or str
+		:rtype: bool
 		"""
-		return [node for node in self.nodes if node.is_in_loop()]
+		return self.strongly_connected_components.are_in_same_loop(
+			self.get_node_name(node1), self.get_node_name(node2)
+		)
 
-	def _get_descendants(self, node, nodes_travelled=None):
+	@property
+	def loop_nodes(self):
 		"""
-		:type node: Node or str
-		:type nodes_travelled: list[Node] or None
 		:rtype: list[Node]
 		"""
-		node = self.get_node(node)
-		nodes_travelled = nodes_travelled or []
-		nodes_travelled.append(node)
-		children = self.get_children(node=node)
-		if len(children) == 0:
-			return [], {}
-		else:
-			descendants = []
-			descendants_dict = {1: []}
-			for child in children:
-				if child not in nodes_travelled:
-					if child not in descendants:
-						descendants.append(child)
-						descendants_dict[1].append(child)
-					child_descendants, child_descendants_dict = self._get_descendants(node=child, nodes_travelled=nodes_travelled)
-					for descendant in child_descendants:
-						if descendant not in descendants:
-							descendants.append(descendant)
-							for distance in child_descendants_dict.keys():
-								descendants_dict[distance+1] = child_descendants_dict[distance]
-			return descendants, descendants_dict
+		components = self.strongly_connected_components
+		return [node for name, node in self._nodes_dict.items() if components.is_in_loop(name)]
 
 	def get_descendants(self, node, distance=True):
 		"""
@@ -592,11 +1072,16 @@ class BasicGraph:
 		:param bool distance: if True, descendants and their respective distance to the node will be returned as dict
 		:rtype: dict[int,list[Node]] or list[Node]
 		"""
-		descendants, descendants_dict = self._get_descendants(node=node, nodes_travelled=None)
-		if distance:
-			return descendants_dict
-		else:
-			return descendants
+		node = self.get_node(node)
+		return get_relatives(start=node, get_neighbours=self._iterate_children, distance=distance)
+
+	def num_descendants(self, node):
+		"""
+		:type node: Node or str
+		:rtype: int
+		"""
+		node = self.get_node(node)
+		return sum(1 for _ in traverse_depth_first(start=node, get_neighbours=self._iterate_children))
 
 	def get_siblings(self, node):
 		"""
@@ -654,17 +1139,81 @@ class BasicGraph:
 		"""
 		return self.num_spouses(node=node) > 0
 
-	def get_tree_str(self):
+	def iter_tree_lines(self, max_depth: Optional[int] = None, max_children: Optional[int] = None) -> Iterator[str]:
+		"""
+		Generates the lines of the tree representation of the graph lazily, without line breaks.
+		There is one tree per root with an empty line between trees. A node with children that is reached again is
+		followed by '*' and not expanded.
+
+		Args:
+			max_depth (Optional[int]): Nodes at this depth are not expanded, the roots are at depth 0.
+			max_children (Optional[int]): The maximum number of children shown per node, the rest are counted.
+
+		Yields:
+			str: The lines of the trees.
+		"""
+		def get_children(node):
+			return self.get_children(node=node)
+
+		return iter_tree_lines(
+			roots=self.roots, get_children=get_children, get_label=Node.label.fget, max_depth=max_depth,
+			max_children=max_children
+		)
+
+	def get_tree_str(self, max_depth: Optional[int] = None, max_children: Optional[int] = None) -> str:
 		"""
-		returns a tree representation of the graph as a string
+		returns a tree representation of the graph as a string, see iter_tree_lines()
  		:rtype: str
 		"""
-		already_added = []
-		tree_strings = []
-		for root in self.roots:
-			tree_string = root.get_tree_str(already_added=already_added)
-			tree_strings.append(tree_string)
-		return '\n'.join(tree_strings)
+		lines = list(self.iter_tree_lines(max_depth=max_depth, max_children=max_children))
+		if len(lines) == 0:
+			return ''
+		return '\n'.join(lines) + '\n'
+
+	def write_indented(
+			self, file: Union[str, TextIO], indent: str = '\t', root: Optional[Union[str, Node]] = None
+	) -> int:
+		"""
+		Writes the graph as an indented outline that from_indented_text() and from_indented_file() can read back,
+		one line per node with its label, walking the graph iteratively from its roots.
+		A node with children that is reached again, e.g. through a loop, is written again but not expanded.
+
+		Args:
+			file (Union[str, TextIO]): A path (compressed if it ends in .gz) or a text file object.
+			indent (str): The indentation of one level.
+			root (Optional[Union[str, Node]]): If given, only the descendants of this node are written, with its
+				children at the top level, e.g. the 'root' node of a graph made by from_indented_text().
+
+		Returns:
+			int: The number of lines written.
+		"""
+		if root is None:
+			roots = self.roots
+			top_depth = 0
+		else:
+			roots = [self.get_node(node=root)]
+			top_depth = 1
+
+		def get_children(node):
+			return self.get_children(node=node)
+
+		visited = set()
+		num_lines = 0
+		with open_text(file, 'w') as f:
+			for root_node in roots:
+				lines = []
+				for node, depth, _, _ in walk_tree(root=root_node, get_children=get_children, visited=visited):
+					if depth < top_depth:
+						continue
+					label = node._label if node._label else node.id
+					lines.append(f'{indent * (depth - top_depth)}{label}\n')
+					if len(lines) == 10000:
+						f.writelines(lines)
+						num_lines += len(lines)
+						lines = []
+				f.writelines(lines)
+				num_lines += len(lines)
+		return num_lines
 
 	def connect(self, start: Union[str, Node], end: Union[str, Node], id: Optional[str] = None, label: Optional[str] = None, value: Optional[object] = None, style: Optional[EdgeStyle] = None, if_edge_exists: str = 'warn', **kwargs) -> Edge:
 		"""
@@ -686,15 +1235,29 @@ class BasicGraph:
 		start = self.get_node(node=start)
 		end = self.get_node(node=end)
 		edge_id = (start.id, end.id, id)
+		edge_exists = edge_id in start._outward_edges_dict
+
+		# during a bulk load the edges are validated once at the end
+		if not self.is_bulk_loading and edge_exists != (edge_id in end._inward_edges_dict):
+			if edge_exists:
+				raise ValueError(
+					f'This is very weird! Edge {edge_id} already in the outward edges of start node '
+					f'but not the inward edges of the end node!'
+				)
+			else:
+				raise ValueError(
+					f'This is very weird! Edge {edge_id} already in the inward edges of end node '
+					f'but not the outward edges of the start node!'
+				)
 
-		if edge_id not in start.outward_edge_ids and edge_id not in end.inward_edge_ids:
+		if not edge_exists:
 			edge = Edge(graph=self, start=start, end=end, id=id, value=value, label=label, style=style, **kwargs)
 
-		elif edge_id in start.outward_edge_ids and edge_id in end.inward_edge_ids:
+		else:
 			if if_edge_exists == 'ignore':
 				pass
 			elif if_edge_exists == 'warn':
-				warnings.warn(f'Warning! Edge: {edge_id} already exists!')
+				self._warn(f'Warning! Edge: {edge_id} already exists!')
 			else:
 				raise ValueError(f'Error! Edge {edge_id} already exists!')
 
@@ -706,19 +1269,34 @@ class BasicGraph:
 			if value is not None:
 				edge.value = value
 
-		elif edge_id in start.outward_edges and edge_id not in end.inward_edges:
-			raise ValueError(
-				f'This is very weird! Edge {edge_id} already in the outward edges of start node '
-				f'but not the inward edges of the end node!'
-			)
+		return edge
 
-		else:
-			raise ValueError(
-				f'This is very weird! Edge {edge_id} already in the inward edges of end node '
-				f'but not the outward edges of the start node!'
-			)
+	def connect_many(self, edges: Iterable[tuple], if_edge_exists: str = 'warn') -> List[Edge]:
+		"""
+		Connects many pairs of nodes in one bulk load.
 
-		return edge
+		Args:
+			edges (Iterable[tuple]): (start, end) or (start, end, dict of connect arguments) tuples.
+			if_edge_exists (str): What to do if an edge with that ID exists. One of 'warn', 'error', 'ignore'.
+
+		Returns:
+			List[Edge]: The created or existing edges, in the same order.
+		"""
+		result = []
+		with self.bulk_load():
+			for edge in edges:
+				if len(edge) == 2:
+					start, end = edge
+					result.append(self.connect(start=start, end=end, if_edge_exists=if_edge_exists))
+				elif len(edge) == 3:
+					start, end, edge_dict = edge
+					edge_dict = {'if_edge_exists': if_edge_exists, **edge_dict}
+					result.append(self.connect(start=start, end=end, **edge_dict))
+				elif len(edge) < 2:
+					raise ValueError('Too few objects in an edge definition!')
+				else:
+					raise ValueError('Too many objects in an edge definition!')
+		return result
 
 	@staticmethod
 	def disconnect(edge: Edge):
@@ -728,9 +1306,12 @@ class BasicGraph:
 		Args:
 			edge (Edge): The edge to disconnect.
 		"""
-		edge.start.remove_outward_edge(edge_id=edge.id)
-		edge.end.remove_inward_edge(edge_id=edge.id)
-		edge._raw_id = (None, None, None)
+		edge_id = edge.id
+		edge.start.remove_outward_edge(edge_id=edge_id)
+		edge.end.remove_inward_edge(edge_id=edge_id)
+		if edge._graph is not None:
+			edge._graph._edges_dict.pop(edge_id, None)
+		edge.raw_id = (None, None, None)
 		edge._graph = None
 
 	# similarity
@@ -8,7 +8,34 @@ def make_hash_sha256(obj):
 	return base32hex.b32encode(hasher.digest()).replace('=', '-')
 
 
+def is_same_key(key, other_key) -> bool:
+	"""
+	Checks if two cache keys hold the same objects; identity is used because values do not always compare cheaply.
+	:type key: tuple
+	:type other_key: tuple
+	:rtype: bool
+	"""
+	if other_key is None or len(key) != len(other_key):
+		return False
+	for item, other_item in zip(key, other_key):
+		if item is not other_item:
+			return False
+	return True
+
+
+def is_immutable(obj) -> bool:
+	"""
+	Checks if an object cannot change in place, so that a string made from it can be cached against its identity;
+	lists, dicts and other objects, e.g. a value that is appended to, are not cached.
+	:rtype: bool
+	"""
+	return obj is None or type(obj) in (str, int, float, bool, complex, bytes)
+
+
 class GraphObj:
+	# (key, Graphviz string) where the key holds everything the string is made of, see get_graphviz_str()
+	_graphviz_cache = None
+
 	def __init__(self, graph, id, value=None, label=None, tooltip=None, style=None, **kwargs):
 		self._graph = graph
 		self._raw_id = id
@@ -62,7 +89,7 @@ class GraphObj:
 
 	@property
 	def id(self):
-		return self.raw_id
+		return self._raw_id
 
 	@property
 	def raw_id(self):
@@ -73,7 +100,16 @@ class GraphObj:
 		self._raw_id = raw_id
 
 	def __hash__(self):
-		return make_hash_sha256((self._graph.__hash__(), self.id)).__hash__()
+		return hash(self.id)
+
+	def fingerprint(self):
+		"""
+		returns a SHA-256 based hash of the content of the object, it is stable across processes
+		:rtype: str
+		"""
+		return make_hash_sha256((
+			self.__class__.__name__, self.id, self._label, self._value, self._tooltip, self._parameters
+		))
 
 	@property
 	def is_frozen(self):
@@ -123,9 +159,11 @@ class GraphObj:
 		:type other: GraphObj
 		:rtype: bool
 		"""
+		if self is other:
+			return True
 		if not isinstance(other, self.__class__):
 			raise TypeError(f'"{other}" is of type: {type(other)}')
-		if self.graph != other.graph:
+		if self._graph is not other._graph:
 			raise ValueError('two GraphObj from different graphs cannot be compared')
 		return self.id == other.id
 
@@ -134,11 +172,7 @@ class GraphObj:
 		:type other: GraphObj
 		:rtype: bool
 		"""
-		if not isinstance(other, self.__class__):
-			raise TypeError(f'"{other}" is of type: {type(other)}')
-		if self.graph != other.graph:
-			raise ValueError('two GraphObj from different graphs cannot be compared')
-		return self.raw_id != other.raw_id
+		return not self.__eq__(other)
 
 	def is_similar_to(self, other):
 		"""
@@ -1,21 +1,53 @@
 from ._BasicGraph import BasicGraph
 from .styling.NodeStyle import NodeStyle
 from .styling.EdgeStyle import EdgeStyle
+import asyncio
+import graphviz
 from graphviz import Source
+import io
 import os
+import subprocess
+import warnings
 from functools import wraps
 import random
 from colouration import Colour
 from .styling import stylize_with_pensieve, stylize_randomly
-from typing import Optional, Union, Dict, Callable
+from .ndjson import write_ndjson, read_ndjson, open_text
+from .read_dot import iter_dot_events, split_attributes, to_number, NODE_STYLE_ATTRIBUTES, EDGE_STYLE_ATTRIBUTES
+from .read_edge_file import open_text_file
+from .run_graphviz import (
+	get_layout_engines, get_deadline, get_remaining_time, run_graphviz_with_fallback, arun_graphviz_with_fallback
+)
+from .summarize_graph import summarize_graph
+from typing import Optional, Union, Dict, Callable, Iterable, Iterator, TextIO
 from .Node import Node
 from .Edge import Edge
 
 DEFAULT_BACKGROUND_COLOUR_NAME = '#FAFAFA'
 DEFAULT_PAD = 0.1
+# the number of Graphviz parts joined between returns to the event loop by the async methods
+_PARTS_PER_AWAIT = 1000
+# the size of the summary rendered when every layout engine times out on a larger graph
+SUMMARY_MAX_NODES = 100
+
+
+def _get_layout_timeout(timeout: Optional[float], num_engines: int, num_nodes: int) -> Optional[float]:
+	# a graph that can fall back to a summary keeps an equal share of the timeout for the layout of the summary
+	if timeout is None or num_nodes <= SUMMARY_MAX_NODES:
+		return timeout
+	return timeout * num_engines / (num_engines + 1)
+
+
+def _warn_summary_fallback(timeout: float):
+	warnings.warn(
+		f'no layout engine laid out the graph in {timeout} seconds, falling back to a summary of {SUMMARY_MAX_NODES} nodes'
+	)
 
 
 class GraphWithoutDisplay(BasicGraph):
+	# a graph has every node and edge its style overwrites name, so stylize() raises KeyError for missing ones
+	_skips_missing_overwrites = False
+
 	def __init__(
 			self, obj=None, strict=False, ordering=True, node_style=None, edge_style=None,
 			node_label_converter=None, edge_label_converter=None,
@@ -139,6 +171,26 @@ class GraphWithoutDisplay(BasicGraph):
 		self._nodes_have_graph = False
 		self.update_nodes()
 
+	@wraps(BasicGraph._build_copy)
+	def _build_copy(self, nodes, edges, values: str = 'share', styles: str = 'copy') -> 'GraphWithoutDisplay':
+		graph = super()._build_copy(nodes=nodes, edges=edges, values=values, styles=styles)
+		# a copy of some of the nodes keeps only their overwrites, stylize() raises KeyError for the others
+		nodes_dict = graph._nodes_dict
+		edges_dict = graph._edges_dict
+		graph._node_style_overwrites = {
+			name: style for name, style in graph._node_style_overwrites.items() if name in nodes_dict
+		}
+		graph._node_colour_overwrites = {
+			name: colour for name, colour in graph._node_colour_overwrites.items() if name in nodes_dict
+		}
+		graph._edge_style_overwrites = {
+			edge_id: style for edge_id, style in graph._edge_style_overwrites.items() if edge_id in edges_dict
+		}
+		graph._edge_colour_overwrites = {
+			edge_id: colour for edge_id, colour in graph._edge_colour_overwrites.items() if edge_id in edges_dict
+		}
+		return graph
+
 	@wraps(BasicGraph.connect)
 	def connect(self, start: Union[str, Node], end: Union[str, Node], style: Optional[EdgeStyle] = None, **kwargs) -> Edge:
 		"""
@@ -221,7 +273,7 @@ class GraphWithoutDisplay(BasicGraph):
 		Returns:
 			Dict[str, EdgeStyle]: The styles of the edges in the graph.
 		"""
-		return {edge.id: edge.style for node in self.nodes for edge in node.outward_edges if edge.has_style()}
+		return {edge_id: edge.style for edge_id, edge in self.edges_dict.items() if edge.has_style()}
 
 	def stylize(self):
 		"""Applies styles to the nodes and edges in the graph."""
@@ -239,7 +291,7 @@ class GraphWithoutDisplay(BasicGraph):
 				node.style = smart_global_node_style_overwrite
 
 		if self._global_edge_style_overwrite is not None:
-			for edge in self.edges:
+			for edge in self.edges_dict.values():
 				edge.style = self._global_edge_style_overwrite
 
 		if self._stylist == 'pensieve':
@@ -247,21 +299,54 @@ class GraphWithoutDisplay(BasicGraph):
 		elif self._stylist == 'random':
 			stylize_randomly(graph=self)
 
+		# a subgraph view skips the overwrites of nodes and edges outside it, a graph raises KeyError for them
+		nodes_dict = self.nodes_dict
+		edges_dict = self.edges_dict
+		skip_missing = self._skips_missing_overwrites
 		for name, style in self._node_style_overwrites.items():
-			self.nodes_dict[name].style.complement(style)
+			if skip_missing and name not in nodes_dict:
+				continue
+			# styles can be shared between copies of a graph, so they are not changed in place
+			node = nodes_dict[name]
+			if getattr(node.style, '_applied_overwrite', None) == style:
+				# applied by an earlier call, keeping the style keeps the cached Graphviz string of the node
+				continue
+			new_style = node.style.copy()
+			new_style.complement(style)
+			# a copy, so that changing the overwrite in place applies it again
+			new_style._applied_overwrite = style.copy()
+			node._style = new_style
 
 		for edge_id, style in self._edge_style_overwrites.items():
-			self.edges_dict[edge_id].style = style
+			if skip_missing and edge_id not in edges_dict:
+				continue
+			edge = edges_dict[edge_id]
+			if isinstance(style, dict) and getattr(edge.style, '_applied_overwrite', None) == style:
+				continue
+			if isinstance(style, dict) and edge.style is not None:
+				# like node style overwrites, dictionaries complement a copy of the style from the stylist
+				new_style = edge.style.copy()
+				new_style.complement(style)
+				new_style._applied_overwrite = style.copy()
+				edge._style = new_style
+			elif isinstance(style, dict):
+				edge._style = EdgeStyle(**style)
+			else:
+				edge._style = style
 
 		for name, colour in self._node_colour_overwrites.items():
-			node = self.nodes_dict[name]
+			if skip_missing and name not in nodes_dict:
+				continue
+			node = nodes_dict[name]
 			style = node.style.copy()
 			style.reset_colours()
 			style.colour = colour
 			node.style = style
 
 		for edge_id, colour in self._edge_colour_overwrites.items():
-			edge = self.edges_dict[edge_id]
+			if skip_missing and edge_id not in edges_dict:
+				continue
+			edge = edges_dict[edge_id]
 			_ = edge.style.colour
 			style = edge.style.copy()
 			style.reset_colours()
@@ -283,7 +368,7 @@ class GraphWithoutDisplay(BasicGraph):
 				node.style.complement(smart_global_node_style_overwrite)
 
 		if self._global_edge_style_overwrite is not None:
-			for edge in self.edges:
+			for edge in self.edges_dict.values():
 				edge.style.complement(self._global_edge_style_overwrite)
 
 	def get_graphviz_header(
@@ -379,6 +464,63 @@ class GraphWithoutDisplay(BasicGraph):
 
 		return first_part + second_part + third_part
 
+	def iter_graphviz_parts(
+			self, direction: Optional[str] = None,
+			dpi: Optional[int] = 300, height: Optional[Union[int, float]] = None, width: Optional[Union[int, float]] = None,
+			pad: Union[int, float] = DEFAULT_PAD
+	) -> Iterator[str]:
+		"""
+		Lazily generates the Graphviz representation of the graph: the header, then one part per node and per edge.
+		Joined, the parts are get_graphviz_str().
+
+		Args:
+			direction (Optional[str]): The direction of the graph.
+			dpi (Optional[int]): The DPI of the graph.
+			height (Optional[Union[int, float]]): The height of the graph.
+			width (Optional[Union[int, float]]): The width of the graph.
+			pad (Union[int, float]): The padding of the graph.
+
+		Yields:
+			str: The parts of the Graphviz representation.
+		"""
+		direction = direction or self._direction
+
+		yield self.get_graphviz_header(direction=direction, dpi=dpi, height=height, width=width, pad=pad)
+		yield '\t{\n'
+		is_empty = True
+		for node in self.nodes_dict.values():
+			yield '\t\t' + node.get_graphviz_str() + '\n'
+			is_empty = False
+		if is_empty:
+			yield '\t\t\n'
+		yield '\t}\n'
+		is_empty = True
+		for edge in self.edges_dict.values():
+			yield '\t' + edge.get_graphviz_str() + '\n'
+			is_empty = False
+		if is_empty:
+			yield '\t\n'
+		yield '}'
+
+	def write_graphviz(
+			self, file: Union[str, TextIO], direction: Optional[str] = None,
+			dpi: Optional[int] = 300, height: Optional[Union[int, float]] = None, width: Optional[Union[int, float]] = None,
+			pad: Union[int, float] = DEFAULT_PAD
+	):
+		"""
+		Writes the Graphviz representation of the graph part by part, without building it as one string.
+
+		Args:
+			file (Union[str, TextIO]): A path (compressed if it ends in .gz) or a text file object.
+			direction (Optional[str]): The direction of the graph.
+			dpi (Optional[int]): The DPI of the graph.
+			height (Optional[Union[int, float]]): The height of the graph.
+			width (Optional[Union[int, float]]): The width of the graph.
+			pad (Union[int, float]): The padding of the graph.
+		"""
+		with open_text(file, 'w') as f:
+			f.writelines(self.iter_graphviz_parts(direction=direction, dpi=dpi, height=height, width=width, pad=pad))
+
 	def get_graphviz_str(
 			self, direction: Optional[str] = None, 
 			dpi: Optional[int] = 300, height: Optional[Union[int, float]] = None, width: Optional[Union[int, float]] = None, 
@@ -397,12 +539,7 @@ class GraphWithoutDisplay(BasicGraph):
 		Returns:
 			str: The Graphviz representation.
 		"""
-		direction = direction or self._direction
-
-		nodes_str = '\t{\n\t\t' + '\n\t\t'.join([node.get_graphviz_str() for node in self.nodes_dict.values()]) + '\n\t}\n'
-		edges_str = '\t' + '\n\t'.join([edge.get_graphviz_str() for edge in self.edges]) + '\n'
-		header = self.get_graphviz_header(direction=direction, dpi=dpi, height=height, width=width, pad=pad)
-		return header + nodes_str + edges_str + '}'
+		return ''.join(self.iter_graphviz_parts(direction=direction, dpi=dpi, height=height, width=width, pad=pad))
 
 	def append(self, obj):
 		"""
@@ -428,67 +565,30 @@ class GraphWithoutDisplay(BasicGraph):
 			if not isinstance(dictionary, dict):
 				raise TypeError(f'{type(obj)} cannot be converted to a Graph. It needs to have a __graph__() method.')  # ToDo cite proper link for explanation
 
-			if 'strict' in dictionary:
-				self._is_strict = dictionary['strict']
-
-			if 'ordering' in dictionary:
-				self._ordering = dictionary['ordering']
-
-			if 'label' in dictionary:
-				self._label = '\n' + dictionary['label']
-
-			if 'tooltip' in dictionary:
-				self._tooltip = dictionary['tooltip']
-
-			if 'label_url' in dictionary:
-				self._label_url = dictionary['label_url']
-
-			if 'global_node_style' in dictionary:
-				self._global_node_style_overwrite = dictionary['global_node_style']
-			elif 'graph_node_style' in dictionary:
-				self._global_node_style_overwrite = dictionary['graph_node_style']
-
-			if 'global_edge_style' in dictionary:
-				self._global_edge_style_overwrite = dictionary['global_edge_style']
-			elif 'graph_edge_style' in dictionary:
-				self._global_edge_style_overwrite = dictionary['graph_edge_style']
-
-			if 'direction' in dictionary:
-				self._direction = dictionary['direction']
-
-			if isinstance(dictionary['nodes'], dict):
-				for node_name, node_dict in dictionary['nodes'].items():
-					self.add_node(name=node_name, **node_dict)
-			else:
-				for node_name in dictionary['nodes']:
-					self.add_node(name=node_name)
+			self._apply_graph_settings(dictionary=dictionary)
 
-			edges_dict = {}
-			for parent_child_edge_dict in dictionary['edges']:
-
-				if len(parent_child_edge_dict) == 2:
-					parent, child = parent_child_edge_dict
-					edge = self.connect(start=parent, end=child)
-					edges_dict[(parent, child)] = edge.id
-
-				elif len(parent_child_edge_dict) == 3:
-					parent, child, edge_dict = parent_child_edge_dict
-					edge = self.connect(start=parent, end=child, **edge_dict)
-					edges_dict[(parent, child)] = edge.id
-
-				elif len(parent_child_edge_dict) < 2:
-					raise ValueError('Too few objects in an edge definition!')
+			edge_definitions = list(dictionary['edges'])
+			with self.bulk_load():
+				if isinstance(dictionary['nodes'], dict):
+					self.add_nodes_from(dictionary['nodes'].items())
 				else:
-					raise ValueError('Too many objects in an edge definition!')
+					self.add_nodes_from(dictionary['nodes'])
+				edges = self.connect_many(edge_definitions)
+
+			edges_dict = {
+				(edge_definition[0], edge_definition[1]): edge.id
+				for edge_definition, edge in zip(edge_definitions, edges)
+			}
 
 			if 'node_styles' in dictionary:
 				for name, node_style in dictionary['node_styles'].items():
 					self._node_style_overwrites[name] = node_style
 
+			# edge styles and colours are keyed by (parent, child) or by the full edge id
 			if 'edge_styles' in dictionary:
 				for parent_child_edge_id, edge_style in dictionary['edge_styles'].items():
-					edge_id = edges_dict[parent_child_edge_id]
-					self._edge_colour_overwrites[edge_id] = edge_style
+					edge_id = edges_dict.get(parent_child_edge_id, parent_child_edge_id)
+					self._edge_style_overwrites[edge_id] = edge_style
 
 			if 'node_colours' in dictionary:
 				for name, colour in dictionary['node_colours'].items():
@@ -496,11 +596,52 @@ class GraphWithoutDisplay(BasicGraph):
 
 			if 'edge_colours' in dictionary:
 				for parent_child_edge_id, colour in dictionary['edge_colours'].items():
-					edge_id = edges_dict[parent_child_edge_id]
+					edge_id = edges_dict.get(parent_child_edge_id, parent_child_edge_id)
 					self._edge_colour_overwrites[edge_id] = colour
 
 			return self
 
+	def _apply_graph_settings(self, dictionary: Dict):
+		"""
+		Applies the graph level entries of a __graph__() dictionary or of a graph record, entries that are None are
+		skipped.
+
+		Args:
+			dictionary (Dict): The dictionary or record.
+		"""
+		def get(key):
+			return dictionary.get(key)
+
+		if get('strict') is not None:
+			self._is_strict = dictionary['strict']
+
+		if get('ordering') is not None:
+			self._ordering = dictionary['ordering']
+
+		if get('label') is not None:
+			# the label is shown below the graph, on a line of its own
+			label = dictionary['label']
+			self._label = label if label.startswith('\n') else '\n' + label
+
+		if get('tooltip') is not None:
+			self._tooltip = dictionary['tooltip']
+
+		if get('label_url') is not None:
+			self._label_url = dictionary['label_url']
+
+		if get('global_node_style') is not None:
+			self._global_node_style_overwrite = dictionary['global_node_style']
+		elif get('graph_node_style') is not None:
+			self._global_node_style_overwrite = dictionary['graph_node_style']
+
+		if get('global_edge_style') is not None:
+			self._global_edge_style_overwrite = dictionary['global_edge_style']
+		elif get('graph_edge_style') is not None:
+			self._global_edge_style_overwrite = dictionary['graph_edge_style']
+
+		if get('direction') is not None:
+			self._direction = dictionary['direction']
+
 	@classmethod
 	def from_dict(cls, obj: Dict) -> 'GraphWithoutDisplay':
 		"""
@@ -516,48 +657,308 @@ class GraphWithoutDisplay(BasicGraph):
 		graph.append(obj=obj)
 		return graph
 
-	def __graph__(self) -> Dict:
-		"""
-		Returns the dictionary representation of the graph.
-
-		Returns:
-			Dict: The dictionary representation of the graph.
+	def iter_graph_records(self, styles: bool = True) -> Iterator[Dict]:
 		"""
-		nodes_dict = {}
-		edges_list = []
-		for node in self.nodes:
-			nodes_dict[node.id] = {
-				'label': node.display_label_or_value,
-				'value': node.value,
-				'style': node.style
-			}
+		Lazily generates the representation of the graph as flat records, each a dictionary with a 'type':
+		one 'graph' record with the settings, then a 'node' record per node and an 'edge' record per edge,
+		then the 'node_style', 'edge_style', 'node_colour' and 'edge_colour' overwrites.
+		append_stream() reads the same records.
 
-			for edge in node.outward_edges:
-				edges_list.append([
-					edge.start.id,
-					edge.end.id,
-					{
-						'id': edge.raw_id,
-						'label': edge.raw_label,
-						'value': edge.value,
-						'style': edge.style
-					}
-				])
+		Args:
+			styles (bool): If False, styles are left out, for example when writing JSON.
 
-		return {
+		Yields:
+			Dict: The records.
+		"""
+		graph_record = {
+			'type': 'graph',
 			'strict': self._is_strict,
 			'ordering': self._ordering,
 			'colour_scheme': self._colour_scheme,
+			'direction': self._direction,
 			'label': self._label,
 			'label_url': self._label_url,
-			'node_styles': self._node_style_overwrites,
-			'edge_styles': self._edge_style_overwrites,
-			'global_node_style': self._global_node_style_overwrite,
-			'global_edge_style': self._global_edge_style_overwrite,
-			'node_colours': self._node_colour_overwrites,
-			'nodes': nodes_dict,
-			'edges': edges_list
+			'tooltip': self._tooltip
 		}
+		if styles:
+			graph_record['global_node_style'] = self._global_node_style_overwrite
+			graph_record['global_edge_style'] = self._global_edge_style_overwrite
+		yield graph_record
+
+		for node in self.nodes_dict.values():
+			record = {'type': 'node', 'id': node.id, 'label': node._label, 'value': node.value}
+			if styles:
+				record['style'] = node.style
+			yield record
+
+		for edge in self.edges_dict.values():
+			record = {
+				'type': 'edge', 'start': edge.start.id, 'end': edge.end.id, 'id': edge.raw_id,
+				'label': edge._label, 'value': edge.value
+			}
+			if styles:
+				record['style'] = edge.style
+			yield record
+
+		if styles:
+			for name, style in self._node_style_overwrites.items():
+				yield {'type': 'node_style', 'id': name, 'style': style}
+			for (start, end, edge_id), style in self._edge_style_overwrites.items():
+				yield {'type': 'edge_style', 'start': start, 'end': end, 'id': edge_id, 'style': style}
+		for name, colour in self._node_colour_overwrites.items():
+			yield {'type': 'node_colour', 'id': name, 'colour': colour}
+		for (start, end, edge_id), colour in self._edge_colour_overwrites.items():
+			yield {'type': 'edge_colour', 'start': start, 'end': end, 'id': edge_id, 'colour': colour}
+
+	def append_stream(self, records: Iterable[Dict]) -> 'GraphWithoutDisplay':
+		"""
+		Adds the nodes, edges and settings of records such as those of iter_graph_records() one record at a time,
+		in a single bulk load. A node should come before the edges that use it.
+
+		Args:
+			records (Iterable[Dict]): The records, can be a generator.
+
+		Returns:
+			GraphWithoutDisplay: The updated graph.
+
+		Raises:
+			ValueError: If a record has an unknown type.
+		"""
+		with self.bulk_load():
+			for record in records:
+				record_type = record.get('type')
+				if record_type == 'node':
+					self.add_node(
+						name=record['id'], label=record.get('label'), value=record.get('value'), style=record.get('style')
+					)
+
+				elif record_type == 'edge':
+					self.connect(
+						start=record['start'], end=record['end'], id=record.get('id'), label=record.get('label'),
+						value=record.get('value'), style=record.get('style')
+					)
+
+				elif record_type == 'graph':
+					self._apply_graph_settings(dictionary=record)
+					if record.get('colour_scheme') is not None:
+						self._colour_scheme = record['colour_scheme']
+
+				elif record_type == 'node_style':
+					self._node_style_overwrites[record['id']] = record['style']
+
+				elif record_type == 'edge_style':
+					self._edge_style_overwrites[(record['start'], record['end'], record.get('id'))] = record['style']
+
+				elif record_type == 'node_colour':
+					self._node_colour_overwrites[record['id']] = record['colour']
+
+				elif record_type == 'edge_colour':
+					self._edge_colour_overwrites[(record['start'], record['end'], record.get('id'))] = record['colour']
+
+				else:
+					raise ValueError(f'unknown graph record type: {record_type}')
+		return self
+
+	def to_ndjson(self, path: Union[str, TextIO], default: Optional[Callable] = None) -> int:
+		"""
+		Writes the records of the graph, without styles, as newline delimited JSON.
+
+		Args:
+			path (Union[str, TextIO]): A path (compressed if it ends in .gz) or a text file object.
+			default (Optional[Callable]): Converts values that JSON does not support, as in json.dumps.
+
+		Returns:
+			int: The number of records written.
+		"""
+		return write_ndjson(records=self.iter_graph_records(styles=False), file=path, default=default)
+
+	def append_ndjson(self, path: Union[str, TextIO]) -> 'GraphWithoutDisplay':
+		"""Adds the records of a newline delimited JSON file, reading one line at a time."""
+		return self.append_stream(records=read_ndjson(file=path))
+
+	@classmethod
+	def from_ndjson(cls, path: Union[str, TextIO], **kwargs) -> 'GraphWithoutDisplay':
+		"""
+		Creates a graph from a newline delimited JSON file written by to_ndjson().
+
+		Args:
+			path (Union[str, TextIO]): A path (compressed if it ends in .gz) or a text file object.
+			**kwargs: Arguments for creating the empty graph.
+
+		Returns:
+			GraphWithoutDisplay: The new graph.
+		"""
+		return cls(**kwargs).append_ndjson(path=path)
+
+	def append_dot(self, source: Union[str, TextIO], encoding: str = 'utf-8') -> 'GraphWithoutDisplay':
+		"""
+		Adds the nodes, edges and attributes of the first graph of Graphviz DOT source, parsing it a chunk at a time
+		in a single bulk load.
+		Attributes that NodeStyle or EdgeStyle have, such as color or shape, become style overwrites, label and
+		tooltip become the label and tooltip of nodes and edges, and other attributes are kept as parameters,
+		e.g. node['width']. Graph attributes become the settings of the graph where it has one.
+		The direction is TB unless there is a rankdir attribute, as in Graphviz. Undirected edges are added from
+		left to right. In a graph that is not strict, repeated edges between two nodes get the IDs 1, 2, ... unless
+		they have a key attribute.
+
+		Args:
+			source (Union[str, TextIO]): DOT text (anything with a '{'), the path of a DOT file, gzipped or not, or
+				a text file object.
+			encoding (str): The encoding of the file.
+
+		Returns:
+			GraphWithoutDisplay: The updated graph.
+
+		Raises:
+			ValueError: If the source is not valid DOT.
+		"""
+		if not isinstance(source, str):
+			self._append_dot_events(events=iter_dot_events(file=source))
+		elif '{' in source:
+			self._append_dot_events(events=iter_dot_events(file=io.StringIO(source)))
+		else:
+			with open_text_file(path=source, encoding=encoding) as file:
+				self._append_dot_events(events=iter_dot_events(file=file))
+		return self
+
+	def _append_dot_events(self, events: Iterable[tuple]):
+		nodes_dict = self._nodes_dict
+		edges_dict = self._edges_dict
+		# the next id to try for an edge without a key, per pair of nodes, so that parallel edges are numbered in
+		# constant time rather than by scanning the ids taken so far
+		next_edge_numbers = {}
+		with self.bulk_load():
+			for event in events:
+				kind = event[0]
+				if kind == 'node':
+					_, name, attributes = event
+					label = attributes.pop('label', None)
+					tooltip = attributes.pop('tooltip', None)
+					style, parameters = split_attributes(attributes, NODE_STYLE_ATTRIBUTES)
+					if name in nodes_dict:
+						node = nodes_dict[name]
+					else:
+						node = self.add_node(name=name)
+					if label is not None:
+						# \N is the Graphviz default, the name of the node
+						node.label = None if label == '\\N' else label
+					if tooltip is not None:
+						node._tooltip = tooltip
+					node._parameters.update(parameters)
+					if style:
+						self._node_style_overwrites[name] = {**self._node_style_overwrites.get(name, {}), **style}
+
+				elif kind == 'edge':
+					_, start, end, attributes = event
+					attributes = dict(attributes)
+					edge_id = attributes.pop('key', None)
+					if edge_id is None and not self._is_strict:
+						number = next_edge_numbers.get((start, end), 0)
+						# ids can also be taken by keys or by edges that were in the graph before
+						while (start, end, number or None) in edges_dict:
+							number += 1
+						next_edge_numbers[(start, end)] = number + 1
+						edge_id = number or None
+					label = attributes.pop('label', None)
+					tooltip = attributes.pop('tooltip', None)
+					style, parameters = split_attributes(attributes, EDGE_STYLE_ATTRIBUTES)
+					edge = self.connect(start=start, end=end, id=edge_id, label=label, if_edge_exists='ignore')
+					if tooltip is not None:
+						edge._tooltip = tooltip
+					edge._parameters.update(parameters)
+					if style:
+						self._edge_style_overwrites[edge.id] = {**self._edge_style_overwrites.get(edge.id, {}), **style}
+
+				elif kind == 'graph':
+					self._apply_dot_graph_attributes(attributes=event[1])
+
+				elif kind == 'header':
+					if event[1]['strict']:
+						self._is_strict = True
+					# without a rankdir attribute Graphviz lays graphs out from top to bottom
+					self._direction = 'TB'
+
+	def _apply_dot_graph_attributes(self, attributes: Dict[str, str]):
+		for key, value in attributes.items():
+			if key == 'rankdir':
+				self._direction = value.upper()
+			elif key == 'label':
+				self._label = value
+			elif key == 'tooltip':
+				self._tooltip = value
+			elif key in ('href', 'URL'):
+				self._label_url = value
+			elif key == 'labelloc':
+				self._label_location = value
+			elif key == 'fontname':
+				self._font = value
+			elif key == 'fontcolor':
+				self._label_colour = value
+			elif key == 'fontsize' and to_number(value) is not None:
+				self._font_size = to_number(value)
+			elif key == 'bgcolor':
+				self.background_colour = value
+			elif key == 'ordering':
+				# get_graphviz_header() writes ordering=out for graphs without ordering
+				self._ordering = False
+			elif key not in ('target', 'pad', 'size', 'ratio', 'dpi'):
+				# the rest are written back as they are, the ones that get_graphviz_header() writes are left out
+				self._kwargs[key] = value
+
+	@classmethod
+	def from_dot(cls, source: Union[str, TextIO], encoding: str = 'utf-8', **kwargs) -> 'GraphWithoutDisplay':
+		"""
+		Creates a graph from the first graph of Graphviz DOT source, see append_dot().
+
+		Args:
+			source (Union[str, TextIO]): DOT text, the path of a DOT file, gzipped or not, or a text file object.
+			encoding (str): The encoding of the file.
+			**kwargs: Arguments for creating the empty graph.
+
+		Returns:
+			GraphWithoutDisplay: The new graph.
+		"""
+		return cls(**kwargs).append_dot(source=source, encoding=encoding)
+
+	def __graph__(self) -> Dict:
+		"""
+		Returns the dictionary representation of the graph, built from iter_graph_records().
+
+		Returns:
+			Dict: The dictionary representation of the graph.
+		"""
+		dictionary = {
+			'node_styles': {},
+			'edge_styles': {},
+			'node_colours': {},
+			'edge_colours': {},
+			'nodes': {},
+			'edges': []
+		}
+		for record in self.iter_graph_records():
+			record_type = record['type']
+			if record_type == 'node':
+				dictionary['nodes'][record['id']] = {
+					'label': record['label'], 'value': record['value'], 'style': record['style']
+				}
+			elif record_type == 'edge':
+				dictionary['edges'].append([
+					record['start'], record['end'],
+					{'id': record['id'], 'label': record['label'], 'value': record['value'], 'style': record['style']}
+				])
+			elif record_type == 'graph':
+				for key, value in record.items():
+					if key != 'type':
+						dictionary[key] = value
+			elif record_type == 'node_style':
+				dictionary['node_styles'][record['id']] = record['style']
+			elif record_type == 'edge_style':
+				dictionary['edge_styles'][(record['start'], record['end'], record['id'])] = record['style']
+			elif record_type == 'node_colour':
+				dictionary['node_colours'][record['id']] = record['colour']
+			elif record_type == 'edge_colour':
+				dictionary['edge_colours'][(record['start'], record['end'], record['id'])] = record['colour']
+		return dictionary
 
 	@classmethod
 	def random(
@@ -692,6 +1093,27 @@ class GraphWithoutDisplay(BasicGraph):
 
 		return result
 
+	def summarize(
+			self, max_nodes: int = SUMMARY_MAX_NODES, expand: Optional[Iterable[Union[str, Node]]] = None
+	) -> 'GraphWithoutDisplay':
+		"""
+		Creates a smaller graph for display: each loop becomes one node and, breadth first from the roots, the nodes
+		that do not fit in max_nodes are collapsed into nodes labelled with their counts, one per visible ancestor.
+		Nodes keep the styles they have and collapsed nodes take the style of a node they stand for; the summary is
+		then stylized, so nodes without styles are styled on the summary and this graph is not stylized.
+
+		Args:
+			max_nodes (int): The number of nodes of the summary, exceeded only to show the expanded nodes.
+			expand (Optional[Iterable[Union[str, Node]]]): Nodes shown with their children, and the nodes that lead to
+				them, whatever the budget.
+
+		Returns:
+			GraphWithoutDisplay: A new graph of the same class and settings.
+		"""
+		summary = summarize_graph(graph=self, max_nodes=max_nodes, expand=expand)
+		summary.stylize()
+		return summary
+
 	def render(
 			self, 
 			path: Optional[str] = None, 
@@ -700,37 +1122,68 @@ class GraphWithoutDisplay(BasicGraph):
 			height: Optional[Union[int, float]] = None, 
 			width: Optional[Union[int, float]] = None, 
 			dpi: int = 300, 
-			pad: Union[int, float] = DEFAULT_PAD
-	) -> Union[Source, None]:
+			pad: Union[int, float] = DEFAULT_PAD,
+			engine: str = 'dot',
+			timeout: Optional[float] = None,
+			max_nodes: Optional[int] = None
+	) -> Source:
 		"""
-		Renders the graph and returns the Graphviz source.
+		Renders the graph and returns the Graphviz source; given a path, the graph is also rendered to the file.
+		If the layout engine times out, cheaper engines are tried, e.g. sfdp after dot, and then a summary of the graph.
 
 		Args:
-			path (Optional[str]): The path to save the graph.
+			path (Optional[str]): The path to save the graph, its extension is the output format (pdf by default).
+				The Graphviz source is written next to it, at the path without the extension.
 			view (bool): Whether to view the graph.
 			direction (Optional[str]): The direction of the graph.
 			height (Optional[Union[int, float]]): The height of the graph.
 			width (Optional[Union[int, float]]): The width of the graph.
 			dpi (int): The DPI of the graph.
 			pad (Union[int, float]): The padding of the graph.
+			engine (str): The layout engine, e.g. dot or sfdp, or auto to choose it from the size of the graph.
+			timeout (Optional[float]): Seconds for the layout as a whole: the engine, the cheaper ones tried after it
+				times out and the summary each get a share.
+			max_nodes (Optional[int]): If the graph has more nodes, its summary is rendered instead, see summarize().
 
 		Returns:
-			Union[Source, None]: The Graphviz source or None.
+			Source: The Graphviz source, for display.
 		"""
+		arguments = dict(
+			path=path, view=view, direction=direction, height=height, width=width, dpi=dpi, pad=pad, engine=engine,
+			timeout=timeout
+		)
+		if max_nodes is not None and len(self.nodes_dict) > max_nodes:
+			return self.summarize(max_nodes=max_nodes).render(**arguments)
+
 		direction = direction or self._direction
+		engines = get_layout_engines(engine=engine, num_nodes=len(self.nodes_dict), num_edges=len(self.edges_dict))
 
 		self.stylize()
 
-		if path is None:
-			return self.get_graphviz_source(direction=direction, pad=pad, dpi=None)# Source(source=self.get_graphviz_str(direction=direction, pad=pad, dpi=None))
-		else:
+		if path is not None:
+			# the source is streamed to a file next to the output and rendered from there
 			filename, file_extension = os.path.splitext(path)
-			output_format = file_extension.lstrip('.')
-			to_save = self.get_graphviz_source(
-				direction=direction, pad=pad, dpi=dpi, height=height, width=width, output_format=output_format
-			)
-			to_save.render(filename=filename, view=view)
-			return self.get_graphviz_source(direction=direction, pad=pad, dpi=None)
+			output_format = file_extension.lstrip('.') or 'pdf'
+			self.write_graphviz(file=filename, direction=direction, pad=pad, dpi=dpi, height=height, width=width)
+			deadline = get_deadline(timeout)
+			try:
+				output_path = run_graphviz_with_fallback(
+					source=None, engines=engines, format=output_format,
+					path=path if file_extension else f'{filename}.{output_format}', input_path=filename,
+					timeout=_get_layout_timeout(timeout=timeout, num_engines=len(engines), num_nodes=len(self.nodes_dict))
+				)
+			except subprocess.TimeoutExpired:
+				if len(self.nodes_dict) <= SUMMARY_MAX_NODES:
+					raise
+				_warn_summary_fallback(timeout=timeout)
+				arguments.update(timeout=get_remaining_time(deadline))
+				return self.summarize(max_nodes=SUMMARY_MAX_NODES).render(**arguments)
+			if view:
+				graphviz.view(output_path)
+
+		source = self.get_graphviz_source(direction=direction, pad=pad, dpi=None)
+		source.engine = engines[0]
+		return source
 
 	"""
 	def display_html(self, direction=None, pad=None, echo_errors=False, **kwargs):
@@ -797,3 +1250,117 @@ class GraphWithoutDisplay(BasicGraph):
 				direction=direction, height=height, width=width, pad=pad, dpi=dpi
 			)
 			return self._get_graphviz_source(graphviz_str_to_save)
+
+	async def _ajoin_graphviz_parts(self, **kwargs) -> str:
+		# joins iter_graphviz_parts() but lets other tasks run now and then; the graph should not change meanwhile
+		parts = []
+		for part in self.iter_graphviz_parts(**kwargs):
+			parts.append(part)
+			if len(parts) % _PARTS_PER_AWAIT == 0:
+				await asyncio.sleep(0)
+		return ''.join(parts)
+
+	async def aget_graphviz_source(
+			self,
+			direction: Optional[str] = None,
+			dpi: Optional[int] = 300,
+			height: Optional[Union[int, float]] = None,
+			width: Optional[Union[int, float]] = None,
+			pad: Union[int, float] = DEFAULT_PAD,
+			output_format: Optional[str] = None
+	) -> Source:
+		"""
+		Generates the Graphviz source for the graph like get_graphviz_source() but lets other tasks run while large
+		graphs are converted.
+
+		Args:
+			direction (Optional[str]): The direction of the graph.
+			dpi (Optional[int]): The DPI of the graph.
+			height (Optional[Union[int, float]]): The height of the graph.
+			width (Optional[Union[int, float]]): The width of the graph.
+			pad (Union[int, float]): The padding of the graph.
+			output_format (Optional[str]): The format of the graph.
+
+		Returns:
+			Source: The Graphviz source.
+		"""
+		if height is None and width is None:
+			dpi = None
+		graphviz_str = await self._ajoin_graphviz_parts(direction=direction, dpi=dpi, height=height, width=width, pad=pad)
+		return self._get_graphviz_source(graphviz_str)
+
+	async def arender(
+			self,
+			path: Optional[str] = None,
+			view: bool = True,
+			direction: Optional[str] = None,
+			height: Optional[Union[int, float]] = None,
+			width: Optional[Union[int, float]] = None,
+			dpi: int = 300,
+			pad: Union[int, float] = DEFAULT_PAD,
+			engine: str = 'dot',
+			timeout: Optional[float] = None,
+			semaphore: Optional[asyncio.Semaphore] = None,
+			max_nodes: Optional[int] = None
+	) -> Source:
+		"""
+		Renders the graph like render() without blocking the event loop while the layout engine runs.
+		If the layout engine times out, cheaper engines are tried and then a summary of the graph; if the task is
+		cancelled, the engine is killed.
+
+		Args:
+			path (Optional[str]): The path to save the graph, its extension is the output format (pdf by default).
+				The Graphviz source is written next to it, at the path without the extension.
+			view (bool): Whether to view the graph.
+			direction (Optional[str]): The direction of the graph.
+			height (Optional[Union[int, float]]): The height of the graph.
+			width (Optional[Union[int, float]]): The width of the graph.
+			dpi (int): The DPI of the graph.
+			pad (Union[int, float]): The padding of the graph.
+			engine (str): The layout engine, e.g. dot or sfdp, or auto to choose it from the size of the graph.
+			timeout (Optional[float]): Seconds for the layout as a whole, see render().
+			semaphore (Optional[asyncio.Semaphore]): Limits the renders run at a time, see arun_graphviz.
+			max_nodes (Optional[int]): If the graph has more nodes, its summary is rendered instead, see summarize().
+
+		Returns:
+			Source: The Graphviz source, for display.
+		"""
+		arguments = dict(
+			path=path, view=view, direction=direction, height=height, width=width, dpi=dpi, pad=pad, engine=engine,
+			timeout=timeout, semaphore=semaphore
+		)
+		if max_nodes is not None and len(self.nodes_dict) > max_nodes:
+			return await self.summarize(max_nodes=max_nodes).arender(**arguments)
+
+		direction = direction or self._direction
+		engines = get_layout_engines(engine=engine, num_nodes=len(self.nodes_dict), num_edges=len(self.edges_dict))
+
+		self.stylize()
+
+		if path is not None:
+			filename, file_extension = os.path.splitext(path)
+			output_format = file_extension.lstrip('.') or 'pdf'
+			graphviz_str = await self._ajoin_graphviz_parts(
+				direction=direction, pad=pad, dpi=dpi, height=height, width=width
+			)
+			with open_text(filename, 'w') as file:
+				file.write(graphviz_str)
+			deadline = get_deadline(timeout)
+			try:
+				output_path = await arun_graphviz_with_fallback(
+					source=graphviz_str, engines=engines, format=output_format,
+					path=path if file_extension else f'{filename}.{output_format}', semaphore=semaphore,
+					timeout=_get_layout_timeout(timeout=timeout, num_engines=len(engines), num_nodes=len(self.nodes_dict))
+				)
+			except subprocess.TimeoutExpired:
+				if len(self.nodes_dict) <= SUMMARY_MAX_NODES:
+					raise
+				_warn_summary_fallback(timeout=timeout)
+				arguments.update(timeout=get_remaining_time(deadline))
+				return await self.summarize(max_nodes=SUMMARY_MAX_NODES).arender(**arguments)
+			if view:
+				graphviz.view(output_path)
+
+		source = await self.aget_graphviz_source(direction=direction, pad=pad, dpi=None)
+		source.engine = engines[0]
+		return source
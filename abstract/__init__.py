@@ -1,7 +1,13 @@
 from .Graph import Graph
 from .Node import Node
 from .Edge import Edge
+from .GraphSnapshot import GraphSnapshot
+from .SubgraphView import SubgraphView
+from .MappedGraph import MappedGraph
 from .get_ancestors import get_ancestors
 from .get_descendants import get_descendants
+from .graph_file import save_graph, load_graph
+from .RenderCache import RenderCache
+from .render_many import render_many
 
-__all__ = ['Graph', 'Node', 'Edge', 'get_ancestors', 'get_descendants']
+__all__ = ['Graph', 'Node', 'Edge', 'GraphSnapshot', 'SubgraphView', 'MappedGraph', 'get_ancestors', 'get_descendants', 'save_graph', 'load_graph', 'RenderCache', 'render_many']
@@ -0,0 +1,63 @@
+from typing import Callable, Hashable, Iterable, List
+
+
+def get_strongly_connected_components(
+		vertices: Iterable[Hashable], get_successors: Callable[[Hashable], Iterable[Hashable]]
+) -> List[List[Hashable]]:
+	"""
+	Finds the strongly connected components of a directed graph with an iterative version of Tarjan's algorithm.
+
+	Args:
+		vertices (Iterable[Hashable]): All vertices of the graph.
+		get_successors (Callable): Returns the vertices that a vertex has edges to.
+
+	Returns:
+		List[List[Hashable]]: The components in reverse topological order, i.e. a component comes before
+			every component that has an edge into it.
+	"""
+	indices = {}
+	low_links = {}
+	on_stack = set()
+	stack = []
+	components = []
+
+	for root in vertices:
+		if root in indices:
+			continue
+
+		indices[root] = low_links[root] = len(indices)
+		stack.append(root)
+		on_stack.add(root)
+		work = [(root, iter(get_successors(root)))]
+
+		while work:
+			vertex, successors = work[-1]
+			for successor in successors:
+				if successor not in indices:
+					indices[successor] = low_links[successor] = len(indices)
+					stack.append(successor)
+					on_stack.add(successor)
+					work.append((successor, iter(get_successors(successor))))
+					break
+				elif successor in on_stack and indices[successor] < low_links[vertex]:
+					low_links[vertex] = indices[successor]
+
+			else:
+				# all successors of vertex are done
+				work.pop()
+				if work:
+					parent = work[-1][0]
+					if low_links[vertex] < low_links[parent]:
+						low_links[parent] = low_links[vertex]
+
+				if low_links[vertex] == indices[vertex]:
+					component = []
+					while True:
+						member = stack.pop()
+						on_stack.discard(member)
+						component.append(member)
+						if member == vertex:
+							break
+					components.append(component)
+
+	return components
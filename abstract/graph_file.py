@@ -0,0 +1,343 @@
+import importlib
+import pickle
+import struct
+import sys
+import warnings
+from array import array
+from .paused_garbage_collection import paused_garbage_collection
+from typing import BinaryIO, Dict, List, Optional, Tuple, Type, Union
+
+MAGIC = b'ABSGRAPH'
+FORMAT_VERSION = 1
+
+# header: magic, format version, flags, number of objects, nodes and edges
+_HEADER = struct.Struct('<8sHHqqq')
+
+# kinds of entries in the object table
+OBJECT_NONE = 0
+OBJECT_STR = 1
+OBJECT_INT = 2
+OBJECT_FLOAT = 3
+OBJECT_PICKLE = 4
+
+# every column is an array of 64 bit integers, references to the object table are -1 for None
+NODE_COLUMNS = ('id', 'label', 'value', 'tooltip', 'style', 'parameters', 'index', 'frozen')
+EDGE_COLUMNS = ('start', 'end', 'id', 'label', 'value', 'tooltip', 'style', 'parameters', 'frozen')
+
+
+class _ObjectTable:
+	"""
+	Collects the ids, labels, values, styles and settings of a graph into one table of typed entries.
+	Strings, integers and floats are stored once per distinct value, other objects once per identity, pickled.
+	"""
+	def __init__(self):
+		self.kinds = array('B')
+		self.offsets = array('q', [0])
+		self.data = bytearray()
+		self._references = {}
+		# objects referenced by identity are kept alive so that their ids are not reused
+		self._objects = []
+
+	def add(self, obj) -> int:
+		if obj is None:
+			return -1
+		obj_type = type(obj)
+		if obj_type is str or obj_type is int or obj_type is float:
+			key = (obj_type, obj)
+		else:
+			key = (None, id(obj))
+		reference = self._references.get(key)
+		if reference is not None:
+			return reference
+
+		kind, payload = encode_object(obj)
+		if kind == OBJECT_PICKLE:
+			self._objects.append(obj)
+
+		reference = len(self.kinds)
+		self._references[key] = reference
+		self.kinds.append(kind)
+		self.data += payload
+		self.offsets.append(len(self.data))
+		return reference
+
+
+def encode_object(obj) -> Tuple[int, bytes]:
+	"""
+	Encodes an object for an object table.
+
+	Args:
+		obj: None, a string, integer, float or any object that can be pickled.
+
+	Returns:
+		Tuple[int, bytes]: The kind of the entry and its bytes.
+	"""
+	obj_type = type(obj)
+	if obj is None:
+		return OBJECT_NONE, b''
+	elif obj_type is str:
+		return OBJECT_STR, obj.encode('utf-8')
+	elif obj_type is int:
+		return OBJECT_INT, obj.to_bytes((obj.bit_length() + 8) // 8, 'little', signed=True)
+	elif obj_type is float:
+		return OBJECT_FLOAT, struct.pack('<d', obj)
+	else:
+		return OBJECT_PICKLE, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_object(kind: int, data: Union[bytes, memoryview]):
+	"""
+	Decodes an entry of an object table.
+
+	Args:
+		kind (int): The kind of the entry.
+		data (Union[bytes, memoryview]): The bytes of the entry.
+
+	Returns:
+		The object.
+	"""
+	if kind == OBJECT_NONE:
+		return None
+	elif kind == OBJECT_STR:
+		return bytes(data).decode('utf-8')
+	elif kind == OBJECT_INT:
+		return int.from_bytes(data, 'little', signed=True)
+	elif kind == OBJECT_FLOAT:
+		return struct.unpack('<d', data)[0]
+	elif kind == OBJECT_PICKLE:
+		return pickle.loads(data)
+	else:
+		raise ValueError(f'unknown object kind {kind} in graph file')
+
+
+def _decode_objects(kinds: array, offsets: array, data: bytes) -> List:
+	return [decode_object(kind, data[offsets[index]:offsets[index + 1]]) for index, kind in enumerate(kinds)]
+
+
+def _write_array(file: BinaryIO, values: array):
+	if sys.byteorder == 'big':
+		values = array(values.typecode, values)
+		values.byteswap()
+	file.write(values.tobytes())
+
+
+def _read_array(file: BinaryIO, typecode: str, length: int) -> array:
+	values = array(typecode)
+	num_bytes = length * values.itemsize
+	data = file.read(num_bytes)
+	if len(data) != num_bytes:
+		raise ValueError('graph file is truncated')
+	values.frombytes(data)
+	if sys.byteorder == 'big':
+		values.byteswap()
+	return values
+
+
+def _get_class_path(graph_class: type) -> str:
+	return f'{graph_class.__module__}:{graph_class.__qualname__}'
+
+
+def _get_class(class_path: str) -> type:
+	module_name, qualname = class_path.split(':')
+	obj = importlib.import_module(module_name)
+	for name in qualname.split('.'):
+		obj = getattr(obj, name)
+	return obj
+
+
+def _get_saveable_settings(graph: 'BasicGraph') -> Dict:
+	# settings that cannot be pickled, e.g. lambdas as label converters, are left out and get their defaults on load
+	settings = graph._get_saved_settings()
+	try:
+		pickle.dumps(settings, protocol=pickle.HIGHEST_PROTOCOL)
+		return settings
+	except Exception:
+		pass
+	saveable_settings = {}
+	for key, value in settings.items():
+		try:
+			pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+		except Exception as error:
+			warnings.warn(f'setting {key} of the graph cannot be saved and gets its default when loaded: {error}')
+		else:
+			saveable_settings[key] = value
+	return saveable_settings
+
+
+def save_graph(graph: 'BasicGraph', file: Union[str, BinaryIO]):
+	"""
+	Writes a graph to a flat binary file: a header, a table of objects (ids, labels, values, styles and settings)
+	and one table each for nodes and edges that refer to the objects by position.
+	Nothing is nested, so writing and reading are single linear passes, however long the paths in the graph.
+	Settings that cannot be pickled, e.g. a lambda as label converter, are left out with a warning and get their
+	defaults when the graph is loaded.
+
+	Args:
+		graph (BasicGraph): The graph (or subgraph view) to save.
+		file (Union[str, BinaryIO]): A path or a binary file object.
+	"""
+	if isinstance(file, str):
+		with open(file, 'wb') as f:
+			return save_graph(graph=graph, file=f)
+
+	from .SubgraphView import SubgraphView
+	graph_class = type(graph.graph) if isinstance(graph, SubgraphView) else type(graph)
+
+	objects = _ObjectTable()
+	add = objects.add
+	class_reference = add(_get_class_path(graph_class))
+	settings_reference = add(_get_saveable_settings(graph))
+
+	node_positions = {}
+	node_columns = {column: array('q') for column in NODE_COLUMNS}
+	(
+		node_ids, node_labels, node_values, node_tooltips, node_styles, node_parameters, node_indices, node_frozen
+	) = [node_columns[column] for column in NODE_COLUMNS]
+	for position, node in enumerate(graph.nodes_dict.values()):
+		node_positions[node._raw_id] = position
+		node_ids.append(add(node._raw_id))
+		node_labels.append(add(node._label))
+		node_values.append(add(node._value))
+		node_tooltips.append(add(node._tooltip))
+		node_styles.append(add(node._style))
+		node_parameters.append(add(node._parameters or None))
+		node_indices.append(node._index)
+		node_frozen.append(int(node._frozen))
+
+	edge_columns = {column: array('q') for column in EDGE_COLUMNS}
+	(
+		edge_starts, edge_ends, edge_ids, edge_labels, edge_values, edge_tooltips, edge_styles, edge_parameters,
+		edge_frozen
+	) = [edge_columns[column] for column in EDGE_COLUMNS]
+	for edge in graph.edges_dict.values():
+		edge_starts.append(node_positions[edge._start._raw_id])
+		edge_ends.append(node_positions[edge._end._raw_id])
+		edge_ids.append(add(edge._raw_id))
+		edge_labels.append(add(edge._label))
+		edge_values.append(add(edge._value))
+		edge_tooltips.append(add(edge._tooltip))
+		edge_styles.append(add(edge._style))
+		edge_parameters.append(add(edge._parameters or None))
+		edge_frozen.append(int(edge._frozen))
+
+	file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(objects.kinds), len(node_ids), len(edge_ids)))
+	_write_array(file, objects.kinds)
+	_write_array(file, objects.offsets)
+	file.write(objects.data)
+	_write_array(file, array('q', [class_reference, settings_reference]))
+	for column in NODE_COLUMNS:
+		_write_array(file, node_columns[column])
+	for column in EDGE_COLUMNS:
+		_write_array(file, edge_columns[column])
+
+
+def read_header(file: BinaryIO) -> Tuple[int, int, int, int]:
+	"""
+	Reads and checks the header of a graph file.
+
+	Args:
+		file (BinaryIO): A binary file object positioned at the start of the file.
+
+	Returns:
+		Tuple[int, int, int, int]: The format version and the number of objects, nodes and edges.
+
+	Raises:
+		ValueError: If the file is not a graph file or was written by a newer version of the format.
+	"""
+	data = file.read(_HEADER.size)
+	if len(data) != _HEADER.size:
+		raise ValueError('graph file is truncated')
+	magic, version, _, num_objects, num_nodes, num_edges = _HEADER.unpack(data)
+	if magic != MAGIC:
+		raise ValueError('not a graph file')
+	if version > FORMAT_VERSION:
+		raise ValueError(f'graph file has format version {version}, only up to {FORMAT_VERSION} can be read')
+	return version, num_objects, num_nodes, num_edges
+
+
+def load_graph(file: Union[str, BinaryIO], cls: Optional[Type['BasicGraph']] = None) -> 'BasicGraph':
+	"""
+	Reads a graph written by save_graph.
+
+	Args:
+		file (Union[str, BinaryIO]): A path or a binary file object.
+		cls (Optional[Type[BasicGraph]]): If given, the saved graph should be of this class or a subclass of it.
+
+	Returns:
+		BasicGraph: A graph of the saved class with the saved settings, nodes and edges.
+	"""
+	if isinstance(file, str):
+		with open(file, 'rb') as f:
+			return load_graph(file=f, cls=cls)
+
+	with paused_garbage_collection():
+		return _load_graph(file=file, cls=cls)
+
+
+def _load_graph(file: BinaryIO, cls: Optional[Type['BasicGraph']]) -> 'BasicGraph':
+
+	from .Node import Node
+	from .Edge import Edge
+
+	_, num_objects, num_nodes, num_edges = read_header(file)
+	kinds = _read_array(file, 'B', num_objects)
+	offsets = _read_array(file, 'q', num_objects + 1)
+	data = file.read(offsets[-1])
+	if len(data) != offsets[-1]:
+		raise ValueError('graph file is truncated')
+	class_reference, settings_reference = _read_array(file, 'q', 2)
+	node_columns = {column: _read_array(file, 'q', num_nodes) for column in NODE_COLUMNS}
+	edge_columns = {column: _read_array(file, 'q', num_edges) for column in EDGE_COLUMNS}
+
+	objects = _decode_objects(kinds=kinds, offsets=offsets, data=data)
+	# reference -1 is None
+	objects.append(None)
+
+	graph_class = _get_class(objects[class_reference])
+	if cls is not None and not issubclass(graph_class, cls):
+		raise TypeError(f'the file holds a {graph_class.__name__}, not a {cls.__name__}')
+	# settings that were not saved, e.g. because they could not be pickled, get the defaults of the class
+	settings = graph_class()._get_saved_settings()
+	settings.update(objects[settings_reference])
+	graph = graph_class._from_settings(settings=settings)
+
+	# nodes and edges are restored through their pickling protocol and linked directly, without the checks
+	# that adding them one by one would run, the indices of the graph are rebuilt once at the end
+	nodes = []
+	nodes_dict = graph._nodes_dict
+	for name, label, value, tooltip, style, parameters, index, frozen in zip(
+			*[node_columns[column] for column in NODE_COLUMNS]
+	):
+		node = Node.__new__(Node)
+		node.__setstate__({
+			'graph': graph, 'id': objects[name], 'value': objects[value], 'label': objects[label],
+			'tooltip': objects[tooltip], 'style': objects[style], 'frozen': bool(frozen),
+			'parameters': dict(objects[parameters] or {}), 'outward_edges_dict': {}, 'inward_edges_dict': {},
+			'index': index
+		})
+		node._outward_edges_have_start_node = True
+		node._inward_edges_have_end_node = True
+		nodes_dict[node._raw_id] = node
+		nodes.append(node)
+
+	edges_dict = graph._edges_dict
+	for start, end, edge_id, label, value, tooltip, style, parameters, frozen in zip(
+			*[edge_columns[column] for column in EDGE_COLUMNS]
+	):
+		start_node = nodes[start]
+		end_node = nodes[end]
+		edge = Edge.__new__(Edge)
+		edge.__setstate__({
+			'graph': graph, 'id': objects[edge_id], 'value': objects[value], 'label': objects[label],
+			'tooltip': objects[tooltip], 'style': objects[style], 'frozen': bool(frozen),
+			'parameters': dict(objects[parameters] or {}), 'start': start_node, 'end': end_node
+		})
+		edge_id = edge.id
+		start_node._outward_edges_dict[edge_id] = edge
+		end_node._inward_edges_dict[edge_id] = edge
+		edges_dict[edge_id] = edge
+
+	if len(nodes_dict) != len(nodes) or len(edges_dict) != num_edges:
+		raise ValueError('graph file has duplicate node or edge ids')
+	graph._reset_node_indices()
+	return graph
@@ -0,0 +1,62 @@
+import gzip
+import json
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO, Union
+
+
+@contextmanager
+def open_text(file: Union[str, TextIO], mode: str):
+	# paths ending in .gz are compressed, file objects are used as they are and left open
+	if not isinstance(file, str):
+		yield file
+	elif file.endswith('.gz'):
+		with gzip.open(file, mode + 't', encoding='utf-8') as f:
+			yield f
+	else:
+		with open(file, mode, encoding='utf-8') as f:
+			yield f
+
+
+def write_ndjson(records: Iterable[Dict], file: Union[str, TextIO], default: Optional[Callable] = None) -> int:
+	"""
+	Writes records as newline delimited JSON, one record per line, without holding more than one record in memory.
+
+	Args:
+		records (Iterable[Dict]): The records, for example from GraphWithoutDisplay.iter_graph_records().
+		file (Union[str, TextIO]): A path (compressed if it ends in .gz) or a text file object.
+		default (Optional[Callable]): Converts objects that JSON does not support, as in json.dumps.
+
+	Returns:
+		int: The number of records written.
+	"""
+	num_records = 0
+	with open_text(file, 'w') as f:
+		for record in records:
+			f.write(json.dumps(record, default=default, ensure_ascii=False))
+			f.write('\n')
+			num_records += 1
+	return num_records
+
+
+def read_ndjson(file: Union[str, TextIO]) -> Iterator[Dict]:
+	"""
+	Reads newline delimited JSON lazily, one record at a time; empty lines are skipped.
+
+	Args:
+		file (Union[str, TextIO]): A path (compressed if it ends in .gz) or a text file object.
+
+	Yields:
+		Dict: The records.
+
+	Raises:
+		ValueError: If a line is not valid JSON, with its line number.
+	"""
+	with open_text(file, 'r') as f:
+		for line_number, line in enumerate(f, start=1):
+			line = line.strip()
+			if not line:
+				continue
+			try:
+				yield json.loads(line)
+			except json.JSONDecodeError as error:
+				raise ValueError(f'line {line_number} is not valid JSON: {error}') from error
@@ -1,39 +1,65 @@
 import re
-from typing import List, Optional, Tuple, Generator
+from typing import Iterable, Optional, Tuple, Generator
 
+_INDENTED_LINE = re.compile(r'^(?P<indent>(?: {4})*)(?P<name>\S.*)')
+_WHITESPACE = ' \t'
 
-def parse_indentations(lines: List[str], indent: Optional[str] = None) -> Generator[Tuple[int, int, str, Optional[int]], None, None]:
+
+def _parse_unusual_indentation(line: str, indent: Optional[str]) -> Tuple[int, str]:
+	# indentation that is not a whole number of indents, e.g. four spaces in a tab indented outline,
+	# where every indent counts as four spaces
+	if indent is not None:
+		num_leading = len(line) - len(line.lstrip(indent))
+		leading = line[:num_leading].replace(indent, ' ' * 4)
+		line = leading + line[num_leading:]
+	match = _INDENTED_LINE.match(line)
+	if not match:
+		raise ValueError(f'Indentation not a multiple of spaces or tabs: "{line}"')
+	return len(match.group('indent')) // 4, match.group('name')
+
+
+def parse_indentations(
+		lines: Iterable[str], indent: Optional[str] = None
+) -> Generator[Tuple[int, int, str, Optional[int]], None, None]:
 	"""
-	Parses an indented outline into (index, level, content, parent) tuples.
+	Parses an indented outline into (index, level, content, parent) tuples, lazily, one line at a time.
+	Empty lines get the level of the line before them and are never parents.
 
 	Args:
-		lines (List[str]): The lines of text to parse.
-		indent (Optional[str]): The indentation to use for parsing.
+		lines (Iterable[str]): The lines of text to parse, e.g. an open file.
+		indent (Optional[str]): The indentation of one level; by default the leading whitespace of the first
+			indented line.
 
 	Yields:
 		Tuple[int, int, str, Optional[int]]: A tuple containing the index, level, content, and parent index.
+
+	Raises:
+		ValueError: If the indentation of a line is not a whole number of indents or skips a level.
 	"""
-	regex = re.compile(r'^(?P<indent>(?: {4})*)(?P<name>\S.*)')
 	stack = []
+	level = 0
+	indent_size = None if indent is None else len(indent)
 
 	for index, line in enumerate(lines):
 		line = line.rstrip('\n')
-		if indent is None:
-			if line.startswith('\t') or line.startswith(' '):
-				indent = re.findall(pattern=r'^[ \t]+', string=line)[0]
-		if indent is not None:
-			line = line.replace(indent, " " * 4, len(line) - len(line.lstrip(indent)))
 		if len(line) > 0:
-			match = regex.match(line)
-			if not match:
-				raise ValueError(
-					'Indentation not a multiple of spaces or tabs'.format(line)
-				)
-			level = len(match.group('indent')) // 4
+			content = line.lstrip(_WHITESPACE)
+			num_leading = len(line) - len(content)
+			if num_leading == 0:
+				level = 0
+			else:
+				if indent is None:
+					indent = line[:num_leading]
+					indent_size = num_leading
+				level, remainder = divmod(num_leading, indent_size)
+				if remainder or line[:num_leading] != indent * level:
+					level, content = _parse_unusual_indentation(line=line, indent=indent)
+
+			if len(content) == 0 or content[0].isspace():
+				level, content = _parse_unusual_indentation(line=line, indent=indent)
 			if level > len(stack):
-				raise ValueError('Indentation too deep: "{0}"'.format(line))
+				raise ValueError(f'Indentation too deep: "{line}"')
 			stack[level:] = [index]
-			content = match.group('name')
 		else:
 			content = ''
 		yield index, level, content, (stack[level - 1] if level else None)
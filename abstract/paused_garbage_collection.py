@@ -0,0 +1,18 @@
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def paused_garbage_collection():
+	"""
+	Context manager that turns off the cyclic garbage collector and turns it back on if it was on.
+	Creating many linked objects, such as the nodes and edges of a large graph, otherwise triggers full collections
+	that take most of the time and find nothing to free.
+	"""
+	was_enabled = gc.isenabled()
+	gc.disable()
+	try:
+		yield
+	finally:
+		if was_enabled:
+			gc.enable()
@@ -0,0 +1,351 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from colouration import Colour
+
+# one alternative per kind of token, the longest token at a position wins because the alternatives cannot overlap
+_TOKEN = re.compile(r'''
+	(?P<space>\s+|//[^\n]*|\#[^\n]*|/\*.*?\*/)
+	|(?P<edge_op>->|--)
+	|(?P<id>[A-Za-z_\u0080-\U0010ffff][A-Za-z_0-9\u0080-\U0010ffff]*|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?))
+	|(?P<string>"(?:[^"\\]|\\.)*")
+	|(?P<punctuation>[{}\[\];,=:+])
+	|(?P<html><)
+''', re.VERBOSE | re.DOTALL)
+
+_ANGLE_BRACKET = re.compile('[<>]')
+
+KEYWORDS = {'strict', 'graph', 'digraph', 'node', 'edge', 'subgraph'}
+
+# Graphviz attributes that map to arguments of NodeStyle and EdgeStyle, with the kind of value they take
+NODE_STYLE_ATTRIBUTES = {
+	'color': ('border_colour', 'colour'),
+	'fillcolor': ('fill_colour', 'colour'),
+	'fontcolor': ('text_colour', 'colour'),
+	'fontname': ('font', 'str'),
+	'fontsize': ('text_size', 'number'),
+	'shape': ('shape', 'str'),
+	'style': ('shape_style', 'str')
+}
+EDGE_STYLE_ATTRIBUTES = {
+	'color': ('colour', 'colour'),
+	'fontcolor': ('text_colour', 'colour'),
+	'fontname': ('font', 'str'),
+	'fontsize': ('text_size', 'number'),
+	'arrowsize': ('arrow_size', 'number'),
+	'penwidth': ('line_width', 'number'),
+	'lblstyle': ('label_style', 'str')
+}
+
+
+def _find_html_end(text: str, position: int) -> int:
+	# the position after the > that closes the < at position, -1 if the text ends first
+	depth = 0
+	for match in _ANGLE_BRACKET.finditer(text, position):
+		depth += 1 if match.group() == '<' else -1
+		if depth == 0:
+			return match.end()
+	return -1
+
+
+def _unquote(string: str) -> str:
+	string = string[1:-1]
+	if '\\' in string:
+		string = string.replace('\\\r\n', '').replace('\\\n', '').replace('\\"', '"')
+	return string
+
+
+def iter_dot_tokens(file: TextIO, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, str]]:
+	"""
+	Splits DOT source into tokens, reading the file a chunk at a time. Comments and whitespace are dropped.
+
+	Args:
+		file (TextIO): The DOT source.
+		chunk_size (int): The number of characters read at a time.
+
+	Yields:
+		Tuple[str, str]: The kind and text of each token. The kind is 'id' for names, numbers, quoted strings
+		(without the quotes and escapes) and HTML strings (with the angle brackets), 'keyword' for the keywords in
+		lower case, 'edge_op' for -> and --, and the character itself for punctuation.
+
+	Raises:
+		ValueError: If a character cannot start a token, with its line number.
+	"""
+	buffer = ''
+	position = 0
+	line_number = 1
+	end_of_file = False
+	while True:
+		# a scanner matches one token after another from where the last one ended, until none matches
+		restart = False
+		for match in iter(_TOKEN.scanner(buffer, position).match, None):
+			kind = match.lastgroup
+			end = match.end()
+			if kind == 'html':
+				end = _find_html_end(buffer, position)
+			# a token that reaches the end of the buffer might continue in the next chunk
+			if end == -1 or (end == len(buffer) and not end_of_file):
+				break
+			if kind == 'space':
+				pass
+			elif kind == 'id':
+				text = match.group()
+				lower = text.lower()
+				if lower in KEYWORDS:
+					yield 'keyword', lower
+				else:
+					yield 'id', text
+			elif kind == 'string':
+				yield 'id', _unquote(match.group())
+			elif kind == 'punctuation':
+				text = match.group()
+				yield text, text
+			elif kind == 'edge_op':
+				yield kind, match.group()
+			else:
+				# the scanner only matched the <, it is restarted after the HTML string
+				yield 'id', buffer[position:end]
+				restart = True
+			position = end
+			if restart:
+				break
+
+		if restart:
+			continue
+		if end_of_file:
+			if position == len(buffer):
+				return
+			line_number += buffer.count('\n', 0, position)
+			raise ValueError(f'line {line_number} of the DOT source: cannot read {buffer[position:position + 20]!r}')
+		chunk = file.read(chunk_size)
+		line_number += buffer.count('\n', 0, position)
+		buffer = buffer[position:] + chunk
+		position = 0
+		end_of_file = len(chunk) == 0
+
+
+class _DotParser:
+	"""Recursive descent parser of the first graph in a stream of DOT tokens, only subgraphs are parsed recursively."""
+
+	def __init__(self, tokens: Iterator[Tuple[str, str]]):
+		self._tokens = tokens
+		self._next = next(tokens, None)
+		self._seen_nodes = set()
+		# the nodes of every subgraph being parsed, dictionaries are used as ordered sets
+		self._subgraph_nodes = []
+
+	def _peek(self) -> Optional[str]:
+		return None if self._next is None else self._next[0]
+
+	def _take(self, kind: Optional[str] = None) -> str:
+		token = self._next
+		if token is None:
+			raise ValueError('unexpected end of the DOT source')
+		if kind is not None and token[0] != kind:
+			raise ValueError(f'expected {kind} in the DOT source, not {token[1]!r}')
+		self._next = next(self._tokens, None)
+		return token[1]
+
+	def _take_id(self) -> str:
+		text = self._take('id')
+		# quoted strings can be concatenated with +
+		while self._peek() == '+':
+			self._take()
+			text += self._take('id')
+		return text
+
+	def _take_attributes(self) -> Dict[str, str]:
+		attributes = {}
+		while self._peek() == '[':
+			self._take()
+			while self._peek() != ']':
+				key = self._take_id()
+				if self._peek() == '=':
+					self._take()
+					attributes[key] = self._take_id()
+				else:
+					attributes[key] = 'true'
+				if self._peek() in (',', ';'):
+					self._take()
+			self._take(']')
+		return attributes
+
+	def parse(self) -> Iterator[Tuple]:
+		"""
+		Yields a 'header' event, then 'graph', 'node' and 'edge' events in the order of the statements.
+		"""
+		strict = False
+		if self._next == ('keyword', 'strict'):
+			self._take()
+			strict = True
+		kind = self._take('keyword')
+		if kind not in ('graph', 'digraph'):
+			raise ValueError(f'a DOT graph starts with graph or digraph, not {kind}')
+		name = self._take_id() if self._peek() == 'id' else None
+		yield 'header', {'strict': strict, 'directed': kind == 'digraph', 'name': name}
+		self._take('{')
+		yield from self._parse_statements(defaults={'node': {}, 'edge': {}}, is_top_level=True)
+		self._take('}')
+
+	def _parse_statements(self, defaults: Dict[str, Dict], is_top_level: bool) -> Iterator[Tuple]:
+		while self._peek() not in ('}', None):
+			kind, text = self._next
+			if kind == 'keyword' and text in ('graph', 'node', 'edge'):
+				self._take()
+				attributes = self._take_attributes()
+				if text != 'graph':
+					defaults[text] = {**defaults[text], **attributes}
+				elif is_top_level:
+					yield 'graph', attributes
+
+			elif kind == '{' or (kind == 'keyword' and text == 'subgraph'):
+				nodes = yield from self._parse_subgraph(defaults=defaults)
+				if self._peek() == 'edge_op':
+					yield from self._parse_edges(first_nodes=nodes, defaults=defaults)
+
+			elif kind == 'id':
+				name = self._take_id()
+				if self._peek() == '=':
+					self._take()
+					value = self._take_id()
+					if is_top_level:
+						yield 'graph', {name: value}
+				else:
+					self._skip_port()
+					if self._peek() == 'edge_op':
+						yield from self._node_event(name=name, attributes={}, defaults=defaults)
+						yield from self._parse_edges(first_nodes=[name], defaults=defaults)
+					else:
+						attributes = self._take_attributes()
+						yield from self._node_event(name=name, attributes=attributes, defaults=defaults)
+
+			else:
+				raise ValueError(f'unexpected {text!r} in the DOT source')
+
+			if self._peek() == ';':
+				self._take()
+
+	def _skip_port(self):
+		# ports such as node:port:compass_point only matter for the layout
+		while self._peek() == ':':
+			self._take()
+			self._take_id()
+
+	def _node_event(self, name: str, attributes: Dict[str, str], defaults: Dict[str, Dict]) -> Iterator[Tuple]:
+		for subgraph_nodes in self._subgraph_nodes:
+			subgraph_nodes[name] = None
+		if name not in self._seen_nodes:
+			# the default attributes apply to the nodes created after them
+			self._seen_nodes.add(name)
+			yield 'node', name, {**defaults['node'], **attributes}
+		elif attributes:
+			yield 'node', name, attributes
+
+	def _parse_subgraph(self, defaults: Dict[str, Dict]) -> Iterator[Tuple]:
+		if self._next == ('keyword', 'subgraph'):
+			self._take()
+			if self._peek() == 'id':
+				self._take_id()
+		self._take('{')
+		nodes = {}
+		self._subgraph_nodes.append(nodes)
+		inner_defaults = {'node': dict(defaults['node']), 'edge': dict(defaults['edge'])}
+		yield from self._parse_statements(defaults=inner_defaults, is_top_level=False)
+		self._subgraph_nodes.pop()
+		self._take('}')
+		return list(nodes)
+
+	def _parse_edges(self, first_nodes: List[str], defaults: Dict[str, Dict]) -> Iterator[Tuple]:
+		operands = [first_nodes]
+		while self._peek() == 'edge_op':
+			self._take()
+			if self._peek() == '{' or self._next == ('keyword', 'subgraph'):
+				nodes = yield from self._parse_subgraph(defaults=defaults)
+			else:
+				name = self._take_id()
+				self._skip_port()
+				yield from self._node_event(name=name, attributes={}, defaults=defaults)
+				nodes = [name]
+			operands.append(nodes)
+		attributes = {**defaults['edge'], **self._take_attributes()}
+		for starts, ends in zip(operands, operands[1:]):
+			for start in starts:
+				for end in ends:
+					yield 'edge', start, end, attributes
+
+
+def iter_dot_events(file: TextIO, chunk_size: int = 1 << 20) -> Iterator[Tuple]:
+	"""
+	Parses the first graph of DOT source lazily into events:
+	('header', {'strict': bool, 'directed': bool, 'name': Optional[str]}) first, then
+	('graph', attributes) for graph attributes of the top level,
+	('node', name, attributes) when a node is created, with the node defaults in effect, or gets attributes,
+	('edge', start, end, attributes) for every edge of an edge statement, with the edge defaults in effect.
+	Edges to and from subgraphs are expanded to their nodes, ports are dropped and attribute values are strings.
+
+	Args:
+		file (TextIO): The DOT source.
+		chunk_size (int): The number of characters read at a time.
+
+	Yields:
+		Tuple: The events.
+
+	Raises:
+		ValueError: If the source is not valid DOT.
+	"""
+	return _DotParser(tokens=iter_dot_tokens(file=file, chunk_size=chunk_size)).parse()
+
+
+@lru_cache(maxsize=1024)
+def _to_colour(value: str) -> Optional[Colour]:
+	if len(value) == 9 and value.startswith('#'):
+		# the opacity of #RRGGBBAA is dropped, NodeStyle and EdgeStyle keep it separately
+		value = value[:7]
+	try:
+		return Colour(value)
+	except (KeyError, ValueError):
+		return None
+
+
+def to_number(value: str) -> Optional[Union[int, float]]:
+	"""Converts the text of a Graphviz number, None if it is not one."""
+	try:
+		number = float(value)
+	except ValueError:
+		return None
+	return int(number) if number.is_integer() else number
+
+
+def split_attributes(
+		attributes: Dict[str, str], style_attributes: Dict[str, Tuple[str, str]]
+) -> Tuple[Dict[str, object], Dict[str, str]]:
+	"""
+	Separates the Graphviz attributes that have a style argument from the rest.
+
+	Args:
+		attributes (Dict[str, str]): The attributes, as parsed.
+		style_attributes (Dict[str, Tuple[str, str]]): NODE_STYLE_ATTRIBUTES or EDGE_STYLE_ATTRIBUTES.
+
+	Returns:
+		Tuple[Dict[str, object], Dict[str, str]]: The style arguments, e.g. for NodeStyle.complement(), and the
+		attributes that have no style argument or a value that could not be converted.
+	"""
+	style = {}
+	others = {}
+	for key, value in attributes.items():
+		if key not in style_attributes:
+			others[key] = value
+			continue
+		argument, value_kind = style_attributes[key]
+		if value_kind == 'colour':
+			converted = _to_colour(value)
+		elif value_kind == 'number':
+			converted = to_number(value)
+		else:
+			converted = value
+		if converted is None:
+			others[key] = value
+		else:
+			style[argument] = converted
+	return style, others
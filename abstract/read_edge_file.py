@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple, Union
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+@contextmanager
+def open_text_file(path: str, encoding: str = 'utf-8'):
+	"""
+	Opens a text file for reading, decompressing it on the fly if it is gzipped (whatever its extension).
+
+	Args:
+		path (str): The path of the file.
+		encoding (str): The encoding of the text.
+
+	Yields:
+		TextIO: The file object.
+	"""
+	with open(path, 'rb') as raw:
+		if raw.peek(2)[:2] == GZIP_MAGIC:
+			with gzip.open(raw, 'rt', encoding=encoding, newline='') as file:
+				yield file
+		else:
+			with io.TextIOWrapper(raw, encoding=encoding, newline='') as file:
+				yield file
+
+
+def _get_column_index(column: Union[str, int], header: Optional[List[str]], argument: str) -> int:
+	if isinstance(column, int):
+		return column
+	if header is None:
+		raise ValueError(f'{argument} is a column name, {column!r}, but the file has no header')
+	try:
+		return header.index(column)
+	except ValueError:
+		raise KeyError(f'{argument}: there is no column named {column!r} in {header}') from None
+
+
+def iter_edge_chunks(
+		path: str, start_col: Union[str, int], end_col: Union[str, int], label_col: Optional[Union[str, int]] = None,
+		id_col: Optional[Union[str, int]] = None, chunk_size: int = 100000, delimiter: Optional[str] = None,
+		header: bool = True, encoding: str = 'utf-8'
+) -> Iterator[List[Tuple[str, str, Union[str, int], Optional[str]]]]:
+	"""
+	Reads the edges of a delimited text file (csv, tsv, gzipped or not) a chunk of rows at a time.
+
+	Args:
+		path (str): The path of the file.
+		start_col (Union[str, int]): Name or position of the column of start nodes.
+		end_col (Union[str, int]): Name or position of the column of end nodes.
+		label_col (Optional[Union[str, int]]): Name or position of the column of edge labels.
+		id_col (Optional[Union[str, int]]): Name or position of the column of edge IDs; by default the position of
+			the row among the data rows is used.
+		chunk_size (int): The number of rows per chunk.
+		delimiter (Optional[str]): The delimiter; by default tab for .tsv and .tab files (gzipped or not), else comma.
+		header (bool): If True, the first row has the column names.
+		encoding (str): The encoding of the text.
+
+	Yields:
+		List[Tuple[str, str, Union[str, int], Optional[str]]]: (start, end, edge id, label) of each edge in a chunk.
+	"""
+	if chunk_size < 1:
+		raise ValueError('chunk_size should be at least 1')
+	if delimiter is None:
+		name = path[:-3] if path.endswith('.gz') else path
+		delimiter = '\t' if name.endswith(('.tsv', '.tab')) else ','
+
+	with open_text_file(path=path, encoding=encoding) as file:
+		rows = csv.reader(file, delimiter=delimiter)
+		column_names = next(rows, None) if header else None
+		start_index = _get_column_index(start_col, column_names, 'start_col')
+		end_index = _get_column_index(end_col, column_names, 'end_col')
+		label_index = None if label_col is None else _get_column_index(label_col, column_names, 'label_col')
+		id_index = None if id_col is None else _get_column_index(id_col, column_names, 'id_col')
+
+		row_number = 0
+		while True:
+			chunk = list(islice(rows, chunk_size))
+			if not chunk:
+				break
+			edges = []
+			for row in chunk:
+				if not row:
+					continue
+				try:
+					edges.append((
+						row[start_index], row[end_index],
+						row_number if id_index is None else row[id_index],
+						None if label_index is None else row[label_index]
+					))
+				except IndexError:
+					raise ValueError(
+						f'data row {row_number + 1} of {path} has {len(row)} columns, not enough for the edge columns'
+					) from None
+				row_number += 1
+			yield edges
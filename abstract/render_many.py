@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+import os
+import time
+from typing import Iterable, List, Optional, Tuple, Union
+from ._GraphWithoutDisplay import GraphWithoutDisplay, DEFAULT_PAD
+from .run_graphviz import get_layout_engines, run_graphviz_with_fallback
+
+
+class RenderResult:
+	def __init__(
+			self, path: str, source_seconds: float, render_seconds: float = 0.0, error: Optional[BaseException] = None
+	):
+		"""
+		Outcome of rendering one graph with render_many.
+
+		Args:
+			path (str): The path of the output file.
+			source_seconds (float): Seconds spent stylizing the graph and building its Graphviz source.
+			render_seconds (float): Seconds spent by the layout engine.
+			error (Optional[BaseException]): The exception raised while building or rendering, None if it succeeded.
+		"""
+		self.path = path
+		self.source_seconds = source_seconds
+		self.render_seconds = render_seconds
+		self.error = error
+
+	@property
+	def ok(self) -> bool:
+		"""Tells whether the graph was rendered."""
+		return self.error is None
+
+	def __repr__(self) -> str:
+		status = 'ok' if self.ok else f'failed: {self.error!r}'
+		return f'RenderResult:{self.path} ({self.source_seconds:.3f}s + {self.render_seconds:.3f}s, {status})'
+
+
+def _get_output(path: str) -> Tuple[str, str]:
+	# like render(), the extension is the format and pdf is the default
+	extension = os.path.splitext(path)[1]
+	if extension:
+		return path, extension.lstrip('.')
+	else:
+		return path + '.pdf', 'pdf'
+
+
+def _render_source(
+		source: str, engines: List[str], format: str, path: str, timeout: Optional[float]
+) -> Tuple[float, Optional[BaseException]]:
+	start = time.perf_counter()
+	try:
+		run_graphviz_with_fallback(source=source, engines=engines, format=format, path=path, timeout=timeout)
+	except Exception as error:
+		return time.perf_counter() - start, error
+	return time.perf_counter() - start, None
+
+
+def render_many(
+		items: Iterable[Tuple[Union[GraphWithoutDisplay, str], str]], max_workers: Optional[int] = None,
+		engine: str = 'dot', timeout: Optional[float] = None, direction: Optional[str] = None,
+		dpi: Optional[int] = 300, pad: Union[int, float] = DEFAULT_PAD
+) -> List[RenderResult]:
+	"""
+	Renders many graphs to files, running up to max_workers layout engine subprocesses at a time.
+	Graphs are stylized and turned into Graphviz sources one at a time in the calling thread while earlier ones are
+	laid out, and at most twice max_workers sources wait for a subprocess, so memory does not grow with the batch.
+	A graph that fails does not stop the others; its error is in its result.
+
+	Args:
+		items (Iterable[Tuple[Union[GraphWithoutDisplay, str], str]]): Pairs of a graph or a Graphviz source and the
+			path of its output, whose extension is the output format (pdf by default, added to the path).
+		max_workers (Optional[int]): The number of subprocesses run at a time; the number of CPUs by default.
+		engine (str): The layout engine, e.g. dot or neato, or auto to choose it from the size of each graph (dot for
+			sources).
+		timeout (Optional[float]): Seconds for the layout of each graph, shared between the engine and the cheaper
+			ones tried after it times out, e.g. sfdp after dot.
+		direction (Optional[str]): The direction of the graphs; by default the direction of each graph.
+		dpi (Optional[int]): The DPI of the graphs.
+		pad (Union[int, float]): The padding of the graphs.
+
+	Returns:
+		List[RenderResult]: The results, in the order of the items.
+
+	Raises:
+		ValueError: If the engine is not auto or a Graphviz layout engine.
+	"""
+	# an unknown engine would fail every item, so it is refused before any graph is stylized
+	source_engines = get_layout_engines(engine=engine, num_nodes=0, num_edges=0)
+	if max_workers is None:
+		max_workers = os.cpu_count() or 1
+	if max_workers < 1:
+		raise ValueError('max_workers should be at least 1')
+
+	results = []
+	pending = {}
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		def collect(return_when):
+			done, _ = wait(pending, return_when=return_when)
+			for future in done:
+				result = pending.pop(future)
+				result.render_seconds, result.error = future.result()
+
+		for graph, path in items:
+			path, output_format = _get_output(path)
+			start = time.perf_counter()
+			try:
+				if isinstance(graph, str):
+					source = graph
+					engines = source_engines
+				else:
+					engines = get_layout_engines(
+						engine=engine, num_nodes=len(graph.nodes_dict), num_edges=len(graph.edges_dict)
+					)
+					graph.stylize()
+					source = graph.get_graphviz_str(direction=direction, dpi=dpi, pad=pad)
+			except Exception as error:
+				results.append(RenderResult(path=path, source_seconds=time.perf_counter() - start, error=error))
+				continue
+			result = RenderResult(path=path, source_seconds=time.perf_counter() - start)
+			results.append(result)
+
+			if len(pending) >= 2 * max_workers:
+				collect(return_when=FIRST_COMPLETED)
+			future = executor.submit(
+				_render_source, source=source, engines=engines, format=output_format, path=path, timeout=timeout
+			)
+			pending[future] = result
+
+		if pending:
+			collect(return_when=ALL_COMPLETED)
+	return results
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import subprocess
+import time
+import warnings
+import weakref
+from typing import List, Optional, Union
+import graphviz
+
+# the number of layout engine subprocesses that arun_graphviz runs at a time in an event loop, unless it is given a
+# semaphore; read when a loop first renders
+MAX_CONCURRENT_RENDERS = os.cpu_count() or 1
+
+_semaphores = weakref.WeakKeyDictionary()
+
+# the largest graphs that the auto engine lays out with dot, which is superlinear, and with neato
+DOT_MAX_NODES = 1000
+DOT_MAX_EDGES = 3000
+NEATO_MAX_NODES = 3000
+
+# the engine tried when an engine times out, sfdp being the one that scales best
+CHEAPER_ENGINES = {'dot': 'sfdp', 'neato': 'sfdp', 'fdp': 'sfdp', 'circo': 'sfdp', 'twopi': 'sfdp'}
+
+
+def choose_layout_engine(num_nodes: int, num_edges: int) -> str:
+	"""
+	Chooses the layout engine of the auto mode from the size of a graph: dot for small graphs, neato for medium ones
+	and sfdp for large ones.
+
+	Args:
+		num_nodes (int): The number of nodes.
+		num_edges (int): The number of edges.
+
+	Returns:
+		str: dot, neato or sfdp.
+	"""
+	if num_nodes <= DOT_MAX_NODES and num_edges <= DOT_MAX_EDGES:
+		return 'dot'
+	elif num_nodes <= NEATO_MAX_NODES:
+		return 'neato'
+	else:
+		return 'sfdp'
+
+
+def get_layout_engines(engine: str, num_nodes: int, num_edges: int) -> List[str]:
+	"""
+	Gets the layout engines to try, one after the other when they time out: the engine, or the one chosen for the
+	size of the graph if it is auto, followed by cheaper ones.
+
+	Args:
+		engine (str): A Graphviz layout engine, e.g. dot, or auto.
+		num_nodes (int): The number of nodes.
+		num_edges (int): The number of edges.
+
+	Returns:
+		List[str]: The engines.
+	"""
+	if engine == 'auto':
+		engine = choose_layout_engine(num_nodes=num_nodes, num_edges=num_edges)
+	elif engine not in graphviz.ENGINES:
+		raise ValueError(f'engine should be auto or one of {sorted(graphviz.ENGINES)}, not {engine!r}')
+	engines = [engine]
+	while engines[-1] in CHEAPER_ENGINES:
+		engines.append(CHEAPER_ENGINES[engines[-1]])
+	return engines
+
+
+def get_graphviz_command(
+		engine: str = 'dot', format: str = 'svg', path: Optional[str] = None, input_path: Optional[str] = None
+) -> List[str]:
+	"""
+	Builds the command line of a Graphviz layout engine.
+
+	Args:
+		engine (str): The layout engine, e.g. dot or neato.
+		format (str): The output format.
+		path (Optional[str]): The output file; the output goes to stdout if None.
+		input_path (Optional[str]): The file of the Graphviz source; the source is read from stdin if None.
+
+	Returns:
+		List[str]: The command and its arguments.
+	"""
+	command = [engine, f'-T{format}']
+	if path is not None:
+		command += ['-o', path]
+	if input_path is not None:
+		command.append(input_path)
+	return command
+
+
+def run_graphviz(
+		source: Optional[str], engine: str = 'dot', format: str = 'svg', path: Optional[str] = None,
+		timeout: Optional[float] = None, input_path: Optional[str] = None
+) -> Union[bytes, str]:
+	"""
+	Lays out a Graphviz source with a layout engine subprocess.
+
+	Args:
+		source (Optional[str]): The Graphviz source, e.g. from get_graphviz_str(); None if it is in input_path.
+		engine (str): The layout engine, e.g. dot or neato.
+		format (str): The output format.
+		path (Optional[str]): The output file; the output is returned if None.
+		timeout (Optional[float]): Seconds after which the subprocess is killed.
+		input_path (Optional[str]): The file of the Graphviz source, if source is None.
+
+	Returns:
+		Union[bytes, str]: The output, or the path if one was given.
+
+	Raises:
+		graphviz.ExecutableNotFound: If the layout engine is not installed.
+		graphviz.CalledProcessError: If the layout engine fails.
+		subprocess.TimeoutExpired: If the layout takes longer than timeout.
+	"""
+	command = get_graphviz_command(engine=engine, format=format, path=path, input_path=input_path)
+	try:
+		if source is None:
+			completed = subprocess.run(
+				command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout
+			)
+		else:
+			completed = subprocess.run(
+				command, input=source.encode(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout
+			)
+	except FileNotFoundError:
+		raise graphviz.ExecutableNotFound(command) from None
+	if completed.returncode != 0:
+		raise graphviz.CalledProcessError(
+			completed.returncode, command, output=completed.stdout, stderr=completed.stderr
+		)
+	return completed.stdout if path is None else path
+
+
+def get_deadline(timeout: Optional[float]) -> Optional[float]:
+	"""
+	Gets the time.monotonic() time at which a timeout runs out.
+
+	Args:
+		timeout (Optional[float]): Seconds from now, or None for no timeout.
+
+	Returns:
+		Optional[float]: The deadline, None if there is no timeout.
+	"""
+	return None if timeout is None else time.monotonic() + timeout
+
+
+def get_remaining_time(deadline: Optional[float], num_shares: int = 1) -> Optional[float]:
+	"""
+	Gets the time left before a deadline, divided between the steps that still have to run in it.
+
+	Args:
+		deadline (Optional[float]): The deadline from get_deadline().
+		num_shares (int): The number of steps left, each gets an equal share.
+
+	Returns:
+		Optional[float]: Seconds for the next step, zero if the deadline has passed, None if there is no deadline.
+	"""
+	if deadline is None:
+		return None
+	return max(deadline - time.monotonic(), 0.0) / num_shares
+
+
+def _warn_timeout(engine: str, timeout: float, next_engine: str):
+	warnings.warn(f'{engine} did not lay out the graph in {timeout:.3g} seconds, falling back to {next_engine}')
+
+
+def run_graphviz_with_fallback(
+		source: Optional[str], engines: List[str], format: str = 'svg', path: Optional[str] = None,
+		timeout: Optional[float] = None, input_path: Optional[str] = None
+) -> Union[bytes, str]:
+	"""
+	Lays out a Graphviz source with the first of the engines that finishes within the timeout, see run_graphviz.
+
+	Args:
+		source (Optional[str]): The Graphviz source; None if it is in input_path.
+		engines (List[str]): The layout engines to try, e.g. from get_layout_engines().
+		format (str): The output format.
+		path (Optional[str]): The output file; the output is returned if None.
+		timeout (Optional[float]): Seconds for all the engines together; each engine gets an equal share of the time
+			left when it starts, so an engine that times out leaves time to the cheaper ones.
+		input_path (Optional[str]): The file of the Graphviz source, if source is None.
+
+	Returns:
+		Union[bytes, str]: The output, or the path if one was given.
+
+	Raises:
+		subprocess.TimeoutExpired: If the last engine times out too.
+	"""
+	deadline = get_deadline(timeout)
+	for index, engine in enumerate(engines):
+		engine_timeout = get_remaining_time(deadline, num_shares=len(engines) - index)
+		try:
+			return run_graphviz(
+				source=source, engine=engine, format=format, path=path, timeout=engine_timeout, input_path=input_path
+			)
+		except subprocess.TimeoutExpired:
+			if index == len(engines) - 1:
+				raise
+			_warn_timeout(engine=engine, timeout=engine_timeout, next_engine=engines[index + 1])
+
+
+def _get_default_semaphore() -> asyncio.Semaphore:
+	# semaphores belong to the event loop they are used in
+	loop = asyncio.get_running_loop()
+	semaphore = _semaphores.get(loop)
+	if semaphore is None:
+		semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_RENDERS)
+	return semaphore
+
+
+async def arun_graphviz(
+		source: str, engine: str = 'dot', format: str = 'svg', path: Optional[str] = None,
+		timeout: Optional[float] = None, semaphore: Optional[asyncio.Semaphore] = None
+) -> Union[bytes, str]:
+	"""
+	Lays out a Graphviz source with a layout engine subprocess without blocking the event loop.
+	If the layout times out or the task is cancelled, the subprocess is killed.
+
+	Args:
+		source (str): The Graphviz source, e.g. from get_graphviz_str().
+		engine (str): The layout engine, e.g. dot or neato.
+		format (str): The output format.
+		path (Optional[str]): The output file; the output is returned if None.
+		timeout (Optional[float]): Seconds after which the subprocess is killed, not counting the wait for the semaphore.
+		semaphore (Optional[asyncio.Semaphore]): Limits the subprocesses run at a time; by default one per event loop
+			that allows MAX_CONCURRENT_RENDERS.
+
+	Returns:
+		Union[bytes, str]: The output, or the path if one was given.
+
+	Raises:
+		graphviz.ExecutableNotFound: If the layout engine is not installed.
+		graphviz.CalledProcessError: If the layout engine fails.
+		subprocess.TimeoutExpired: If the layout takes longer than timeout.
+	"""
+	command = get_graphviz_command(engine=engine, format=format, path=path)
+	if semaphore is None:
+		semaphore = _get_default_semaphore()
+
+	async with semaphore:
+		try:
+			process = await asyncio.create_subprocess_exec(
+				*command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+			)
+		except FileNotFoundError:
+			raise graphviz.ExecutableNotFound(command) from None
+		try:
+			stdout, stderr = await asyncio.wait_for(process.communicate(source.encode()), timeout=timeout)
+		except BaseException as error:
+			if process.returncode is None:
+				process.kill()
+				await process.wait()
+			if isinstance(error, asyncio.TimeoutError):
+				raise subprocess.TimeoutExpired(command, timeout) from None
+			raise
+
+	if process.returncode != 0:
+		raise graphviz.CalledProcessError(process.returncode, command, output=stdout, stderr=stderr)
+	return stdout if path is None else path
+
+
+async def arun_graphviz_with_fallback(
+		source: str, engines: List[str], format: str = 'svg', path: Optional[str] = None,
+		timeout: Optional[float] = None, semaphore: Optional[asyncio.Semaphore] = None
+) -> Union[bytes, str]:
+	"""
+	Lays out a Graphviz source with the first of the engines that finishes within the timeout, see arun_graphviz.
+
+	Args:
+		source (str): The Graphviz source.
+		engines (List[str]): The layout engines to try, e.g. from get_layout_engines().
+		format (str): The output format.
+		path (Optional[str]): The output file; the output is returned if None.
+		timeout (Optional[float]): Seconds for all the engines together, shared like in run_graphviz_with_fallback;
+			waiting for the semaphore before a cheaper engine uses up some of it.
+		semaphore (Optional[asyncio.Semaphore]): Limits the subprocesses run at a time.
+
+	Returns:
+		Union[bytes, str]: The output, or the path if one was given.
+
+	Raises:
+		subprocess.TimeoutExpired: If the last engine times out too.
+	"""
+	deadline = get_deadline(timeout)
+	for index, engine in enumerate(engines):
+		engine_timeout = get_remaining_time(deadline, num_shares=len(engines) - index)
+		try:
+			return await arun_graphviz(
+				source=source, engine=engine, format=format, path=path, timeout=engine_timeout, semaphore=semaphore
+			)
+		except subprocess.TimeoutExpired:
+			if index == len(engines) - 1:
+				raise
+			_warn_timeout(engine=engine, timeout=engine_timeout, next_engine=engines[index + 1])
@@ -8,9 +8,19 @@ DEFAULT_FONT = 'helvetica'
 DEFAULT_NODE_COLOUR_DIFFERENCE_RATIO = 0.5
 DEFAULT_EDGE_OPACITY = 1
 DEFAULT_EDGE_LABEL_STYLE = 'below'
+_UNVERSIONED_ATTRIBUTES = {'_version', '_graphviz_str_cache'}
 
 
 class EdgeStyle:
+	# the version changes whenever an attribute is set, so cached Graphviz strings of the style are not reused
+	_version = 0
+	_graphviz_str_cache = None
+
+	def __setattr__(self, key, value):
+		object.__setattr__(self, key, value)
+		if key not in _UNVERSIONED_ATTRIBUTES:
+			object.__setattr__(self, '_version', self._version + 1)
+
 	def __init__(
 			self, colour=DEFAULT_COLOUR, opacity=DEFAULT_EDGE_OPACITY,
 			font=DEFAULT_FONT, text_colour=None, text_size=DEFAULT_EDGE_TEXT_SIZE,
@@ -119,7 +129,8 @@ class EdgeStyle:
 			'_text_size': self._text_size,
 			'_arrow_size': self._arrow_size,
 			'_label_style': self._label_style,
-			'_line_width': self._line_width
+			'_line_width': self._line_width,
+			'_text_colour_based_on_main_colour': self._text_colour_based_on_main_colour
 		}
 
 	def __setstate__(self, state):
@@ -131,6 +142,7 @@ class EdgeStyle:
 		self._arrow_size = state['_arrow_size']
 		self._label_style = state['_label_style']
 		self._line_width = state['_line_width']
+		self._text_colour_based_on_main_colour = state.get('_text_colour_based_on_main_colour', False)
 
 	@property
 	def _graphviz_dictionary(self):
@@ -148,6 +160,10 @@ class EdgeStyle:
 		"""
 		:rtype: str
 		"""
+		cache = self._graphviz_str_cache
+		if cache is not None and cache[0] == self._version:
+			return cache[1]
+
 		key_values = []
 		for key, value in self._graphviz_dictionary.items():
 			if isinstance(value, Colour):
@@ -162,4 +178,6 @@ class EdgeStyle:
 			if value is not None:
 				key_values.append((key, value))
 
-		return ' '.join([f'"{key}"="{value}"' for key, value in key_values])
+		result = ' '.join([f'"{key}"="{value}"' for key, value in key_values])
+		self._graphviz_str_cache = (self._version, result)
+		return result
@@ -7,9 +7,19 @@ DEFAULT_FONT = 'helvetica'
 DEFAULT_SHAPE = 'box'
 DEFAULT_SHAPE_STYLE = 'rounded, filled'
 DEFAULT_NODE_COLOUR_DIFFERENCE_RATIO = 0.5
+_UNVERSIONED_ATTRIBUTES = {'_version', '_graphviz_str_cache'}
 
 
 class NodeStyle:
+	# the version changes whenever an attribute is set, so cached Graphviz strings of the style are not reused
+	_version = 0
+	_graphviz_str_cache = None
+
+	def __setattr__(self, key, value):
+		object.__setattr__(self, key, value)
+		if key not in _UNVERSIONED_ATTRIBUTES:
+			object.__setattr__(self, '_version', self._version + 1)
+
 	def __init__(
 			self, colour=DEFAULT_COLOUR, fill_colour=None, border_colour=None, opacity=None,
 			font=DEFAULT_FONT, text_colour=None, text_size=DEFAULT_TEXT_SIZE,
@@ -166,23 +176,32 @@ class NodeStyle:
 			'_colour': self._colour,
 			'_fill_colour': self._fill_colour,
 			'_border_colour': self._border_colour,
+			'_opacity': self._opacity,
 			'_font': self._font,
 			'_text_colour': self._text_colour,
 			'_text_size': self._text_size,
 			'_shape': self._shape,
-			'_shape_style': self._shape_style
+			'_shape_style': self._shape_style,
+			'_lighter_fill': self._lighter_fill,
+			'_fill_colour_based_on_main_colour': self._fill_colour_based_on_main_colour,
+			'_border_colour_based_on_main_colour': self._border_colour_based_on_main_colour,
+			'_text_colour_based_on_main_colour': self._text_colour_based_on_main_colour
 		}
 
 	def __setstate__(self, state):
 		self._colour = state['_colour']
 		self._fill_colour = state['_fill_colour']
 		self._border_colour = state['_border_colour']
-		self._opacity = state['_opacity']
+		self._opacity = state.get('_opacity')
 		self._font = state['_font']
 		self._text_colour = state['_text_colour']
 		self._text_size = state['_text_size']
 		self._shape = state['_shape']
 		self._shape_style = state['_shape_style']
+		self._lighter_fill = state.get('_lighter_fill', True)
+		self._fill_colour_based_on_main_colour = state.get('_fill_colour_based_on_main_colour', False)
+		self._border_colour_based_on_main_colour = state.get('_border_colour_based_on_main_colour', False)
+		self._text_colour_based_on_main_colour = state.get('_text_colour_based_on_main_colour', False)
 
 	@property
 	def _graphviz_dictionary(self):
@@ -201,6 +220,10 @@ class NodeStyle:
 		"""
 		:rtype: str
 		"""
+		cache = self._graphviz_str_cache
+		if cache is not None and cache[0] == self._version:
+			return cache[1]
+
 		key_values = []
 		for key, value in self._graphviz_dictionary.items():
 			if isinstance(value, Colour):
@@ -215,4 +238,6 @@ class NodeStyle:
 			if value is not None:
 				key_values.append((key, value))
 
-		return ' '.join([f'"{key}"="{value}"' for key, value in key_values])
+		result = ' '.join([f'"{key}"="{value}"' for key, value in key_values])
+		self._graphviz_str_cache = (self._version, result)
+		return result
@@ -15,24 +15,29 @@ def get_diverging_number(i, n, reverse):
 	return sorted(generate_diverging_numbers(n), reverse=reverse)[i]
 
 
-def inherit_style(node, pale_ratio, divergence_ratio, main_style):
+def inherit_style(node, pale_ratio, divergence_ratio, main_style, graph=None):
 	"""
 	:type node: Node
+	:param graph: the graph (or subgraph view) whose edges are considered, by default the node's graph
 	:rtype: NodeStyle
 	"""
-	if is_root_or_parents_are_in_loop(node):
+	graph = graph or node.graph
+	parents = graph.get_parents(node=node)
+	if is_root_or_parents_are_in_loop(node, graph=graph):
 		if main_style is None:
 			return node.style.copy()
 		else:
 			return main_style.copy()
 	else:
-		if len(node.parents) == 1:
-			parent = node.parents[0]
-			num_siblings = len(parent.children)
-			rank = node.get_child_rank(parent=parent)
+		if len(parents) == 1:
+			parent = parents[0]
+			siblings = graph.get_children(node=parent)
+			num_siblings = len(siblings)
+			rank = sorted(siblings).index(node)
 			if main_style is None:
 				style = inherit_style(
-					node=parent, pale_ratio=pale_ratio, divergence_ratio=divergence_ratio, main_style=main_style
+					node=parent, pale_ratio=pale_ratio, divergence_ratio=divergence_ratio, main_style=main_style,
+					graph=graph
 				)
 			else:
 				style = main_style
@@ -50,9 +55,9 @@ def inherit_style(node, pale_ratio, divergence_ratio, main_style):
 			return new_style
 		else:
 			styles = [
-				inherit_style(node=parent, pale_ratio=pale_ratio, divergence_ratio=0, main_style=main_style)
-				for parent in node.parents
-				if not node.is_in_loop_with(parent)
+				inherit_style(node=parent, pale_ratio=pale_ratio, divergence_ratio=0, main_style=main_style, graph=graph)
+				for parent in parents
+				if not graph.are_nodes_in_same_loop(node1=node, node2=parent)
 			]
 			colours = [style.colour for style in styles]
 			if main_style is None:
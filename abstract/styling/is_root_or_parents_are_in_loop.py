@@ -1,7 +1,9 @@
-def is_root_or_parents_are_in_loop(node):
+def is_root_or_parents_are_in_loop(node, graph=None):
 	"""
 	:type node: Node
+	:param graph: the graph (or subgraph view) whose edges are considered, by default the node's graph
 	:rtype: bool
 	"""
-	parents = [parent for parent in node.parents if not parent.is_in_loop()]
-	return len(parents) == 0
\ No newline at end of file
+	graph = graph or node.graph
+	parents = [parent for parent in graph.get_parents(node=node) if not graph.is_node_in_loop(node=parent)]
+	return len(parents) == 0
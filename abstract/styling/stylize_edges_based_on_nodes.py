@@ -2,7 +2,7 @@ from .EdgeStyle import EdgeStyle
 
 
 def stylize_edges_based_on_nodes(graph, edge_style=None, edge_darkness_ratio=0.1):
-	for edge in graph.edges:
+	for edge in graph.edges_dict.values():
 		if edge.style is None:
 			colour = edge.start.style.colour.darken(ratio=edge_darkness_ratio)
 
@@ -19,7 +19,7 @@ def stylize_with_pensieve(
 	# roots or semi-roots
 	for node in graph.nodes:
 		if node.style is None:
-			if is_root_or_parents_are_in_loop(node):
+			if is_root_or_parents_are_in_loop(node, graph=graph):
 				colour = get_least_used_colour(colours_used)
 				if node_style is None:
 					style = NodeStyle(colour=colour)
@@ -31,11 +31,20 @@ def stylize_with_pensieve(
 
 	# branch nodes
 	for node in graph.nodes:
-		if not is_root_or_parents_are_in_loop(node) and not node.is_in_loop():
+		if not is_root_or_parents_are_in_loop(node, graph=graph) and not graph.is_node_in_loop(node=node):
 			if node.style is None:
 				node.style = inherit_style(
-					node=node, pale_ratio=pale_ratio, divergence_ratio=divergence_ratio, main_style=node_style
+					node=node, pale_ratio=pale_ratio, divergence_ratio=divergence_ratio, main_style=node_style,
+					graph=graph
 				)
 
+	# nodes in loops that also have parents outside their loop
+	for node in graph.nodes:
+		if node.style is None:
+			node.style = inherit_style(
+				node=node, pale_ratio=pale_ratio, divergence_ratio=divergence_ratio, main_style=node_style,
+				graph=graph
+			)
+
 	# branch edges
 	stylize_edges_based_on_nodes(graph=graph, edge_style=edge_style, edge_darkness_ratio=edge_darkness_ratio)
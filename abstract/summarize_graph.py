@@ -0,0 +1,199 @@
+from collections import deque
+from typing import Hashable, Iterable, List, Optional, Union
+from .Node import Node
+from .SubgraphView import SubgraphView
+
+# the unit that hidden roots hang from, it has no node of its own
+_TOP = -1
+
+
+def _get_new_name(name: str, names) -> str:
+	while name in names:
+		name += '_'
+	return name
+
+
+def _get_tooltip(names: List[Hashable], max_names: int = 20) -> str:
+	tooltip = ', '.join(str(name) for name in names[:max_names])
+	if len(names) > max_names:
+		tooltip += f', ... ({len(names) - max_names} more)'
+	return tooltip
+
+
+def summarize_graph(
+		graph: 'GraphWithoutDisplay', max_nodes: int = 100, expand: Optional[Iterable[Union[str, Node]]] = None
+) -> 'GraphWithoutDisplay':
+	"""
+	Builds a smaller graph for display: every loop (strongly connected component) becomes one node, the rest is
+	walked breadth first from the roots, and what does not fit in max_nodes is collapsed into one node per visible
+	ancestor, labelled with the number of nodes it stands for. Nodes keep their styles, if they have any, and
+	collapsed nodes take the style of a node they stand for; the graph is not stylized.
+
+	Args:
+		graph (GraphWithoutDisplay): The graph or subgraph view.
+		max_nodes (int): The number of nodes of the summary, exceeded only to show the expanded nodes.
+		expand (Optional[Iterable[Union[str, Node]]]): Nodes shown with their children whatever the budget, with the
+			nodes that lead to them; a loop with an expanded node is not collapsed.
+
+	Returns:
+		GraphWithoutDisplay: A new graph of the same class and settings.
+	"""
+	if max_nodes < 1:
+		raise ValueError('max_nodes should be at least 1')
+	nodes_dict = graph.nodes_dict
+	components = graph.strongly_connected_components
+	expanded = {graph.get_node_name(node) for node in expand or []}
+
+	# units are what the summary shows as one node: a collapsed loop or any other node
+	unit_of = {}
+	unit_members = []
+	for name in nodes_dict:
+		if name in unit_of:
+			continue
+		component = components.get_component(name)
+		if len(component) > 1 and expanded.isdisjoint(component):
+			component = set(component)
+			members = [member for member in nodes_dict if member in component]
+		else:
+			members = [name]
+		for member in members:
+			unit_of[member] = len(unit_members)
+		unit_members.append(members)
+
+	def get_child_units(unit):
+		child_units = {}
+		for member in unit_members[unit]:
+			for child in graph._iterate_children(nodes_dict[member]):
+				child_unit = unit_of[child._raw_id]
+				if child_unit != unit:
+					child_units[child_unit] = None
+		return child_units
+
+	# breadth first spanning tree of the units, every unit is a descendant of the unit of a root
+	parent_of = {}
+	tree_children = {_TOP: []}
+	order = []
+	queue = deque()
+	for root in graph.roots:
+		unit = unit_of[root._raw_id]
+		if unit not in parent_of:
+			parent_of[unit] = _TOP
+			tree_children[_TOP].append(unit)
+			queue.append(unit)
+	while queue:
+		unit = queue.popleft()
+		order.append(unit)
+		tree_children[unit] = []
+		for child_unit in get_child_units(unit):
+			if child_unit not in parent_of:
+				parent_of[child_unit] = unit
+				tree_children[unit].append(child_unit)
+				queue.append(child_unit)
+	position = {unit: index for index, unit in enumerate(order)}
+
+	# the expanded units, their children and the units that lead to them are shown first
+	forced = set()
+	for name in expanded:
+		unit = unit_of[name]
+		for forced_unit in [unit, *get_child_units(unit)]:
+			while forced_unit != _TOP and forced_unit not in forced:
+				forced.add(forced_unit)
+				forced_unit = parent_of[forced_unit]
+
+	# then units are shown breadth first while they fit with one collapsed node per visible unit with hidden children
+	visible = {_TOP}
+	num_hidden_children = {_TOP: len(tree_children[_TOP])}
+	num_collapsed = 1 if tree_children[_TOP] else 0
+
+	def get_collapsed_change(unit):
+		parent = parent_of[unit]
+		change = 1 if tree_children[unit] else 0
+		if num_hidden_children[parent] == 1:
+			change -= 1
+		return change
+
+	def show(unit):
+		nonlocal num_collapsed
+		num_collapsed += get_collapsed_change(unit)
+		num_hidden_children[parent_of[unit]] -= 1
+		num_hidden_children[unit] = len(tree_children[unit])
+		visible.add(unit)
+
+	for unit in sorted(forced, key=position.__getitem__):
+		show(unit)
+	for unit in order:
+		if unit in visible:
+			continue
+		if len(visible) + get_collapsed_change(unit) + num_collapsed > max_nodes:
+			break
+		show(unit)
+
+	# a hidden unit is shown as the collapsed node of its closest visible ancestor
+	owner_of = {}
+	hidden_of = {}
+	for unit in order:
+		if unit not in visible:
+			parent = parent_of[unit]
+			owner = parent if parent in visible else owner_of[parent]
+			owner_of[unit] = owner
+			hidden_of.setdefault(owner, []).append(unit)
+
+	# visible nodes that are not collapsed loops are copied with their edges
+	kept_nodes = [
+		node for name, node in nodes_dict.items() if unit_of[name] in visible and len(unit_members[unit_of[name]]) == 1
+	]
+	kept_units = {unit_of[node._raw_id] for node in kept_nodes}
+	kept_edges = [
+		edge for edge in graph.edges_dict.values()
+		if unit_of[edge._start._raw_id] in kept_units and unit_of[edge._end._raw_id] in kept_units
+	]
+	# like materialize(), views are copied into a graph of the underlying graph's class
+	copied_graph = graph.graph if isinstance(graph, SubgraphView) else graph
+	summary = copied_graph._build_copy(nodes=kept_nodes, edges=kept_edges)
+
+	names = set(nodes_dict)
+	display_name_of = {unit: unit_members[unit][0] for unit in kept_units}
+	with summary.bulk_load():
+		for unit in order:
+			if unit in visible and unit not in kept_units:
+				members = unit_members[unit]
+				first = nodes_dict[members[0]]
+				name = _get_new_name(f'{members[0]}_loop', names)
+				names.add(name)
+				summary.add_node(
+					name=name, label=f'{len(members)} nodes in a loop', tooltip=_get_tooltip(members),
+					style=None if first.style is None else first.style.copy()
+				)
+				display_name_of[unit] = name
+
+		for owner in [_TOP, *order]:
+			if owner not in hidden_of:
+				continue
+			hidden_units = hidden_of[owner]
+			hidden_names = [name for unit in hidden_units for name in unit_members[unit]]
+			first = nodes_dict[hidden_names[0]]
+			owner_name = 'roots' if owner == _TOP else display_name_of[owner]
+			name = _get_new_name(f'{owner_name}_more', names)
+			names.add(name)
+			summary.add_node(
+				name=name, label=f'{len(hidden_names)} more nodes', tooltip=_get_tooltip(hidden_names),
+				style=None if first.style is None else first.style.copy()
+			)
+			for unit in hidden_units:
+				display_name_of[unit] = name
+
+		# edges that lead into, out of or between collapsed nodes become one edge per pair of summary nodes
+		collapsed_edges = {}
+		for edge in graph.edges_dict.values():
+			start_unit = unit_of[edge._start._raw_id]
+			end_unit = unit_of[edge._end._raw_id]
+			if start_unit in kept_units and end_unit in kept_units:
+				continue
+			start = display_name_of[start_unit]
+			end = display_name_of[end_unit]
+			if start != end:
+				collapsed_edges[(start, end)] = None
+		for start, end in collapsed_edges:
+			summary.connect(start, end, if_edge_exists='ignore')
+
+	return summary
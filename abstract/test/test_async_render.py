@@ -0,0 +1,73 @@
+import asyncio
+import os
+import stat
+import subprocess
+import pytest
+from graphviz import Source
+from abstract.Graph import Graph
+from abstract.RenderCache import RenderCache
+from abstract.run_graphviz import arun_graphviz
+
+
+def _make_engine(tmp_path, name, script):
+    engine = tmp_path / name
+    engine.write_text('#!/bin/sh\n' + script)
+    engine.chmod(engine.stat().st_mode | stat.S_IEXEC)
+    return str(engine)
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='the stand-in layout engines are shell scripts')
+def test_arun_graphviz(tmp_path):
+    """Test that layouts run concurrently up to the limit and that timed out or cancelled layouts are killed."""
+    echo = _make_engine(tmp_path, 'echo_dot', 'cat\n')
+    slow = _make_engine(tmp_path, 'slow_dot', f'echo $$ > "{tmp_path}/pid_$1"\nexec sleep 30\n')
+
+    async def run_echo():
+        semaphore = asyncio.Semaphore(2)
+        sources = [f'digraph {{ n{index} }}' for index in range(5)]
+        outputs = await asyncio.gather(*(arun_graphviz(source, engine=echo, semaphore=semaphore) for source in sources))
+        assert outputs == [source.encode() for source in sources]
+
+    async def run_slow():
+        with pytest.raises(subprocess.TimeoutExpired):
+            await arun_graphviz('digraph {}', engine=slow, format='timeout', timeout=0.5)
+
+        task = asyncio.ensure_future(arun_graphviz('digraph {}', engine=slow, format='cancel'))
+        while not (tmp_path / 'pid_-Tcancel').exists():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run_echo())
+    asyncio.run(run_slow())
+    for name in ('pid_-Ttimeout', 'pid_-Tcancel'):
+        assert not _is_running(int((tmp_path / name).read_text()))
+
+    with pytest.raises(Exception, match='no_such_layout_engine'):
+        asyncio.run(arun_graphviz('digraph {}', engine='no_such_layout_engine'))
+
+
+def test_aget_svg():
+    """Test that the async methods build the same sources as the blocking ones and use the render cache."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    graph.connect('a', 'b')
+    view = graph.subgraph(['b'], direction='to')
+
+    source = asyncio.run(graph.arender())
+    assert isinstance(source, Source) and source.source == graph.render().source
+    assert asyncio.run(view.aget_graphviz_source()).source == view.get_graphviz_source().source
+
+    graph.render_cache = RenderCache()
+    key = RenderCache.make_key(graph.get_graphviz_str(dpi=None))
+    graph.render_cache.put(key, b'<svg/>')
+    assert asyncio.run(graph.aget_svg()) == '<svg/>'
@@ -54,3 +54,15 @@ def test_remove_edge(edge):
     assert start_node.outward_edges_dict == {}
     assert end_node.inward_edges_dict == {}
 
+
+
+def test_edge_hash_and_equality(edge):
+    """Test that edges hash by their id and can be used in sets and dictionaries."""
+    graph = edge.graph
+    other = Edge(graph=graph, start=edge.start, end=edge.end, id='edge2')
+    assert edge == edge
+    assert edge != other
+    assert hash(edge) == hash(('StartNode', 'EndNode', 'edge1'))
+    assert {edge: 1, other: 2}[graph.edges_dict[('StartNode', 'EndNode', 'edge2')]] == 2
+    assert edge.fingerprint() == edge.fingerprint()
+    assert edge.fingerprint() != other.fingerprint()
@@ -1,3 +1,7 @@
+import gc
+import gzip
+import io
+import shutil
 import pytest
 from abstract.Graph import Graph  # Assuming you have a Graph class
 from abstract.Node import Node  # Assuming you have a Node class
@@ -79,3 +83,432 @@ def test_complex_graph():
     assert england.co_parents == [france]
     assert france.co_parents == [england]
 
+
+def test_ancestors_and_descendants_by_distance():
+    """Test that branches meeting again do not overwrite each other's distance layers."""
+    graph = Graph()
+    for name in ['a', 'b', 'c', 'd', 'e']:
+        graph.add_node(name)
+    for start, end in [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'e'), ('d', 'e')]:
+        graph.connect(start, end)
+
+    a, b, c, d, e = [graph.get_node(name) for name in ['a', 'b', 'c', 'd', 'e']]
+    assert graph.get_descendants(node='a') == {1: [b, c], 2: [d, e]}
+    assert graph.get_ancestors(node='e') == {1: [c, d], 2: [a, b]}
+    assert a.descendants == [b, d, e, c]
+    assert a.num_descendants == 4
+
+
+def test_long_chain_traversal():
+    """Test that traversing a chain longer than the recursion limit works."""
+    graph = Graph()
+    length = 5000
+    for index in range(length):
+        graph.add_node(str(index))
+    for index in range(length - 1):
+        graph.connect(str(index), str(index + 1))
+
+    assert graph.get_node('0').num_descendants == length - 1
+    assert len(graph.get_node(str(length - 1)).ancestors) == length - 1
+    assert max(graph.get_descendants(node='0').keys()) == length - 1
+
+    copied = graph.copy()
+    assert len(copied.get_node(str(length - 1)).ancestors) == length - 1
+    assert copied.get_node('0') is not graph.get_node('0')
+
+
+def test_copy():
+    """Test that copy rebuilds the structure and copies values as requested."""
+    graph = Graph()
+    graph.add_node('a', value=['x'])
+    graph.add_node('b', value=['y'])
+    graph.connect('a', 'b', value=2)
+    graph.connect('b', 'a', id=2)
+    graph.stylize()
+
+    copied = graph.copy()
+    assert isinstance(copied, Graph)
+    assert [edge.id for edge in copied.edges] == [edge.id for edge in graph.edges]
+    assert copied.loop_nodes == [copied.get_node('a'), copied.get_node('b')]
+    assert copied.get_node('a').value == ['x']
+    assert copied.get_node('a').value is not graph.get_node('a').value
+    # styles are mutable, so the copy gets its own unless they are shared on purpose
+    assert copied.get_node('a').style is not graph.get_node('a').style
+    colour = graph.get_node('a').style.colour.hexadecimal
+    copied.get_node('a').style.colour = '#ff0000'
+    assert graph.get_node('a').style.colour.hexadecimal == colour
+    copied.get_node('a').style.complement({'shape': 'circle'})
+    assert '"shape"="circle"' not in graph.get_node('a').get_graphviz_str()
+    copied.add_node('c')
+    copied.connect('b', 'c')
+    assert 'c' not in graph
+
+    assert graph.copy(values='share').get_node('b').value is graph.get_node('b').value
+    assert graph.copy(styles='share').get_node('b').style is graph.get_node('b').style
+    with pytest.raises(ValueError):
+        graph.copy(values='none')
+
+
+def test_loops():
+    """Test loop detection and that it follows changes to the graph."""
+    graph = Graph()
+    for letter in 'abcdef':
+        graph.add_node(letter)
+    edges = {}
+    for start, end in [('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'), ('d', 'e'), ('e', 'f'), ('f', 'e')]:
+        edges[(start, end)] = graph.connect(start, end)
+
+    assert [node.name for node in graph.loop_nodes] == ['a', 'b', 'c', 'e', 'f']
+    assert graph.get_node('b').is_in_loop_with('a')
+    assert not graph.get_node('e').is_in_loop_with('a')
+    assert not graph.get_node('d').is_in_loop()
+    assert edges[('e', 'f')].is_in_loop()
+    assert not edges[('c', 'd')].is_in_loop()
+
+    graph.disconnect(edges[('c', 'a')])
+    assert [node.name for node in graph.loop_nodes] == ['e', 'f']
+
+    graph.connect('d', 'd')
+    assert graph.get_node('d').is_in_loop()
+
+    graph.remove_node('f')
+    assert [node.name for node in graph.loop_nodes] == ['d']
+
+
+def test_roots_and_leaves():
+    """Test roots of graphs with loops and the incrementally maintained absolute roots and leaves."""
+    graph = Graph()
+    for letter in 'abcdef':
+        graph.add_node(letter)
+    for start, end in [('a', 'b'), ('b', 'a'), ('b', 'c'), ('d', 'e'), ('e', 'f'), ('f', 'e')]:
+        graph.connect(start, end)
+
+    # a and b form a loop that nothing points to, so one of them represents it
+    assert [node.name for node in graph.roots] == ['a', 'd']
+    assert [node.name for node in graph.absolute_roots] == ['d']
+    assert [node.name for node in graph.leaves] == ['c']
+
+    edge = graph.connect('c', 'd')
+    assert [node.name for node in graph.roots] == ['a']
+    assert graph.absolute_roots == []
+    assert graph.leaves == []
+
+    graph.disconnect(edge)
+    assert [node.name for node in graph.absolute_roots] == ['d']
+    assert [node.name for node in graph.leaves] == ['c']
+
+
+def test_edges_registry():
+    """Test that the graph's edge index follows edges being created and removed."""
+    graph = Graph()
+    for letter in 'abc':
+        graph.add_node(letter)
+    ab = graph.connect('a', 'b')
+    bc = graph.connect('b', 'c')
+    cc = graph.connect('c', 'c')
+
+    assert graph.edges == [ab, bc, cc]
+    assert graph.edges_dict == {('a', 'b', None): ab, ('b', 'c', None): bc, ('c', 'c', None): cc}
+    assert graph.get_node('c').edges == [cc, bc]
+
+    # the index is read-only
+    with pytest.raises(TypeError):
+        graph.edges_dict[('a', 'c', None)] = ab
+    with pytest.raises(AttributeError):
+        graph.edges_dict.pop(('a', 'b', None))
+
+    graph.disconnect(ab)
+    assert graph.edges == [bc, cc]
+
+    cc.remove_self()
+    graph.remove_node('b')
+    assert graph.edges == []
+    assert graph.edges_dict == {}
+
+    # edges can be disconnected while iterating over a list of them
+    graph.add_node('b')
+    graph.connect('a', 'b')
+    graph.connect('b', 'c')
+    for edge in list(graph.edges_dict.values()):
+        graph.disconnect(edge)
+    assert graph.edges_dict == {} and graph.get_node('b').edges == []
+
+
+def test_bulk_load():
+    """Test adding nodes and edges in bulk."""
+    graph = Graph()
+    with pytest.warns(UserWarning, match='1 more warnings during bulk load'):
+        with graph.bulk_load():
+            nodes = graph.add_nodes_from(['a', 'b', ('c', {'label': 'C'}), 'a'])
+            edges = graph.connect_many([('a', 'b'), ('b', 'c', {'id': 1, 'value': 2}), ('a', 'b')])
+            assert graph.is_bulk_loading
+
+    assert not graph.is_bulk_loading
+    assert [node.name for node in nodes] == ['a', 'b', 'c', 'a']
+    assert graph.get_node('c').label == 'C'
+    assert edges[0] is edges[2]
+    assert edges[1].id == ('b', 'c', 1)
+    assert edges[1].value == 2
+    assert graph.absolute_roots == [graph.get_node('a')]
+    assert graph.leaves == [graph.get_node('c')]
+    assert graph.roots == [graph.get_node('a')]
+
+    # later blocks update the indices for the nodes they change, including nodes they remove
+    with graph.bulk_load():
+        graph.add_node('d')
+        graph.connect('c', 'd')
+        graph.remove_node('b')
+    assert [node.name for node in graph.absolute_roots] == ['a', 'c']
+    assert sorted(node.name for node in graph.leaves) == ['a', 'd']
+
+    # the edges changed in a block are validated, unless an exception is propagating
+    with pytest.raises(ValueError):
+        with graph.bulk_load():
+            graph.add_node('e')
+            graph.connect('d', 'e')
+            graph.get_node('d')._outward_edges_dict.clear()
+    with pytest.raises(KeyError):
+        with graph.bulk_load():
+            graph.add_node('f')
+            graph.connect('e', 'f')
+            graph.get_node('e')._outward_edges_dict.clear()
+            raise KeyError('failed')
+    assert not graph.is_bulk_loading
+
+    # the garbage collector of the process is only paused when asked
+    with graph.bulk_load():
+        assert gc.isenabled()
+    with graph.bulk_load(pause_garbage_collection=True):
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+
+def test_from_lists():
+    """Test creating a graph from lists of start and end nodes."""
+    graph = Graph.from_lists(start=['a', 'b', 'a'], end=['b', 'c', 'c'], edge=['ab', 'bc', None])
+    assert [node.name for node in graph.nodes] == ['a', 'b', 'c']
+    assert [edge.id for edge in graph.edges] == [('a', 'b', 0), ('b', 'c', 1), ('a', 'c', 2)]
+    assert graph.get_node('c').parents == [graph.get_node('b'), graph.get_node('a')]
+
+
+def test_from_edge_file(tmp_path):
+    """Test reading edges from csv and gzipped tsv files a chunk at a time."""
+    csv_path = tmp_path / 'edges.csv'
+    csv_path.write_text('kind,from,to\nab,a,b\nbc,b,c\n,a,c\nab,a,b\n')
+    graph = Graph.from_edge_file(str(csv_path), start_col='from', end_col='to', label_col='kind', chunk_size=3)
+    assert [node.name for node in graph.nodes] == ['a', 'b', 'c']
+    assert [edge.id for edge in graph.edges] == [('a', 'b', 0), ('b', 'c', 1), ('a', 'c', 2), ('a', 'b', 3)]
+    assert graph.edges_dict[('b', 'c', 1)].label == 'bc'
+
+    tsv_path = tmp_path / 'edges.tsv.gz'
+    with gzip.open(tsv_path, 'wt') as file:
+        file.write('x\ty\t1\ny\tz\t2\n')
+    graph = Graph.from_edge_file(str(tsv_path), start_col=0, end_col=1, id_col=2, header=False, chunk_size=1)
+    assert [edge.id for edge in graph.edges] == [('x', 'y', '1'), ('y', 'z', '2')]
+
+    with pytest.raises(KeyError):
+        Graph.from_edge_file(str(csv_path), start_col='source', end_col='to')
+
+
+def test_from_indented_file(tmp_path):
+    """Test reading indented outlines, with tabs, spaces or a mix of both, from files."""
+    path = tmp_path / 'outline.txt'
+    path.write_text('a\n\tb\n\t\tc\n\n\td  e\nf\n')
+    graph = Graph.from_indented_file(str(path))
+    assert graph.get_node('root').label == 'outline.txt'
+    assert [node.value for node in graph.get_node('root').children] == ['a', 'f']
+    assert [node.label for node in graph.get_node('0').children] == ['b', 'd  e']
+    assert graph.get_node('2').parents == [graph.get_node('1')]
+    assert '3' not in graph.nodes_dict
+
+    gzipped_path = tmp_path / 'outline.gz'
+    with gzip.open(gzipped_path, 'wt') as file:
+        file.write('a\n  b\n    c\n  d\n')
+    graph = Graph.from_indented_file(str(gzipped_path), root='outline')
+    assert [node.label for node in graph.get_node('0').children] == ['b', 'd']
+    assert graph.get_node('2').parents == [graph.get_node('1')]
+
+    # four spaces count as one tab
+    graph = Graph.from_indented_lines(['a', '\tb', '        c'], chunk_size=1)
+    assert graph.get_node('2').parents == [graph.get_node('1')]
+
+    with pytest.raises(ValueError):
+        Graph.from_indented_lines(['a', '\tb', '\t\t\tc'])
+    with pytest.raises(ValueError):
+        Graph.from_indented_lines(['a', '  b', '   c'])
+
+
+def test_write_indented(tmp_path):
+    """Test that outlines written by write_indented are read back the same and that loops end."""
+    lines = ['a', '\tb', '\t\tc', '\td', 'e']
+    graph = Graph.from_indented_text(root='outline', lines=lines)
+    path = tmp_path / 'outline.txt.gz'
+    assert graph.write_indented(str(path), root='root') == 5
+    assert Graph.from_indented_file(str(path)).get_tree_str() == graph.get_tree_str().replace('outline', 'outline.txt.gz')
+
+    graph = Graph()
+    graph.add_nodes_from(['x', 'y', 'z'])
+    graph.connect('x', 'y')
+    graph.connect('y', 'z')
+    graph.connect('z', 'y')
+    file = io.StringIO()
+    assert graph.write_indented(file, indent='  ') == 4
+    assert file.getvalue() == 'x\n  y\n    z\n      y\n'
+
+
+def test_iter_tree_lines():
+    """Test the tree representation of a graph with a loop and its depth and children limits."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b', 'c', 'd', 'e'])
+    for child in ['b', 'c', 'd']:
+        graph.connect('a', child)
+    graph.connect('b', 'e')
+    graph.connect('e', 'b')
+    assert graph.get_tree_str() == 'a\n├ b\n│ └ e\n│   └ b*\n├ c\n└ d\n'
+    assert list(graph.iter_tree_lines(max_children=2)) == ['a', '├ b', '│ └ e', '│   └ b*', '├ c', '└ ... 1 more']
+    assert graph.get_tree_str(max_depth=1) == 'a\n├ b\n├ c\n└ d\n'
+    assert list(graph.get_node('b').iter_tree_lines()) == ['b', '└ e', '  └ b*']
+    assert graph.get_node('b').get_tree_str(indentation='  ') == 'b\n  └ e\n    └ b*\n'
+
+    # a long chain does not reach the recursion limit
+    chain = Graph.from_indented_lines(['\t' * depth + 'x' for depth in range(5000)])
+    assert len(chain.get_tree_str().splitlines()) == 5001
+
+
+def test_write_graphviz(tmp_path):
+    """Test that the streamed Graphviz representation is the same as get_graphviz_str and that views stream theirs."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b', 'c'])
+    graph.connect('a', 'b')
+    graph.connect('b', 'c', label='bc')
+    graph.stylize()
+    file = io.StringIO()
+    graph.write_graphviz(file, direction='TB', height=2)
+    assert file.getvalue() == graph.get_graphviz_str(direction='TB', height=2)
+
+    path = tmp_path / 'graph.gv.gz'
+    graph.write_graphviz(str(path))
+    with gzip.open(path, 'rt') as f:
+        assert f.read() == graph.get_graphviz_str()
+
+    view_str = ''.join(graph.subgraph(['b'], direction='to').iter_graphviz_parts())
+    assert '"a" -> "b"' in view_str and '"c"' not in view_str
+    assert Graph().get_graphviz_str().endswith('\t{\n\t\t\n\t}\n\t\n}')
+
+
+@pytest.mark.skipif(shutil.which('dot') is None, reason='needs the Graphviz dot executable')
+def test_render_to_path(tmp_path):
+    """Test that rendering to a path streams the source next to the output and renders in its format."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    graph.connect('a', 'b')
+    source = graph.render(path=str(tmp_path / 'graph.svg'), view=False)
+    assert source.source == graph.render().source
+    assert (tmp_path / 'graph.svg').read_text().lstrip().startswith('<')
+    assert (tmp_path / 'graph').read_text() == graph.get_graphviz_str(dpi=300)
+
+
+def test_graphviz_str_cache():
+    """Test that the cached Graphviz strings of nodes and edges change with their label, value, tooltip and style."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    edge = graph.connect('a', 'b')
+    graph.stylize()
+    node = graph.get_node('a')
+    first = node.get_graphviz_str()
+    assert node.get_graphviz_str() is first
+
+    node.label = 'A'
+    assert 'label="A"' in node.get_graphviz_str()
+    node.style.complement({'shape': 'circle'})
+    assert '"shape"="circle"' in node.get_graphviz_str()
+    node._tooltip = 'tip'
+    assert 'tooltip="tip"' in node.get_graphviz_str()
+
+    edge.value = 3
+    assert 'label="3"' in edge.get_graphviz_str()
+    edge.label = 'ab'
+    assert 'label="ab"' in edge.get_graphviz_str()
+    graph._edge_label_converter = str.upper
+    assert 'label="AB"' in edge.get_graphviz_str()
+
+    # values and labels that can change in place are not cached
+    edge.label = None
+    edge.value = [1]
+    assert 'label="[1]"' in edge.get_graphviz_str()
+    edge.value.append(2)
+    assert 'label="[1, 2]"' in edge.get_graphviz_str()
+    node.label = ['A']
+    node.get_graphviz_str()
+    node._label.append('B')
+    assert "label=\"['A', 'B']\"" in node.get_graphviz_str()
+
+    # restyling an unchanged graph keeps the styles and so the cached strings
+    graph._node_style_overwrites['b'] = {'shape': 'box'}
+    graph.stylize()
+    style = graph.get_node('b').style
+    graph.stylize()
+    assert graph.get_node('b').style is style
+
+
+def test_stylize_loop_with_outside_parent():
+    """Test that the pensieve stylist styles the nodes of a loop that is entered from outside the loop."""
+    graph = Graph()
+    graph.add_nodes_from(['r', 'a', 'b'])
+    graph.connect('r', 'a')
+    graph.connect('a', 'b')
+    graph.connect('b', 'a')
+    graph.stylize()
+    assert all(node.style is not None for node in graph.nodes)
+    assert all(edge.style is not None for edge in graph.edges)
+    assert '"a" -> "b"' in graph.get_graphviz_str()
+
+
+def test_from_arrays():
+    """Test creating a graph from numpy arrays."""
+    np = pytest.importorskip('numpy')
+    graph = Graph.from_arrays(
+        start=np.array([3, 1, 3]), end=np.array([1, 2, 2]), values=np.array([0.5, 1.5, 2.5])
+    )
+    assert [node.name for node in graph.nodes] == [3, 1, 2]
+    assert [edge.id for edge in graph.edges] == [(3, 1, 0), (1, 2, 1), (3, 2, 2)]
+    assert [edge.value for edge in graph.edges] == [0.5, 1.5, 2.5]
+    assert graph.get_node(2).parents == [graph.get_node(1), graph.get_node(3)]
+
+    graph = Graph.from_arrays(start=np.array(['a', 'b']), end=np.array(['b', 'a']), edge_ids=np.array([7, 8]))
+    assert [edge.id for edge in graph.edges] == [('a', 'b', 7), ('b', 'a', 8)]
+    assert isinstance(graph.nodes[0].name, str)
+    assert graph.get_node('a').is_in_loop()
+
+
+def test_graph_records_and_ndjson(tmp_path):
+    """Test that graphs go through records, __graph__() and NDJSON files and come back the same."""
+    graph = Graph(direction='TB')
+    for name in ['a', 'b', 'c']:
+        graph.add_node(name, value=name.upper())
+    graph.get_node('a').label = 'first'
+    graph.connect('a', 'b', label='ab')
+    graph.connect('b', 'c', id=2, value=3)
+    graph.connect('c', 'a')
+
+    records = list(graph.iter_graph_records())
+    assert [record['type'] for record in records] == ['graph', 'node', 'node', 'node', 'edge', 'edge', 'edge']
+    assert records[4] == {'type': 'edge', 'start': 'a', 'end': 'b', 'id': None, 'label': 'ab', 'value': None, 'style': None}
+
+    assert graph.to_ndjson(str(tmp_path / 'graph.ndjson')) == 7
+    assert graph.to_ndjson(str(tmp_path / 'graph.ndjson.gz')) == 7
+    for copied in [
+        Graph(obj=graph),
+        Graph().append_stream(iter(records)),
+        Graph.from_ndjson(str(tmp_path / 'graph.ndjson')),
+        Graph.from_ndjson(str(tmp_path / 'graph.ndjson.gz'))
+    ]:
+        assert [edge.id for edge in copied.edges] == [('a', 'b', None), ('b', 'c', 2), ('c', 'a', None)]
+        assert [node.value for node in copied.nodes] == ['A', 'B', 'C']
+        assert copied.get_node('a').label == 'first'
+        assert copied.edges_dict[('a', 'b', None)].label == 'ab'
+        assert copied._direction == 'TB'
+        assert copied._label == graph._label
+
+    with pytest.raises(ValueError):
+        Graph().append_stream([{'type': 'hyperedge'}])
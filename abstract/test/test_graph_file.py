@@ -0,0 +1,70 @@
+import io
+import pytest
+from abstract.Graph import Graph
+from abstract._BasicGraph import BasicGraph
+from abstract.graph_file import FORMAT_VERSION
+
+
+def test_save_and_load(tmp_path):
+    """Test that a graph comes back with its class, settings, nodes, edges, values and styles."""
+    graph = Graph(direction='TB')
+    graph.add_node('a', value={'x': [1, 2]}, label='A', tooltip='first')
+    graph.add_node('b', value=2.5)
+    graph.add_node(3)
+    graph.connect('a', 'b', value=2)
+    graph.connect('b', 3, id=1, label='one')
+    graph.connect(3, 'a')
+    graph.connect('a', 'b', id='again')
+    graph.stylize()
+
+    path = str(tmp_path / 'graph.abs')
+    graph.save(path)
+    loaded = Graph.load(path)
+
+    assert isinstance(loaded, Graph)
+    assert loaded._direction == 'TB'
+    assert [node.id for node in loaded.nodes] == ['a', 'b', 3]
+    assert [edge.id for edge in loaded.edges] == [edge.id for edge in graph.edges]
+    assert loaded.get_node('a').value == {'x': [1, 2]}
+    assert loaded.get_node('a')._tooltip == 'first'
+    assert loaded.get_node('b').value == 2.5
+    assert loaded.edges_dict[('b', 3, 1)].label == 'one'
+    assert loaded.loop_nodes == [loaded.get_node('a'), loaded.get_node('b'), loaded.get_node(3)]
+    assert loaded.get_graphviz_str() == graph.get_graphviz_str()
+
+    # the loaded graph can be changed like any other
+    loaded.add_node('c')
+    loaded.connect(3, 'c')
+    assert [node.id for node in loaded.leaves] == ['c']
+
+
+def test_load_errors():
+    """Test that files that cannot be read are refused."""
+    graph = BasicGraph()
+    graph.add_node('a')
+    file = io.BytesIO()
+    graph.save(file)
+    data = file.getvalue()
+
+    with pytest.raises(ValueError):
+        BasicGraph.load(io.BytesIO(b'NOTGRAPH' + data[8:]))
+    newer = FORMAT_VERSION + 1
+    with pytest.raises(ValueError):
+        BasicGraph.load(io.BytesIO(data[:8] + newer.to_bytes(2, 'little') + data[10:]))
+    with pytest.raises(ValueError):
+        BasicGraph.load(io.BytesIO(data[:-4]))
+    with pytest.raises(TypeError):
+        Graph.load(io.BytesIO(data))
+    assert [node.id for node in BasicGraph.load(io.BytesIO(data)).nodes] == ['a']
+
+
+def test_save_graph_with_unpicklable_settings(tmp_path):
+    """Test that settings that cannot be pickled are left out with a warning and get their defaults on load."""
+    graph = Graph(node_label_converter=lambda label: label.upper(), strict=False)
+    graph.add_node('a', label='a')
+    path = str(tmp_path / 'graph.abs')
+    with pytest.warns(UserWarning, match='node_label_converter'):
+        graph.save(path)
+    loaded = Graph.load(path)
+    assert loaded._node_label_converter is None and loaded._is_strict is False
+    assert [node.id for node in loaded.nodes] == ['a']
@@ -0,0 +1,45 @@
+import pytest
+from abstract.Graph import Graph
+
+
+@pytest.fixture
+def graph():
+    """Fixture to create a graph with a loop and a node with two parents."""
+    graph = Graph()
+    for name in ['Paris', 'France', 'Europe', 'London', 'England', 'Earth']:
+        graph.add_node(name)
+    for start, end in [
+        ('Paris', 'France'), ('France', 'Europe'), ('London', 'England'), ('England', 'Europe'),
+        ('Europe', 'Earth'), ('Earth', 'Europe')
+    ]:
+        graph.connect(start, end)
+    return graph
+
+
+def test_snapshot_matches_graph(graph):
+    """Test that the snapshot answers queries the same way the graph does."""
+    snapshot = graph.snapshot()
+    assert len(snapshot) == 6
+    assert snapshot.num_edges == 6
+    for node in graph.nodes:
+        assert snapshot.get_children(node) == [child.name for child in node.children]
+        assert snapshot.get_parents(node.name) == [parent.name for parent in node.parents]
+        assert snapshot.get_ancestors(node, distance=False) == [ancestor.name for ancestor in node.ancestors]
+        assert snapshot.get_descendants(node, distance=False) == [descendant.name for descendant in node.descendants]
+        assert snapshot.get_siblings(node) == [sibling.name for sibling in node.siblings]
+        assert snapshot.get_co_parents(node) == [co_parent.name for co_parent in node.co_parents]
+        assert snapshot.is_node_in_loop(node) == node.is_in_loop()
+
+    assert snapshot.get_descendants('Paris') == {1: ['France'], 2: ['Europe'], 3: ['Earth']}
+    assert snapshot.roots == [node.name for node in graph.roots]
+    assert snapshot.absolute_roots == ['Paris', 'London']
+    assert snapshot.leaves == []
+
+
+def test_snapshot_is_immutable(graph):
+    """Test that a snapshot does not change with the graph."""
+    snapshot = graph.freeze()
+    graph.add_node('Moon')
+    graph.connect('Earth', 'Moon')
+    assert 'Moon' not in snapshot
+    assert snapshot.get_children('Earth') == ['Europe']
@@ -0,0 +1,130 @@
+import os
+import stat
+import subprocess
+import time
+import pytest
+from abstract import run_graphviz
+from abstract.Graph import Graph
+from abstract.run_graphviz import choose_layout_engine, get_layout_engines
+
+
+def test_get_layout_engines():
+    """Test that the auto engine depends on the size of the graph and that cheaper engines follow."""
+    assert choose_layout_engine(num_nodes=10, num_edges=20) == 'dot'
+    assert choose_layout_engine(num_nodes=500, num_edges=5000) == 'neato'
+    assert choose_layout_engine(num_nodes=50000, num_edges=60000) == 'sfdp'
+    assert get_layout_engines('auto', num_nodes=10, num_edges=20) == ['dot', 'sfdp']
+    assert get_layout_engines('sfdp', num_nodes=10, num_edges=20) == ['sfdp']
+    with pytest.raises(ValueError):
+        get_layout_engines('no_such_engine', num_nodes=10, num_edges=20)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='the stand-in layout engines are shell scripts')
+def test_layout_engine_fallback(tmp_path, monkeypatch):
+    """Test that a layout engine that times out is killed and a cheaper one renders the graph."""
+    # stand-ins for dot, which hangs, and sfdp, which copies the source to the output
+    copy = 'if [ "$2" = "-o" ]; then exec 1>"$3"; shift 3; else shift 1; fi\ncat "$@"\n'
+    for name, script in (('dot', 'exec sleep 30\n'), ('sfdp', copy)):
+        engine = tmp_path / name
+        engine.write_text('#!/bin/sh\n' + script)
+        engine.chmod(engine.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f'{tmp_path}{os.pathsep}{os.environ["PATH"]}')
+
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    graph.connect('a', 'b')
+    with pytest.warns(UserWarning, match='falling back to sfdp'):
+        svg = graph.get_svg(timeout=0.5)
+    assert svg == graph.get_graphviz_str(dpi=None)
+    with pytest.warns(UserWarning, match='falling back to sfdp'):
+        assert graph.get_svg(timeout=0.5, path=str(tmp_path / 'fallback.svg'), view=False) == graph.get_graphviz_str()
+    assert (tmp_path / 'fallback.svg').read_text() == graph.get_graphviz_str()
+    assert graph.get_svg(engine='sfdp') == svg
+
+    path = str(tmp_path / 'graph.svg')
+    with pytest.warns(UserWarning):
+        assert graph.render(path=path, view=False, engine='auto', timeout=0.5).source == graph.render().source
+    with open(path) as file:
+        assert file.read() == graph.get_graphviz_str()
+    assert graph.render(engine='auto').engine == 'dot'
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='the stand-in layout engines are shell scripts')
+def test_summary_fallback(tmp_path, monkeypatch):
+    """Test that a summary is rendered when every layout engine times out on a large graph."""
+    # stand-ins that hang on large sources and copy small ones to the output
+    for name in ('dot', 'sfdp'):
+        engine = tmp_path / name
+        engine.write_text('#!/bin/sh\ndata=$(cat)\nif [ ${#data} -gt 50000 ]; then exec sleep 30; fi\nprintf %s "$data"\n')
+        engine.chmod(engine.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f'{tmp_path}{os.pathsep}{os.environ["PATH"]}')
+
+    graph = Graph()
+    names = [str(index) for index in range(300)]
+    graph.add_nodes_from(names)
+    for index in range(1, 300):
+        graph.connect(names[(index - 1) // 3], names[index])
+    with pytest.warns(UserWarning) as record:
+        svg = graph.get_svg(timeout=2)
+    messages = [str(warning.message) for warning in record]
+    assert messages[0].endswith('falling back to sfdp') and messages[-1].endswith('summary of 100 nodes')
+    summary = graph.summarize(max_nodes=100)
+    summary.stylize()
+    assert len(summary.nodes_dict) <= 100 and svg == summary.get_graphviz_str(dpi=None)
+
+
+def test_timeout_budget(monkeypatch):
+    """Test that the engines and the summary share the timeout rather than each getting all of it."""
+    timeouts = []
+
+    def hang(source, engine, format, path, timeout, input_path=None):
+        timeouts.append(timeout)
+        time.sleep(timeout)
+        raise subprocess.TimeoutExpired([engine], timeout)
+
+    monkeypatch.setattr(run_graphviz, 'run_graphviz', hang)
+    graph = Graph()
+    names = [str(index) for index in range(300)]
+    graph.add_nodes_from(names)
+    for index in range(1, 300):
+        graph.connect(names[(index - 1) // 3], names[index])
+
+    start = time.monotonic()
+    with pytest.warns(UserWarning), pytest.raises(subprocess.TimeoutExpired):
+        graph.get_svg(timeout=1)
+    assert len(timeouts) == 4 and sum(timeouts) <= 1
+    assert timeouts[0] == pytest.approx(1 / 3, abs=0.05) and timeouts[2] > 0
+    assert time.monotonic() - start < 2
+
+    timeouts.clear()
+    with pytest.warns(UserWarning), pytest.raises(subprocess.TimeoutExpired):
+        run_graphviz.run_graphviz_with_fallback(source='digraph {}', engines=['dot', 'sfdp'], timeout=0.2)
+    assert sum(timeouts) <= 0.2 and timeouts[0] == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='the stand-in layout engine is a shell script')
+def test_get_svg_to_path(tmp_path, monkeypatch):
+    """Test that get_svg and get_html with a path render the file in the format of its extension and return the SVG."""
+    # a stand-in for dot that wraps the source in a tag named after the format
+    engine = tmp_path / 'dot'
+    engine.write_text(
+        '#!/bin/sh\nformat=${1#-T}\nif [ "$2" = "-o" ]; then exec 1>"$3"; shift 3; else shift 1; fi\n'
+        'printf "<%s>" "$format"\ncat "$@"\nprintf "</%s>" "$format"\n'
+    )
+    engine.chmod(engine.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f'{tmp_path}{os.pathsep}{os.environ["PATH"]}')
+
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    graph.connect('a', 'b')
+    path = tmp_path / 'graph.svg'
+    svg = graph.get_svg(path=str(path), view=False, dpi=100)
+    assert svg == f'<svg>{graph.get_graphviz_str(dpi=100)}</svg>'
+    assert path.read_text() == svg
+    assert graph.get_html(path=str(tmp_path / 'graph_2.svg'), view=False, dpi=100).data == svg
+
+    path = tmp_path / 'graph.png'
+    assert graph.get_svg(path=str(path), view=False) == f'<svg>{graph.get_graphviz_str(dpi=None)}</svg>'
+    assert path.read_text() == f'<png>{graph.get_graphviz_str()}</png>'
+    with pytest.raises(TypeError):
+        graph.get_svg(no_such_argument=1)
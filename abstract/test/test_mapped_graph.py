@@ -0,0 +1,68 @@
+import pytest
+from abstract.Graph import Graph
+from abstract.MappedGraph import MappedGraph
+
+
+@pytest.fixture
+def graph():
+    """Fixture to create a graph with a loop, a node with two parents and names of different types."""
+    graph = Graph()
+    for name in ['Paris', 'France', 'Europe', 'London', 'England', 'Earth', 7]:
+        graph.add_node(name)
+    graph.get_node('Paris').label = 'City of light'
+    for start, end in [
+        ('Paris', 'France'), ('France', 'Europe'), ('London', 'England'), ('England', 'Europe'),
+        ('Europe', 'Earth'), ('Earth', 'Europe'), (7, 'Earth')
+    ]:
+        graph.connect(start, end)
+    return graph
+
+
+def test_mapped_graph_matches_graph(graph, tmp_path):
+    """Test that the mapped file answers queries the same way the graph does."""
+    with MappedGraph.from_graph(graph=graph, path=str(tmp_path / 'graph.map')) as mapped:
+        assert len(mapped) == 7
+        assert mapped.num_edges == 7
+        assert mapped.nodes == ['Paris', 'France', 'Europe', 'London', 'England', 'Earth', 7]
+        assert 7 in mapped
+        assert '7' not in mapped
+        with pytest.raises(KeyError):
+            mapped.get_children('Moon')
+        for node in graph.nodes:
+            assert mapped.get_children(node.name) == [child.name for child in node.children]
+            assert mapped.get_parents(node.name) == [parent.name for parent in node.parents]
+            assert mapped.get_ancestors(node.name, distance=False) == [
+                ancestor.name for ancestor in graph.get_ancestors(node, distance=False)
+            ]
+            assert mapped.is_node_in_loop(node.name) == node.is_in_loop()
+        assert mapped.get_descendants('London') == {1: ['England'], 2: ['Europe'], 3: ['Earth']}
+        assert mapped.roots == [node.name for node in graph.roots]
+        assert mapped.get_label('Paris') == 'City of light'
+        assert mapped.get_tree_str() == graph.get_tree_str()
+        assert mapped.get_tree_str(node='England') == 'England\n└ Europe\n  └ Earth\n    └ Europe*\n'
+
+
+def test_mapped_subgraph(graph, tmp_path):
+    """Test that parts of the mapped file can be loaded into a graph and rendered."""
+    path = str(tmp_path / 'graph.map')
+    MappedGraph.from_graph(graph=graph, path=path).close()
+    mapped = MappedGraph(path)
+    subgraph = mapped.subgraph(nodes=['England'], direction='from')
+    assert isinstance(subgraph, Graph)
+    assert [node.name for node in subgraph.nodes] == ['England', 'Europe', 'Earth']
+    assert [edge.id for edge in subgraph.edges] == [
+        ('England', 'Europe', None), ('Europe', 'Earth', None), ('Earth', 'Europe', None)
+    ]
+    subgraph.stylize()
+    assert '"England" -> "Europe"' in subgraph.get_graphviz_str()
+
+    assert [node.name for node in mapped.subgraph(nodes=['Europe'], direction='to', max_distance=1).nodes] == [
+        'Europe', 'France', 'England', 'Earth'
+    ]
+    assert mapped.to_graph().get_node('Paris').label == 'City of light'
+    mapped.close()
+
+    with open(path, 'r+b') as file:
+        file.write(b'NOTAGRAPH')
+    with pytest.raises(ValueError):
+        MappedGraph(path)
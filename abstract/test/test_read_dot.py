@@ -0,0 +1,75 @@
+import gzip
+import io
+import pytest
+from abstract.Graph import Graph
+from abstract.read_dot import iter_dot_events
+
+DOT = '''/* a comment */ strict digraph "G" {
+    graph [rankdir=LR, splines=ortho]
+    node [shape=ellipse, color=red]  # node defaults
+    a [label="A \\"quoted\\"" width=2];
+    a -> b -> {c; d} [color="#00ff00" label=<<i>x</i>> weight=3]
+    subgraph cluster_1 { node [shape=box]; e -- f }
+    "long" + "name" -> a:n
+    a -> b [penwidth=2]
+}
+'''
+
+
+def test_iter_dot_events():
+    """Test that DOT statements become the same events whatever the chunk boundaries are."""
+    events = list(iter_dot_events(io.StringIO(DOT)))
+    assert events[0] == ('header', {'strict': True, 'directed': True, 'name': 'G'})
+    assert events[1] == ('graph', {'rankdir': 'LR', 'splines': 'ortho'})
+    assert events[2] == ('node', 'a', {'shape': 'ellipse', 'color': 'red', 'label': 'A "quoted"', 'width': '2'})
+    assert ('edge', 'b', 'd', {'color': '#00ff00', 'label': '<<i>x</i>>', 'weight': '3'}) in events
+    assert ('node', 'e', {'shape': 'box', 'color': 'red'}) in events
+    assert ('edge', 'longname', 'a', {}) in events
+    for chunk_size in range(1, 30):
+        assert list(iter_dot_events(io.StringIO(DOT), chunk_size=chunk_size)) == events
+
+    with pytest.raises(ValueError, match='line 2'):
+        list(iter_dot_events(io.StringIO('digraph {\n a -> @ }')))
+    with pytest.raises(ValueError):
+        list(iter_dot_events(io.StringIO('digraph { a -> b')))
+
+
+def test_from_dot(tmp_path):
+    """Test that DOT attributes become labels, styles and parameters and that rendered graphs are read back."""
+    graph = Graph.from_dot(DOT)
+    assert [node.name for node in graph.nodes] == ['a', 'b', 'c', 'd', 'e', 'f', 'longname']
+    assert [edge.id for edge in graph.edges] == [
+        ('a', 'b', None), ('b', 'c', None), ('b', 'd', None), ('e', 'f', None), ('longname', 'a', None)
+    ]
+    assert graph._is_strict and graph._direction == 'LR' and graph._kwargs == {'splines': 'ortho'}
+    assert graph.get_node('a').label == 'A \\"quoted\\"'
+    assert graph.get_node('a')['width'] == '2'
+    assert graph._node_style_overwrites['e']['shape'] == 'box'
+    assert graph._edge_style_overwrites[('a', 'b', None)]['line_width'] == 2
+    assert graph.edges_dict[('b', 'c', None)]['weight'] == '3'
+
+    # repeated edges of graphs that are not strict get their own IDs
+    graph = Graph.from_dot('digraph { a -> b; a -> b; a -> b [key=k] }')
+    assert [edge.id for edge in graph.edges] == [('a', 'b', None), ('a', 'b', 1), ('a', 'b', 'k')]
+    assert graph._direction == 'TB'
+    # numbering skips the ids of edges that were in the graph before
+    graph.connect('a', 'b', id=3)
+    graph.append_dot('digraph { a -> b; a -> b; a -> b; b -> a }')
+    assert [edge.id[2] for edge in graph.edges if edge.id[:2] == ('a', 'b')] == [None, 1, 'k', 3, 2, 4, 5]
+    assert ('b', 'a', None) in graph.edges_dict
+
+    graph = Graph(direction='TB')
+    graph.add_nodes_from(['x', 'y', 'z'])
+    graph.connect('x', 'y', label='first')
+    graph.connect('y', 'z')
+    graph.connect('z', 'x')
+    graph.stylize()
+    path = tmp_path / 'graph.dot.gz'
+    with gzip.open(path, 'wt') as file:
+        file.write(graph.get_graphviz_str())
+    loaded = Graph.from_dot(str(path))
+    assert [edge.id for edge in loaded.edges] == [edge.id for edge in graph.edges]
+    assert loaded.edges_dict[('x', 'y', None)].label == 'first'
+    assert loaded._direction == 'TB'
+    loaded.stylize()
+    assert loaded.get_node('x').style.border_colour.hexadecimal == graph.get_node('x').style.border_colour.hexadecimal
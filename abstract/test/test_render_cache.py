@@ -0,0 +1,69 @@
+import os
+from abstract.Graph import Graph
+from abstract.RenderCache import RenderCache
+
+
+def test_render_cache_tiers(tmp_path):
+    """Test that renders are evicted least recently used first, from memory and from a capped directory."""
+    key_a, key_b, key_c = (RenderCache.make_key(source) for source in ('digraph {a}', 'digraph {b}', 'digraph {c}'))
+    assert key_a == RenderCache.make_key(['digraph {', 'a}'])
+    assert key_a != RenderCache.make_key('digraph {a}', format='png')
+
+    cache = RenderCache(max_items=2)
+    cache.put(key_a, b'a')
+    cache.put(key_b, b'b')
+    assert cache.get(key_a) == b'a'
+    cache.put(key_c, b'c')
+    assert cache.get(key_b) is None and cache.get(key_a) == b'a' and cache.get(key_c) == b'c'
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    directory = tmp_path / 'renders'
+    cache = RenderCache(max_items=0, directory=str(directory), max_disk_bytes=10)
+    cache.put(key_a, b'aaaa')
+    cache.put(key_b, b'bbbb')
+    os.utime(directory / key_b, (0, 0))
+    assert cache.get(key_a) == b'aaaa'
+    cache.put(key_c, b'cccc')
+    assert sorted(os.listdir(directory)) == sorted([key_a, key_c])
+
+    # another cache on the same directory finds the renders of the first one
+    cache = RenderCache(directory=str(directory), max_disk_bytes=10)
+    assert cache.get(key_c) == b'cccc' and cache.get(key_b) is None
+    cache.clear()
+    assert os.listdir(directory) == []
+
+
+def test_get_svg_from_render_cache():
+    """Test that the SVG of a graph that has not changed comes from the cache without running Graphviz."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    graph.connect('a', 'b')
+    cache = RenderCache()
+    graph.render_cache = cache
+    graph.stylize()
+    key = RenderCache.make_key(graph.get_graphviz_str(dpi=None), engine='dot', format='svg')
+    cache.put(key, b'<svg>cached</svg>')
+    assert graph.get_svg() == '<svg>cached</svg>'
+    assert graph._repr_html_() == graph.get_svg() and cache.hits == 3
+    assert graph.copy().render_cache is cache and Graph().render_cache is None
+
+    Graph.set_default_render_cache(cache)
+    try:
+        assert Graph().render_cache is cache
+    finally:
+        Graph.set_default_render_cache(None)
+
+
+def test_save_graph_with_render_cache(tmp_path):
+    """Test that a graph with a render cache can be saved and is loaded without it."""
+    graph = Graph()
+    graph.add_nodes_from(['a', 'b'])
+    graph.connect('a', 'b')
+    graph.render_cache = RenderCache()
+    path = str(tmp_path / 'graph.abs')
+    graph.save(path)
+    loaded = Graph.load(path)
+    assert [edge.id for edge in loaded.edges] == [('a', 'b', None)]
+    assert loaded.render_cache is None and graph.render_cache is not None
+    graph.subgraph(['a'], direction='to').save(path)
+    assert list(Graph.load(path).nodes_dict) == ['a']
@@ -0,0 +1,40 @@
+import os
+import stat
+import pytest
+from abstract.Graph import Graph
+from abstract.render_many import render_many
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='the stand-in layout engine is a shell script')
+def test_render_many(tmp_path, monkeypatch):
+    """Test that graphs and sources are rendered in order and that failures are reported per item."""
+    # a stand-in for dot that copies its input to the file after -o
+    bin_path = tmp_path / 'bin'
+    bin_path.mkdir()
+    engine = bin_path / 'dot'
+    engine.write_text('#!/bin/sh\ncase "$1" in -Tfail) exit 3;; esac\ncat > "$3"\n')
+    engine.chmod(engine.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', str(bin_path) + os.pathsep + os.environ['PATH'])
+
+    graphs = []
+    for index in range(5):
+        graph = Graph()
+        graph.add_nodes_from([f'a{index}', f'b{index}'])
+        graph.connect(f'a{index}', f'b{index}')
+        graphs.append(graph)
+    items = [(graph, str(tmp_path / f'graph_{index}.svg')) for index, graph in enumerate(graphs)]
+    items.append(('digraph { x -> y }', str(tmp_path / 'source')))
+    items.append((None, str(tmp_path / 'broken.svg')))
+    items.append(('digraph { z }', str(tmp_path / 'graph.fail')))
+
+    results = render_many(items, max_workers=2)
+    assert [result.path for result in results[:6]] == [path for _, path in items[:5]] + [str(tmp_path / 'source.pdf')]
+    assert all(result.ok for result in results[:6])
+    assert (tmp_path / 'graph_3.svg').read_text() == graphs[3].get_graphviz_str()
+    assert (tmp_path / 'source.pdf').read_text() == 'digraph { x -> y }'
+    assert isinstance(results[6].error, AttributeError)
+    assert results[7].error.returncode == 3 and not (tmp_path / 'graph.fail').exists()
+
+    # engines that are not Graphviz layout engines are refused rather than run as commands
+    with pytest.raises(ValueError):
+        render_many([('digraph {}', str(tmp_path / 'missing.svg'))], engine=str(engine))
@@ -0,0 +1,112 @@
+import pytest
+from abstract.Graph import Graph
+
+
+@pytest.fixture
+def graph():
+    """Fixture to create a graph of places."""
+    graph = Graph()
+    for name in ['Paris', 'France', 'Europe', 'London', 'England', 'Earth', 'Moon']:
+        graph.add_node(name)
+    for start, end in [
+        ('Paris', 'France'), ('France', 'Europe'), ('London', 'England'), ('England', 'Europe'),
+        ('Europe', 'Earth'), ('Moon', 'Earth')
+    ]:
+        graph.connect(start, end)
+    return graph
+
+
+def test_subgraph_view(graph):
+    """Test that a view only sees its own nodes and the edges between them."""
+    view = graph.subgraph(nodes=['France'])
+    assert [node.name for node in view.nodes] == ['France', 'Paris', 'Europe', 'Earth']
+    assert [edge.id for edge in view.edges] == [
+        ('France', 'Europe', None), ('Paris', 'France', None), ('Europe', 'Earth', None)
+    ]
+    assert view.get_node('Europe').parents == [graph.get_node('France'), graph.get_node('England')]
+    assert view.get_parents('Europe') == [graph.get_node('France')]
+    assert [node.name for node in view.get_ancestors('Earth', distance=False)] == ['Europe', 'France', 'Paris']
+    assert [node.name for node in view.roots] == ['Paris']
+    assert [node.name for node in view.leaves] == ['Earth']
+    assert 'London' not in view
+    with pytest.raises(KeyError):
+        view.get_node('London')
+    with pytest.raises(RuntimeError):
+        view.connect('France', 'Paris')
+    with pytest.raises(TypeError):
+        view.edges_dict[('London', 'England', None)] = graph.edges_dict[('London', 'England', None)]
+
+    assert [node.name for node in graph.subgraph(nodes=['Europe'], direction='to').nodes] == [
+        'Europe', 'France', 'Paris', 'England', 'London'
+    ]
+    assert [node.name for node in graph.subgraph(nodes=['Europe'], filter_type='exclude').nodes] == ['Moon']
+
+
+def test_subgraph_view_follows_edges_and_renders(graph):
+    """Test that a view sees edge changes of the underlying graph and can be rendered."""
+    view = graph.subgraph(nodes=['Paris'], direction='from')
+    view.stylize()
+    graphviz_str = view.get_graphviz_str()
+    assert '"Paris" -> "France"' in graphviz_str
+    assert '"London"' not in graphviz_str
+    assert view.loop_nodes == []
+    graph.connect('Earth', 'France')
+    assert view.loop_nodes == [graph.get_node('France'), graph.get_node('Europe'), graph.get_node('Earth')]
+
+    # the edges of the view are collected once per change of the underlying graph
+    edges_dict = view._edges_dict
+    assert view._edges_dict is edges_dict
+    graph.disconnect(graph.edges_dict[('Earth', 'France', None)])
+    assert view._edges_dict is not edges_dict and ('Earth', 'France', None) not in view.edges_dict
+
+
+def test_subgraph_view_styles_are_shared(graph):
+    """Test that stylizing a view styles the shared nodes, and that the underlying graph restyles them."""
+    graph.stylize()
+    graphviz_str = graph.get_graphviz_str()
+    view = graph.subgraph(nodes=['Paris'], direction='from')
+    view.stylize()
+    assert view.get_node('Paris').style is graph.get_node('Paris').style
+    graph.stylize()
+    assert graph.get_graphviz_str() == graphviz_str
+
+
+def test_materialize_and_filter(graph):
+    """Test that materializing a view copies only its nodes and edges."""
+    view = graph.subgraph(nodes=['England'], direction='to')
+    new_graph = view.materialize()
+    assert isinstance(new_graph, Graph)
+    assert [node.name for node in new_graph.nodes] == ['England', 'London']
+    assert [edge.id for edge in new_graph.edges] == [('London', 'England', None)]
+    assert new_graph.get_node('England') is not graph.get_node('England')
+    new_graph.connect('England', 'London')
+    assert not graph.get_node('England').is_in_loop()
+
+    filtered = graph.filter(nodes=['Moon'], direction='from')
+    assert [node.name for node in filtered.nodes] == ['Moon', 'Earth']
+
+
+def test_style_overwrites():
+    """Test that only views skip the overwrites of missing nodes and that changed overwrites are applied again."""
+    node_styles = {'a': {'shape': 'box'}}
+    graph = Graph(obj={
+        'nodes': ['a', 'b', 'c'], 'edges': [('a', 'b'), ('b', 'c')], 'node_styles': node_styles,
+        'edge_styles': {('a', 'b'): {'style': 'dashed'}}
+    })
+    graph.stylize()
+    assert '"shape"="box"' in graph.get_node('a').style.get_graphviz_str()
+
+    # the overwrite is changed in place
+    node_styles['a']['shape'] = 'circle'
+    graph.stylize()
+    assert '"shape"="circle"' in graph.get_node('a').style.get_graphviz_str()
+
+    view = graph.subgraph(nodes=['c'], direction='from')
+    view.stylize()
+    materialized = view.materialize()
+    materialized.stylize()
+    assert list(materialized._node_style_overwrites) == [] and list(materialized._edge_style_overwrites) == []
+
+    graph._node_style_overwrites['z'] = {'shape': 'box'}
+    with pytest.raises(KeyError):
+        graph.stylize()
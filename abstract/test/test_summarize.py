@@ -0,0 +1,63 @@
+from abstract.Graph import Graph
+
+
+def _get_graph():
+    graph = Graph()
+    children = [f'c{index}' for index in range(5)]
+    grandchildren = [f'g{index}' for index in range(20)]
+    graph.add_nodes_from(['r', *children, *grandchildren, 'x', 'y', 'z'])
+    for child in children:
+        graph.connect('r', child)
+    for index, grandchild in enumerate(grandchildren):
+        graph.connect(children[index % 5], grandchild)
+    graph.connect('g0', 'x')
+    graph.connect('x', 'y')
+    graph.connect('y', 'z')
+    graph.connect('z', 'x')
+    return graph
+
+
+def test_summarize():
+    """Test that loops and what does not fit are collapsed into counted nodes that keep the colours."""
+    graph = _get_graph()
+    summary = graph.summarize(max_nodes=100)
+    assert len(summary.nodes_dict) == 27
+    assert summary.get_node('x_loop').label == '3 nodes in a loop'
+    assert ('g0', 'x_loop', None) in summary.edges_dict
+
+    graph.stylize()
+    summary = graph.summarize(max_nodes=10)
+    assert len(summary.nodes_dict) == 10
+    assert summary.get_node('r_more').label == '5 more nodes'
+    assert summary.get_node('c0_more').label == '7 more nodes'
+    assert summary.get_node('c0').style.get_graphviz_str() == graph.get_node('c0').style.get_graphviz_str()
+    colour = summary.get_node('c0_more').style.colour.hexadecimal
+    assert colour == graph.get_node('g0').style.colour.hexadecimal
+
+    # expanded nodes are shown with the nodes that lead to them and their children
+    summary = graph.summarize(max_nodes=3, expand=['g0'])
+    assert [node.name for node in summary.nodes] == ['r', 'c0', 'g0', 'x_loop', 'r_more', 'c0_more']
+    summary = graph.summarize(max_nodes=3, expand=['y'])
+    assert {'x', 'y', 'z'} <= set(summary.nodes_dict)
+
+    view = graph.subgraph(['c1'], direction='from')
+    summary = view.summarize(max_nodes=2)
+    assert [node.label for node in summary.nodes] == ['c1', '4 more nodes']
+    assert graph.render(max_nodes=2).source == graph.summarize(max_nodes=2).render().source
+
+
+def test_summarize_does_not_stylize_the_graph():
+    """Test that the summary is stylized on its own and the styles of the summarized graph are left unchanged."""
+    graph = _get_graph()
+    summary = graph.summarize(max_nodes=10)
+    assert all(node.style is None for node in graph.nodes)
+    assert all(edge.style is None for edge in graph.edges)
+    assert all(node.style is not None for node in summary.nodes)
+
+    graph.stylize()
+    styles = {name: node.style for name, node in graph.nodes_dict.items()}
+    graphviz_str = graph.get_graphviz_str()
+    graph.subgraph(['c1'], direction='from').summarize(max_nodes=2)
+    graph.summarize(max_nodes=3, expand=['g0'])
+    assert all(graph.get_node(name).style is style for name, style in styles.items())
+    assert graph.get_graphviz_str() == graphviz_str
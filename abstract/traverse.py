@@ -0,0 +1,126 @@
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+def traverse_depth_first(
+		start, get_neighbours: Callable[[object], Iterable], key: Callable[[object], Hashable] = id,
+		include_start: bool = False, max_distance: Optional[int] = None
+) -> Iterator:
+	"""
+	Iteratively walks the objects reachable from start in depth-first pre-order.
+
+	Args:
+		start: The object to start from; it is not yielded unless it can reach itself and include_start is True.
+		get_neighbours (Callable): Returns the neighbours (children or parents) of an object.
+		key (Callable): Returns a hashable identity for an object; objects with the same key are visited once.
+		include_start (bool): If True, start is yielded (but not expanded again) when it is reached through a loop.
+		max_distance (Optional[int]): Maximum number of steps away from start.
+
+	Yields:
+		The reachable objects, each exactly once, in the order a recursive depth-first walk would find them.
+	"""
+	if max_distance is not None and max_distance <= 0:
+		return
+	start_key = key(start)
+	# the smallest distance at which each object has been expanded
+	distances = {start_key: 0}
+	start_found = False
+	stack = [iter(get_neighbours(start))]
+	while stack:
+		neighbour = next(stack[-1], stack)
+		if neighbour is stack:
+			stack.pop()
+			continue
+
+		distance = len(stack)
+		neighbour_key = key(neighbour)
+		if neighbour_key == start_key:
+			if include_start and not start_found:
+				start_found = True
+				yield neighbour
+			continue
+
+		if neighbour_key not in distances:
+			yield neighbour
+		elif max_distance is None or distances[neighbour_key] <= distance:
+			continue
+
+		# with a distance limit, an object found again through a shorter path is expanded again
+		distances[neighbour_key] = distance
+		if max_distance is None or distance < max_distance:
+			stack.append(iter(get_neighbours(neighbour)))
+
+
+def traverse_breadth_first(
+		start, get_neighbours: Callable[[object], Iterable], key: Callable[[object], Hashable] = id,
+		include_start: bool = False, max_distance: Optional[int] = None
+) -> Iterator[Tuple[object, int]]:
+	"""
+	Iteratively walks the objects reachable from start in breadth-first order.
+
+	Args:
+		start: The object to start from; it is not yielded unless it can reach itself and include_start is True.
+		get_neighbours (Callable): Returns the neighbours (children or parents) of an object.
+		key (Callable): Returns a hashable identity for an object; objects with the same key are visited once.
+		include_start (bool): If True, start is yielded (but not expanded again) when it is reached through a loop.
+		max_distance (Optional[int]): Maximum number of steps away from start.
+
+	Yields:
+		Tuple[object, int]: Each reachable object, exactly once, with its shortest distance to start.
+	"""
+	if max_distance is not None and max_distance <= 0:
+		return
+	start_key = key(start)
+	visited = {start_key}
+	start_found = False
+	queue = deque([(start, 0)])
+	while queue:
+		obj, distance = queue.popleft()
+		distance += 1
+		for neighbour in get_neighbours(obj):
+			neighbour_key = key(neighbour)
+			if neighbour_key == start_key:
+				if include_start and not start_found:
+					start_found = True
+					yield neighbour, distance
+			elif neighbour_key not in visited:
+				visited.add(neighbour_key)
+				yield neighbour, distance
+				if max_distance is None or distance < max_distance:
+					queue.append((neighbour, distance))
+
+
+def get_relatives(
+		start, get_neighbours: Callable[[object], Iterable], distance: bool = True,
+		key: Callable[[object], Hashable] = id, include_start: bool = False, max_distance: Optional[int] = None
+) -> Union[List, Dict[int, List]]:
+	"""
+	Collects the objects reachable from start, i.e. its descendants or ancestors depending on get_neighbours.
+
+	Args:
+		start: The object to start from.
+		get_neighbours (Callable): Returns the neighbours (children or parents) of an object.
+		distance (bool): If True, returns the objects grouped by their shortest distance to start.
+		key (Callable): Returns a hashable identity for an object.
+		include_start (bool): If True, start is included when it is reached through a loop.
+		max_distance (Optional[int]): Maximum number of steps away from start.
+
+	Returns:
+		Union[List, Dict[int, List]]: A list in depth-first order or a dictionary of {distance: [objects]}.
+	"""
+	if distance:
+		layers = {}
+		for relative, relative_distance in traverse_breadth_first(
+				start=start, get_neighbours=get_neighbours, key=key,
+				include_start=include_start, max_distance=max_distance
+		):
+			if relative_distance in layers:
+				layers[relative_distance].append(relative)
+			else:
+				layers[relative_distance] = [relative]
+		return layers
+	else:
+		return list(traverse_depth_first(
+			start=start, get_neighbours=get_neighbours, key=key,
+			include_start=include_start, max_distance=max_distance
+		))
@@ -0,0 +1,121 @@
+from typing import Callable, Hashable, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+CORNER = u'└'
+TWO_WAY = u'├'
+HORIZONTAL = u'─'
+VERTICAL = u'│'
+
+
+class MoreChildren:
+	"""Stands in for the children that were left out of a tree because of max_children."""
+
+	def __init__(self, count: int):
+		self.count = count
+
+	def __repr__(self) -> str:
+		return f'MoreChildren:{self.count}'
+
+
+def walk_tree(
+		root, get_children: Callable[[object], Sequence], key: Callable[[object], Hashable] = id,
+		visited: Optional[Set[Hashable]] = None, max_depth: Optional[int] = None, max_children: Optional[int] = None
+) -> Iterator[Tuple[object, int, str, bool]]:
+	"""
+	Iteratively walks a graph from a root as if it were a tree, in the order its lines would be printed.
+	An object with children is expanded the first time it is reached; when it is reached again it is marked as
+	repeated and not expanded, so loops end. Objects without children are never marked.
+
+	Args:
+		root: The object at the top of the tree.
+		get_children (Callable): Returns the children of an object as a sequence.
+		key (Callable): Returns a hashable identity for an object.
+		visited (Optional[Set]): Keys of the objects already expanded, shared between the trees of several roots.
+		max_depth (Optional[int]): Objects at this depth are not expanded, the root is at depth 0.
+		max_children (Optional[int]): Only this many children of an object are walked, the rest are replaced by one
+			MoreChildren object.
+
+	Yields:
+		Tuple[object, int, str, bool]: Each object with its depth, the prefix of its line (indentation and branch)
+		and whether it is repeated.
+	"""
+	if visited is None:
+		visited = set()
+
+	# every item of the stack is [children, position of the next child, indentation of the children, their depth]
+	stack = []
+
+	def expand(obj, indentation: str, depth: int) -> bool:
+		obj_key = key(obj)
+		if obj_key in visited:
+			return True
+		if max_depth is not None and depth >= max_depth:
+			return False
+		children = get_children(obj)
+		if len(children) > 0:
+			visited.add(obj_key)
+			if max_children is not None and len(children) > max_children:
+				children = list(children[:max_children]) + [MoreChildren(count=len(children) - max_children)]
+			stack.append([children, 0, indentation, depth + 1])
+		return False
+
+	yield root, 0, '', expand(root, '', 0)
+	while stack:
+		item = stack[-1]
+		children, position, indentation, depth = item
+		if position == len(children):
+			stack.pop()
+			continue
+		item[1] = position + 1
+		child = children[position]
+		if position + 1 == len(children):
+			prefix = indentation + CORNER + ' '
+			child_indentation = indentation + '  '
+		else:
+			prefix = indentation + TWO_WAY + ' '
+			child_indentation = indentation + VERTICAL + ' '
+		if isinstance(child, MoreChildren):
+			yield child, depth, prefix, False
+			continue
+		# the child is yielded before it is expanded but expand() only reads its key and its children
+		repeated = key(child) in visited
+		yield child, depth, prefix, repeated
+		if not repeated:
+			expand(child, child_indentation, depth)
+
+
+def iter_tree_lines(
+		roots: Iterable, get_children: Callable[[object], Sequence], get_label: Callable[[object], str],
+		key: Callable[[object], Hashable] = id, max_depth: Optional[int] = None, max_children: Optional[int] = None,
+		visited: Optional[Set[Hashable]] = None
+) -> Iterator[str]:
+	"""
+	Generates the lines of the tree representation of a graph, one tree per root with an empty line between them.
+	Repeated objects are followed by '*' and left out children are counted on a line of their own.
+
+	Args:
+		roots (Iterable): The objects at the top of the trees.
+		get_children (Callable): Returns the children of an object as a sequence.
+		get_label (Callable): Returns the text of an object.
+		key (Callable): Returns a hashable identity for an object.
+		max_depth (Optional[int]): Objects at this depth are not expanded, the roots are at depth 0.
+		max_children (Optional[int]): The maximum number of children shown per object.
+		visited (Optional[Set]): Keys of the objects already expanded.
+
+	Yields:
+		str: The lines, without line breaks.
+	"""
+	if visited is None:
+		visited = set()
+	for root_number, root in enumerate(roots):
+		if root_number > 0:
+			yield ''
+		for obj, _, prefix, repeated in walk_tree(
+				root=root, get_children=get_children, key=key, visited=visited, max_depth=max_depth,
+				max_children=max_children
+		):
+			if isinstance(obj, MoreChildren):
+				yield f'{prefix}... {obj.count} more'
+			elif repeated:
+				yield prefix + get_label(obj) + '*'
+			else:
+				yield prefix + get_label(obj)
@@ -22,13 +22,13 @@ setup(
 		'Intended Audience :: Developers',
 		'License :: Other/Proprietary License',
 		'Programming Language :: Python :: 3 :: Only',
-		'Programming Language :: Python :: 3.6',
 		'Programming Language :: Python :: 3.7',
 		'Topic :: Software Development :: Libraries :: Python Modules'
 	],
 
 	packages=find_packages(exclude=("jupyter_tests", ".idea", ".git")),
 	install_requires=['graphviz', 'base32hex', 'colouration'],
-	python_requires='~=3.6',
+	extras_require={'arrays': ['numpy']},
+	python_requires='~=3.7',
 	zip_safe=True
 )